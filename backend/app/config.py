@@ -10,16 +10,87 @@ class Settings(BaseSettings):
     # Supabase
     supabase_url: str = ""
     supabase_key: str = ""
+    # Verifies players' access tokens (HS256); empty = use the project's JWKS
+    supabase_jwt_secret: str = ""
+    # Direct Postgres connection for the repository layer (empty = in-memory data)
+    database_url: str = ""
+    database_pool_min: int = 1
+    database_pool_max: int = 10
+    database_statement_cache_size: int = 100  # 0 behind a transaction-mode pooler
+    database_cache_ttl_seconds: float = 300.0
 
     # Google Gemini
     gemini_api_key: str = ""
 
     # Finnhub (live financial news)
     finnhub_api_key: str = ""
+    finnhub_requests_per_minute: float = 30.0  # budget shared by all categories (Finnhub free tier: 60)
+    news_poll_min_seconds: float = 15.0
+    news_poll_max_seconds: float = 600.0
 
     # CORS
     frontend_url: str = "http://localhost:3000"
 
+    # Shared state across workers ("memory" or "sqlite")
+    shared_state_backend: str = "memory"
+    shared_state_path: str = ""  # defaults to /dev/shm/tradequest-shared-state.db
+
+    # LLM dispatch queue (priority classes share one concurrency budget)
+    llm_max_concurrency: int = 8
+    llm_interactive_limit: int = 8
+    llm_background_limit: int = 4
+    llm_prefetch_limit: int = 2
+    llm_aging_seconds: float = 5.0
+    # Gemini tokens one HTTP request may spend (0 = unlimited)
+    llm_request_token_budget: int = 20000
+    # Reveal latency budget; past it the Game Master falls back
+    reveal_latency_budget_seconds: float = 8.0
+    # Keep a timed-out Gemini call running to fill the cache
+    llm_background_fill: bool = True
+    # Send a second Gemini request when the first exceeds the observed p95
+    llm_hedge_enabled: bool = False
+
+    # Admission control for Gemini-backed routes (limits apply per route)
+    admission_max_concurrency: int = 16
+    admission_max_queue: int = 32
+    admission_queue_timeout_seconds: float = 10.0
+    admission_client_rate_per_minute: float = 30.0  # 0 = no per-client limit
+    admission_client_burst: int = 10
+    # Reverse proxies whose X-Forwarded-For is believed (comma-separated IPs/CIDRs)
+    admission_trusted_proxies: str = ""
+
+    # Background jobs (async reveal explanations, fetched via /api/jobs/{id})
+    job_workers: int = 4
+    job_max_queue: int = 256
+    job_ttl_seconds: float = 600.0
+
+    # Server-sent alert stream
+    sse_replay_buffer_size: int = 500
+    sse_heartbeat_seconds: float = 15.0
+
+    # WebSocket alert channel (bursts inside the window share one frame)
+    ws_batch_window_ms: int = 250
+    ws_max_batch: int = 50
+
+    # Append-only alert archive (defaults to app/data/archive)
+    alert_archive_dir: str = ""
+
+    # Near-duplicate articles (MinHash Jaccard) fold into the original alert
+    near_duplicate_window: int = 2000
+    near_duplicate_threshold: float = 0.5
+
+    # Community prediction counters (per-worker, flushed to an on-disk SQLite
+    # file; defaults to app/data/prediction_stats.db)
+    prediction_stats_flush_seconds: float = 5.0
+    prediction_stats_path: str = ""
+
+    # Historical OHLC store (defaults to app/data/ohlc/ohlc.bin)
+    ohlc_store_path: str = ""
+
+    # Startup warm-up (gates /ready)
+    warmup_enabled: bool = True
+    warmup_budget_seconds: float = 20.0
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -8,6 +8,8 @@ Each scenario has 35 bars:
 from datetime import datetime, timedelta
 import random, math
 
+from app.services.records import BarSeries
+
 _BASE_DATE = datetime(2025, 10, 1)
 
 
@@ -95,40 +97,67 @@ ZERO_DAY_CHART_DATA: list[dict] = [
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 2-6. Procedurally generated charts for other scenarios
+#      (generated on first access, not at import time)
 # ══════════════════════════════════════════════════════════════════════════════
 
-EARNINGS_SURPRISE_DATA = _generate_chart(480.0, "up", "up", 0.018, seed=101)
-INTEREST_RATE_DATA     = _generate_chart(520.0, "up", "down", 0.012, seed=202)
-CRYPTO_CRASH_DATA      = _generate_chart(68000.0, "sideways", "down", 0.025, seed=303)
-OIL_SUPPLY_DATA        = _generate_chart(78.50, "sideways", "up", 0.014, seed=404)
-TECH_IPO_DATA          = _generate_chart(42.00, "up", "down", 0.022, seed=505)
-CURRENCY_WAR_DATA      = _generate_chart(1.0840, "sideways", "down", 0.006, seed=606)
+_GENERATED_CHART_SPECS: dict[str, dict] = {
+    "earnings-surprise-rally": {"start_price": 480.0, "trend_pre": "up", "trend_post": "up", "volatility": 0.018, "seed": 101},
+    "interest-rate-shock":     {"start_price": 520.0, "trend_pre": "up", "trend_post": "down", "volatility": 0.012, "seed": 202},
+    "crypto-flash-crash":      {"start_price": 68000.0, "trend_pre": "sideways", "trend_post": "down", "volatility": 0.025, "seed": 303},
+    "oil-supply-disruption":   {"start_price": 78.50, "trend_pre": "sideways", "trend_post": "up", "volatility": 0.014, "seed": 404},
+    "tech-ipo-frenzy":         {"start_price": 42.00, "trend_pre": "up", "trend_post": "down", "volatility": 0.022, "seed": 505},
+    "currency-war":            {"start_price": 1.0840, "trend_pre": "sideways", "trend_post": "down", "volatility": 0.006, "seed": 606},
+}
+
+# Legacy module-level names, resolved lazily through ``__getattr__``
+_LEGACY_NAMES: dict[str, str] = {
+    "EARNINGS_SURPRISE_DATA": "earnings-surprise-rally",
+    "INTEREST_RATE_DATA": "interest-rate-shock",
+    "CRYPTO_CRASH_DATA": "crypto-flash-crash",
+    "OIL_SUPPLY_DATA": "oil-supply-disruption",
+    "TECH_IPO_DATA": "tech-ipo-frenzy",
+    "CURRENCY_WAR_DATA": "currency-war",
+}
 
 # ══════════════════════════════════════════════════════════════════════════════
-# Registry — maps slug → chart data
+# Registry — maps slug → chart data (filled on demand)
 # ══════════════════════════════════════════════════════════════════════════════
 
-ALL_CHART_DATA: dict[str, list[dict]] = {
-    "zero-day-vulnerability": ZERO_DAY_CHART_DATA,
-    "earnings-surprise-rally": EARNINGS_SURPRISE_DATA,
-    "interest-rate-shock": INTEREST_RATE_DATA,
-    "crypto-flash-crash": CRYPTO_CRASH_DATA,
-    "oil-supply-disruption": OIL_SUPPLY_DATA,
-    "tech-ipo-frenzy": TECH_IPO_DATA,
-    "currency-war": CURRENCY_WAR_DATA,
+_chart_cache: dict[str, BarSeries] = {
+    "zero-day-vulnerability": BarSeries.from_bars(ZERO_DAY_CHART_DATA),
 }
 
+CHART_SLUGS: tuple[str, ...] = ("zero-day-vulnerability", *_GENERATED_CHART_SPECS)
+
+
+def _chart(slug: str) -> BarSeries:
+    """Return the bars for ``slug``, generating them on first use."""
+    bars = _chart_cache.get(slug)
+    if bars is None:
+        bars = BarSeries.from_bars(_generate_chart(**_GENERATED_CHART_SPECS[slug]))
+        _chart_cache[slug] = bars
+    return bars
+
+
+def __getattr__(name: str):
+    """Lazily materialise the legacy chart constants and ``ALL_CHART_DATA``."""
+    if name in _LEGACY_NAMES:
+        return _chart(_LEGACY_NAMES[name]).to_dicts()
+    if name == "ALL_CHART_DATA":
+        return {slug: _chart(slug).to_dicts() for slug in CHART_SLUGS}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-def get_pre_event_data(slug: str = "zero-day-vulnerability") -> list[dict]:
+def get_pre_event_data(slug: str = "zero-day-vulnerability") -> BarSeries:
     """Return the first 30 bars (shown before prediction)."""
-    return ALL_CHART_DATA[slug][:30]
+    return _chart(slug)[:30]
 
 
-def get_post_event_data(slug: str = "zero-day-vulnerability") -> list[dict]:
+def get_post_event_data(slug: str = "zero-day-vulnerability") -> BarSeries:
     """Return the last 5 bars (revealed after prediction)."""
-    return ALL_CHART_DATA[slug][30:]
+    return _chart(slug)[30:]
 
 
-def get_full_chart_data(slug: str = "zero-day-vulnerability") -> list[dict]:
+def get_full_chart_data(slug: str = "zero-day-vulnerability") -> BarSeries:
     """Return all 35 bars."""
-    return ALL_CHART_DATA[slug]
+    return _chart(slug)
@@ -0,0 +1,204 @@
+"""Bundled scenario catalog, used when no database is configured.
+
+Also the seed for ``public.scenarios`` (``python -m app.tools.db seed-scenarios``)
+and the source of the mock ML fields, which have no column in the table.
+"""
+
+SCENARIOS: dict[str, dict] = {
+    "zero-day-vulnerability": {
+        "slug": "zero-day-vulnerability",
+        "title": "The Zero-Day Vulnerability",
+        "description": (
+            "A major cybersecurity breach rocks the tech industry. A zero-day "
+            "exploit has been discovered in enterprise defense networks, "
+            "compromising critical infrastructure worldwide."
+        ),
+        "asset_name": "CYBERFORT (CBFT)",
+        "news_headline": (
+            "🚨 BREAKING: Major cybersecurity breach. Hackers exploit a "
+            "zero-day vulnerability, compromising enterprise defense networks."
+        ),
+        "news_body": (
+            "Security researchers have confirmed that a sophisticated threat "
+            "actor has exploited a previously unknown vulnerability in "
+            "CyberFort's flagship enterprise defense platform. The breach has "
+            "affected over 2,000 organizations globally, including Fortune 500 "
+            "companies and government agencies. CyberFort's stock is under "
+            "intense scrutiny as investors assess the damage."
+        ),
+        "difficulty": "beginner",
+        "actual_outcome": "DOWN",
+        "ml_prediction": "DOWN",
+        "ml_confidence": 0.87,
+        "xp_reward": 150,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+    "earnings-surprise-rally": {
+        "slug": "earnings-surprise-rally",
+        "title": "Earnings Surprise Rally",
+        "description": (
+            "A tech giant beats earnings estimates by 40%, shattering analyst "
+            "expectations. Revenue growth accelerated and guidance was raised. "
+            "Will the momentum carry forward?"
+        ),
+        "asset_name": "NVIDIA (NVDA)",
+        "news_headline": (
+            "🚀 BREAKING: NVIDIA smashes Q3 earnings — revenue up 94% YoY, "
+            "beats estimates by 40%."
+        ),
+        "news_body": (
+            "NVIDIA reported record quarterly revenue of $18.1B, driven by "
+            "explosive AI chip demand. Data center revenue tripled year-over-year. "
+            "The company raised Q4 guidance well above Wall Street estimates. "
+            "Analysts are upgrading price targets across the board."
+        ),
+        "difficulty": "beginner",
+        "actual_outcome": "UP",
+        "ml_prediction": "UP",
+        "ml_confidence": 0.92,
+        "xp_reward": 100,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+    "interest-rate-shock": {
+        "slug": "interest-rate-shock",
+        "title": "Interest Rate Shock",
+        "description": (
+            "The Federal Reserve announces an unexpected 50 basis point rate "
+            "hike amid persistent inflation, defying market expectations of "
+            "a pause."
+        ),
+        "asset_name": "S&P 500 (SPY)",
+        "news_headline": (
+            "⚠️ BREAKING: Fed surprises markets with 50bp rate hike — "
+            "signals more tightening ahead."
+        ),
+        "news_body": (
+            "The Federal Reserve raised interest rates by 50 basis points in a "
+            "move that stunned financial markets. Chair Powell cited persistent "
+            "core inflation and a tight labor market. Bond yields surged as "
+            "traders repriced rate expectations. Growth stocks are under "
+            "significant selling pressure."
+        ),
+        "difficulty": "intermediate",
+        "actual_outcome": "DOWN",
+        "ml_prediction": "DOWN",
+        "ml_confidence": 0.78,
+        "xp_reward": 200,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+    "crypto-flash-crash": {
+        "slug": "crypto-flash-crash",
+        "title": "Crypto Flash Crash",
+        "description": (
+            "A major cryptocurrency exchange faces a catastrophic security "
+            "breach. Billions in user funds may be compromised. Panic spreads "
+            "across the crypto market."
+        ),
+        "asset_name": "Bitcoin (BTC)",
+        "news_headline": (
+            "🔴 BREAKING: Major crypto exchange hacked — $2.3B in user funds "
+            "potentially compromised."
+        ),
+        "news_body": (
+            "CryptoVault, the world's third-largest exchange by volume, has "
+            "confirmed a security breach affecting hot wallets. Withdrawals "
+            "are frozen. On-chain analysts report large outflows to unknown "
+            "wallets. The hack echoes the FTX collapse and has triggered "
+            "widespread fear across the crypto ecosystem."
+        ),
+        "difficulty": "advanced",
+        "actual_outcome": "DOWN",
+        "ml_prediction": "DOWN",
+        "ml_confidence": 0.84,
+        "xp_reward": 350,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+    "oil-supply-disruption": {
+        "slug": "oil-supply-disruption",
+        "title": "Oil Supply Disruption",
+        "description": (
+            "OPEC+ announces a surprise production cut of 2 million barrels "
+            "per day, far exceeding market expectations. Global energy markets "
+            "are rattled."
+        ),
+        "asset_name": "Crude Oil (CL)",
+        "news_headline": (
+            "🛢️ BREAKING: OPEC+ slashes output by 2M bpd — biggest cut "
+            "since COVID pandemic."
+        ),
+        "news_body": (
+            "OPEC+ ministers agreed to a surprise production cut of 2 million "
+            "barrels per day starting next month. The decision came despite "
+            "pressure from Western nations to increase supply. Saudi Arabia's "
+            "energy minister cited market stability concerns. Energy analysts "
+            "warn of $100+ oil prices if cuts are sustained."
+        ),
+        "difficulty": "intermediate",
+        "actual_outcome": "UP",
+        "ml_prediction": "UP",
+        "ml_confidence": 0.81,
+        "xp_reward": 250,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+    "tech-ipo-frenzy": {
+        "slug": "tech-ipo-frenzy",
+        "title": "Tech IPO Frenzy",
+        "description": (
+            "A hot AI startup goes public at a massive valuation. First-day "
+            "trading sees enormous volume. Is it sustainable growth or peak "
+            "hype?"
+        ),
+        "asset_name": "AI Startup (AIUP)",
+        "news_headline": (
+            "🔥 BREAKING: AI startup AIUP surges 80% on IPO day — valued "
+            "at $45B with no profits."
+        ),
+        "news_body": (
+            "AIUP, an AI infrastructure company, priced its IPO at $42 and "
+            "soared to $76 in first-day trading. The company has $200M in "
+            "annual revenue but has never been profitable. Insiders face a "
+            "90-day lockup. Some analysts warn of frothy valuations while "
+            "AI bulls say it's still early innings."
+        ),
+        "difficulty": "beginner",
+        "actual_outcome": "DOWN",
+        "ml_prediction": "DOWN",
+        "ml_confidence": 0.69,
+        "xp_reward": 150,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+    "currency-war": {
+        "slug": "currency-war",
+        "title": "Currency War",
+        "description": (
+            "US-EU trade tensions escalate dramatically. New tariffs are "
+            "announced and retaliatory measures are expected. Currency markets "
+            "brace for impact."
+        ),
+        "asset_name": "EUR/USD",
+        "news_headline": (
+            "💱 BREAKING: US imposes 25% tariffs on EU goods — Brussels "
+            "vows retaliation within 48 hours."
+        ),
+        "news_body": (
+            "The US has imposed broad 25% tariffs on EU industrial goods, "
+            "citing unfair trade practices. The European Commission called the "
+            "move 'unjustified' and is preparing retaliatory tariffs on US tech "
+            "and agriculture exports. Currency traders are repositioning "
+            "as safe-haven flows intensify."
+        ),
+        "difficulty": "advanced",
+        "actual_outcome": "DOWN",
+        "ml_prediction": "DOWN",
+        "ml_confidence": 0.73,
+        "xp_reward": 400,
+        "chart_days": 30,
+        "reveal_days": 5,
+    },
+}
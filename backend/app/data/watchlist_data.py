@@ -0,0 +1,142 @@
+"""Per-user watchlist persistence: one JSON file per user plus a change log.
+
+Layout of ``WATCHLIST_DIR``:
+
+- ``<user_id>.json``: one user's watchlist, replaced with write-then-rename
+  so readers never see a partial file.
+- ``changes.log``: one line per change with the id of the user whose
+  watchlist was saved or deleted, only ever appended to.
+
+Writers take an exclusive ``flock`` on the change log, so updates from any
+worker are serialized, never overwrite another user's watchlist, and land
+in the log in the order they were applied. Readers tail the log from a
+byte offset to find what changed since they last looked.
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import quote, unquote
+
+WATCHLIST_DIR = Path(__file__).parent / "watchlists"
+
+# Single-file store used before per-user files; imported once on first use
+_LEGACY_FILE = Path(__file__).parent / "watchlists.json"
+_LOG_NAME = "changes.log"
+
+
+def _normalize(values: list[str]) -> list[str]:
+    """Trimmed, de-duplicated entries in their original order."""
+    seen: dict[str, str] = {}
+    for value in values:
+        value = value.strip()
+        if value:
+            seen.setdefault(value.lower(), value)
+    return list(seen.values())
+
+
+def _user_path(user_id: str) -> Path:
+    return WATCHLIST_DIR / f"{quote(user_id, safe='')}.json"
+
+
+@contextmanager
+def _locked_log():
+    """Open the change log for appending under an exclusive ``flock``."""
+    WATCHLIST_DIR.mkdir(parents=True, exist_ok=True)
+    with open(WATCHLIST_DIR / _LOG_NAME, "ab") as log:
+        fcntl.flock(log, fcntl.LOCK_EX)
+        try:
+            yield log
+        finally:
+            log.flush()
+            fcntl.flock(log, fcntl.LOCK_UN)
+
+
+def _write(user_id: str, watchlist: dict[str, Any]) -> None:
+    path = _user_path(user_id)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(watchlist))
+    os.replace(tmp, path)
+
+
+def _log_change(log, user_id: str) -> None:
+    log.write(json.dumps(user_id).encode() + b"\n")
+
+
+def _migrate_legacy(log) -> None:
+    """Split the old single-file store into per-user files (lock held)."""
+    if not _LEGACY_FILE.exists() or log.seek(0, os.SEEK_END):
+        return
+    legacy = json.loads(_LEGACY_FILE.read_text())
+    for user_id, watchlist in legacy.items():
+        _write(user_id, watchlist)
+        _log_change(log, user_id)
+    print(f"[Watchlists] Migrated {len(legacy)} watchlists from {_LEGACY_FILE.name}")
+
+
+# ── Reads ────────────────────────────────────────────────────────────────────
+
+def read_watchlist(user_id: str) -> Optional[dict[str, Any]]:
+    """One user's watchlist ``{"symbols": [...], "sectors": [...]}``, or ``None``."""
+    try:
+        return json.loads(_user_path(user_id).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def read_watchlists() -> tuple[dict[str, dict[str, Any]], int]:
+    """Every user's watchlist, and the change log offset they reflect.
+
+    The offset is taken before the files are listed, so replaying the log
+    from it can only repeat changes, never miss them.
+    """
+    with _locked_log() as log:
+        _migrate_legacy(log)
+        offset = log.seek(0, os.SEEK_END)
+    watchlists: dict[str, dict[str, Any]] = {}
+    for path in WATCHLIST_DIR.glob("*.json"):
+        try:
+            watchlists[unquote(path.stem)] = json.loads(path.read_text())
+        except FileNotFoundError:
+            continue  # deleted since listing; the log has the change
+    return watchlists, offset
+
+
+def read_changes(offset: int) -> tuple[set[str], int]:
+    """Users whose watchlist changed after log ``offset``, and the new offset."""
+    try:
+        with open(WATCHLIST_DIR / _LOG_NAME, "rb") as log:
+            log.seek(offset)
+            data = log.read()
+    except FileNotFoundError:
+        return set(), offset
+    # Only whole lines; a writer may be mid-append
+    complete = data[:data.rfind(b"\n") + 1]
+    return {json.loads(line) for line in complete.splitlines()}, offset + len(complete)
+
+
+# ── Writes ───────────────────────────────────────────────────────────────────
+
+def save_watchlist(user_id: str, symbols: list[str], sectors: list[str]) -> dict[str, Any]:
+    """Replace one user's watchlist and persist."""
+    watchlist = {"symbols": _normalize(symbols), "sectors": _normalize(sectors)}
+    with _locked_log() as log:
+        _migrate_legacy(log)
+        _write(user_id, watchlist)
+        _log_change(log, user_id)
+    return watchlist
+
+
+def delete_watchlist(user_id: str) -> bool:
+    """Remove one user's watchlist. True if it existed."""
+    with _locked_log() as log:
+        _migrate_legacy(log)
+        try:
+            _user_path(user_id).unlink()
+        except FileNotFoundError:
+            return False
+        _log_change(log, user_id)
+    return True
@@ -1,21 +1,81 @@
 """TradeQuest — FastAPI Backend Entry Point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import get_settings
-from app.routes import scenarios, ml, ai, news
+from app.routes import scenarios, ml, ai, news, watchlists, jobs, profiles
 from app.routes import settings as settings_route
+from app.services import warmup
+from app.services.jobs import get_job_queue
+from app.services.prediction_stats import get_prediction_stats
+from app.services.repository import get_database
+from app.services.admission import AdmissionMiddleware, RouteLimit, parse_networks
+from app.services.request_context import RequestContextMiddleware
 
 cfg = get_settings()
 
+
+# ── Lifespan: warm caches, start background pollers ─────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Kick off warm-up in the background so /health answers immediately."""
+    if cfg.warmup_enabled:
+        warmup.start_warmup(
+            {
+                "news_alerts": news.prewarm_alerts,
+                "alert_search_index": news.prewarm_search_index,
+                "scenario_explanations": scenarios.prewarm_explanations,
+            },
+            budget_seconds=cfg.warmup_budget_seconds,
+        )
+    else:
+        warmup.mark_ready()
+    news.start_live_alerts()
+    get_prediction_stats().start()
+
+    yield
+
+    news.stop_live_alerts()
+    get_job_queue().stop()
+    await get_prediction_stats().stop()
+    warmup.cancel_warmup()
+    await get_database().close()
+
+
 app = FastAPI(
     title="TradeQuest API",
     description="AI-Powered Finance Education & Investment Intelligence Platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-# ── CORS ─────────────────────────────────────────────────────────────────────
+# ── Admission control (Gemini-backed routes shed load, the rest pass) ───────
+# (name, method, path, latency budget declared by the route)
+_GUARDED_ROUTES = [
+    ("ai_explain", "POST", r"/api/ai/explain", cfg.reveal_latency_budget_seconds),
+    ("scenario_predict", "POST", r"/api/scenarios/[^/]+/predict", cfg.reveal_latency_budget_seconds),
+    ("news_alerts", "GET", r"/api/news/alerts", 0.0),
+]
+app.add_middleware(AdmissionMiddleware, limits=[
+    RouteLimit(
+        name=name,
+        method=method,
+        path=path,
+        max_concurrency=cfg.admission_max_concurrency,
+        max_queue=cfg.admission_max_queue,
+        queue_timeout=cfg.admission_queue_timeout_seconds,
+        rate_per_minute=cfg.admission_client_rate_per_minute,
+        burst=cfg.admission_client_burst,
+        latency_budget=budget,
+    )
+    for name, method, path, budget in _GUARDED_ROUTES
+], trusted_proxies=parse_networks(cfg.admission_trusted_proxies))
+
+# ── CORS (added after admission so it wraps shed 429/503 responses too) ──────
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -28,12 +88,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Request context (last added = outermost: arrival precedes queueing) ──────
+app.add_middleware(RequestContextMiddleware, token_budget=cfg.llm_request_token_budget)
+
 # ── Routers ──────────────────────────────────────────────────────────────────
 app.include_router(scenarios.router)
 app.include_router(ml.router)
 app.include_router(ai.router)
 app.include_router(settings_route.router)
 app.include_router(news.router)
+app.include_router(watchlists.router)
+app.include_router(jobs.router)
+app.include_router(profiles.router)
 
 
 # ── Health Check ─────────────────────────────────────────────────────────────
@@ -45,5 +111,14 @@ async def root():
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    """Health-check endpoint."""
+    """Liveness endpoint — up as soon as the process is serving."""
     return {"status": "ok"}
+
+
+@app.get("/ready", tags=["health"])
+async def readiness_check():
+    """Readiness endpoint — 503 until startup warm-up has filled the caches."""
+    state = warmup.readiness()
+    if not state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **state})
+    return {"status": "ready", **state}
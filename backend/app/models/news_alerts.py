@@ -4,6 +4,20 @@ from pydantic import BaseModel
 from typing import Optional
 
 
+class RelatedScenario(BaseModel):
+    """A practice scenario resembling an alert."""
+    slug: str
+    title: str
+    score: float           # cosine similarity, 0-1
+
+
+class AlertSource(BaseModel):
+    """Another outlet that ran the same story."""
+    source: str
+    url: str
+    headline: str
+
+
 class NewsAlert(BaseModel):
     """A single market-impact alert generated by the News Intelligence engine."""
     id: str
@@ -17,9 +31,25 @@ class NewsAlert(BaseModel):
     url: str               # link to original article
     image_url: Optional[str] = None  # article thumbnail
     timestamp: str         # ISO-8601 string
+    related_scenarios: list[RelatedScenario] = []
+    additional_sources: list[AlertSource] = []  # near-duplicate copies folded in
 
 
 class NewsAlertListResponse(BaseModel):
     """Wrapper for a list of alerts."""
     alerts: list[NewsAlert]
     total: int
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
+
+class NewsSearchHit(BaseModel):
+    """A single search result with its BM25 relevance score."""
+    score: float
+    alert: NewsAlert
+
+
+class NewsSearchResponse(BaseModel):
+    """Ranked full-text search results over archived alerts."""
+    query: str
+    hits: list[NewsSearchHit]
+    total: int
@@ -1,7 +1,10 @@
 """Pydantic models for API request/response schemas."""
 
+from datetime import datetime
+from uuid import UUID
+
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Optional
 
 
 # ── Chart Data ────────────────────────────────────────────────────────────────
@@ -21,6 +24,8 @@ class ChartDataResponse(BaseModel):
     asset_name: str
     bars: list[CandlestickBar]
     total_bars: int
+    resolution: str = "daily"
+    source_bars: Optional[int] = None  # bars before downsampling
 
 
 # ── Scenario ──────────────────────────────────────────────────────────────────
@@ -61,6 +66,56 @@ class MLPredictionResponse(BaseModel):
     reasoning: str
 
 
+class CalibrationBin(BaseModel):
+    """One reliability-curve bin of predicted P(UP)."""
+    bin_low: float
+    bin_high: float
+    count: int
+    mean_predicted: float
+    observed_up_rate: float
+
+
+class BacktestResponse(BaseModel):
+    """Strategy evaluation across every scenario."""
+    strategy: str
+    model_version: str
+    scenarios: int
+    accuracy: float
+    brier_score: float
+    calibration: list[CalibrationBin]
+    total_return: float  # sum of per-scenario returns, one unit long/short
+    mean_return: float
+    win_rate: float
+    cached: bool
+
+
+# ── Monte Carlo Simulation ────────────────────────────────────────────────────
+
+class SimulationBand(BaseModel):
+    """Percentiles of simulated closes on one reveal day."""
+    day: int
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+
+
+class SimulationResponse(BaseModel):
+    """Distribution of simulated reveal paths vs the actual outcome."""
+    scenario_slug: str
+    n_paths: int
+    seed: int
+    horizon_days: int
+    start_price: float
+    drift: float       # mean daily log return of the pre-event bars
+    volatility: float  # std of daily log returns
+    bands: list[SimulationBand]
+    prob_up: float
+    actual_close: float
+    actual_percentile: float  # share of paths ending at or below the actual close
+
+
 # ── User Prediction Submission ────────────────────────────────────────────────
 
 class PredictionSubmitRequest(BaseModel):
@@ -69,6 +124,21 @@ class PredictionSubmitRequest(BaseModel):
     user_prediction: str  # "UP" or "DOWN"
 
 
+class CommunityStats(BaseModel):
+    """How all players predicted a scenario."""
+    total_predictions: int
+    up: int
+    down: int
+    correct: int
+    pct_up: float
+    pct_down: float
+    pct_correct: float
+
+
+class ScenarioStatsResponse(CommunityStats):
+    scenario_slug: str
+
+
 class PredictionResultResponse(BaseModel):
     """Full result after prediction reveal."""
     scenario_slug: str
@@ -80,3 +150,50 @@ class PredictionResultResponse(BaseModel):
     xp_earned: int
     reveal_bars: list[CandlestickBar]
     ai_explanation: Optional[dict] = None
+    # Async mode: poll GET /api/jobs/{id} for the Game Master explanation
+    explanation_job_id: Optional[str] = None
+    community: Optional[CommunityStats] = None  # including this prediction
+
+
+# ── Profiles ──────────────────────────────────────────────────────────────────
+
+class ProfileResponse(BaseModel):
+    """A player's gamification profile."""
+    id: UUID
+    username: str
+    display_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    xp: int
+    level: int
+    streak_days: int
+
+
+class UserPrediction(BaseModel):
+    """One stored prediction of a player."""
+    scenario_slug: str
+    user_prediction: str
+    ml_prediction: Optional[str] = None
+    actual_outcome: Optional[str] = None
+    is_user_correct: Optional[bool] = None
+    is_ml_correct: Optional[bool] = None
+    xp_earned: int
+    ai_explanation: Optional[dict] = None
+    created_at: datetime
+
+
+class UserPredictionListResponse(BaseModel):
+    predictions: list[UserPrediction]
+    total: int
+
+
+# ── Background Jobs ───────────────────────────────────────────────────────────
+
+class JobResponse(BaseModel):
+    """State of a background job; ``result`` is set once it is done."""
+    id: str
+    kind: str
+    status: str  # "queued" | "running" | "done" | "failed"
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
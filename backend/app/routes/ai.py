@@ -1,10 +1,15 @@
 """AI explanation routes — standalone endpoint for Game Master analysis."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
 
+from app.config import get_settings
+from app.services.admission import admission_stats
 from app.services.gemini_service import generate_game_master_explanation
+from app.services.llm_dispatch import get_dispatcher
+from app.services.llm_usage import prefix_report, usage_report
+from app.services.request_context import latency_budget
 
 router = APIRouter(prefix="/api/ai", tags=["ai"])
 
@@ -32,7 +37,11 @@ class ExplainResponse(BaseModel):
     fun_fact: str
 
 
-@router.post("/explain", response_model=ExplainResponse)
+@router.post(
+    "/explain",
+    response_model=ExplainResponse,
+    dependencies=[Depends(latency_budget(get_settings().reveal_latency_budget_seconds))],
+)
 async def get_ai_explanation(body: ExplainRequest):
     """
     Generate the Game Master's AI-powered explanation for a prediction outcome.
@@ -52,3 +61,31 @@ async def get_ai_explanation(body: ExplainRequest):
     )
 
     return ExplainResponse(**result)
+
+
+@router.get("/queue")
+async def get_llm_queue():
+    """Running and queued Gemini calls per priority class."""
+    return get_dispatcher().stats()
+
+
+@router.get("/admission")
+async def get_admission():
+    """In-flight, queued and shed requests per guarded route."""
+    return admission_stats()
+
+
+@router.get("/usage")
+async def get_llm_usage(
+    window_seconds: Optional[int] = Query(None, ge=60, le=3600, description="Rolling window; omit for totals since start"),
+):
+    """Gemini token usage and estimated cost per call site, route and model."""
+    return usage_report(window_seconds)
+
+
+@router.get("/usage/prefix")
+async def get_prefix_report(
+    window_seconds: Optional[int] = Query(None, ge=60, le=3600),
+):
+    """What resending each call site's system prompt + priming turn costs."""
+    return prefix_report(window_seconds)
@@ -0,0 +1,28 @@
+"""Background job routes — poll or long-poll results of async work."""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models.schemas import JobResponse
+from app.services.jobs import get_job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("")
+async def get_job_stats():
+    """Jobs per status and the size of the worker pool."""
+    return get_job_queue().stats()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll: seconds to wait for the job to finish"),
+):
+    """Return a job's state, waiting up to ``wait`` seconds for it to finish."""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired")
+    await queue.wait(job, wait)
+    return JobResponse(**job.as_dict())
@@ -1,8 +1,13 @@
-"""Mock ML prediction routes."""
+"""Mock ML prediction routes and strategy backtests."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
 
-from app.models.schemas import MLPredictionRequest, MLPredictionResponse
+from fastapi import APIRouter, HTTPException, Query
+
+from app.data.mock_chart_data import get_pre_event_data, get_post_event_data
+from app.data.scenario_data import SCENARIOS
+from app.models.schemas import MLPredictionRequest, MLPredictionResponse, BacktestResponse
+from app.services.backtest import STRATEGIES, build_batch, run_backtest
 
 router = APIRouter(prefix="/api/ml", tags=["ml"])
 
@@ -44,3 +49,36 @@ async def get_ml_prediction(body: MLPredictionRequest):
         scenario_slug=body.scenario_slug,
         **prediction,
     )
+
+
+# ── GET /api/ml/backtest ─────────────────────────────────────────────────────
+def scenario_cases() -> list[dict]:
+    """Backtest inputs for every scenario in the catalog."""
+    return [
+        {
+            "slug": slug,
+            "pre_close": get_pre_event_data(slug).close.tolist(),
+            "post_close": get_post_event_data(slug).close.tolist(),
+            "actual_outcome": scenario["actual_outcome"],
+            "ml_prediction": scenario["ml_prediction"],
+            "ml_confidence": scenario["ml_confidence"],
+        }
+        for slug, scenario in SCENARIOS.items()
+    ]
+
+
+@router.get("/backtest", response_model=BacktestResponse)
+async def backtest(
+    strategy: str = Query("ml", description=f"One of: {', '.join(STRATEGIES)}"),
+    bins: int = Query(10, ge=2, le=50, description="Calibration curve bins"),
+):
+    """
+    Evaluate a strategy over every scenario in one vectorized pass.
+
+    Reports accuracy, Brier score, a reliability curve and hypothetical
+    P&L. Results are cached per model version.
+    """
+    if strategy not in STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"strategy must be one of {list(STRATEGIES)}")
+    batch = build_batch(scenario_cases())
+    return await asyncio.to_thread(run_backtest, strategy, batch, bins)
@@ -6,25 +6,155 @@ alerts through a REST endpoint and an SSE stream.
 
 import asyncio
 import json
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 
-from app.models.news_alerts import NewsAlert, NewsAlertListResponse
+from app.models.news_alerts import (
+    NewsAlert,
+    NewsAlertListResponse,
+    NewsSearchHit,
+    NewsSearchResponse,
+)
+from app.config import get_settings
 from app.services.news_intelligence import (
     fetch_finnhub_news,
+    fetch_finnhub_news_strict,
     analyze_article,
+    article_key,
     build_live_alert,
+    near_duplicate_of,
     analyze_scenario_news,
     build_alert_from_scenario,
 )
-from app.routes.scenarios import SCENARIOS
+from app.services.alert_archive import get_alert_archive
+from app.services.alert_search import get_search_index
+from app.services.alert_set import AlertSet
+from app.services.records import AlertRecord
+from app.services.alert_stream import AlertHub, StreamReset
+from app.services.alert_topics import TopicRouter, Subscriber, subscription_topics
+from app.services.news_ingest import NewsIngestor
+from app.services.shared_state import get_shared_state
+from app.services.singleflight import SingleFlight
+from app.data.scenario_data import SCENARIOS
+from app.routes.scenarios import related_scenarios
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
 
-# ── In-memory set of seen article IDs (for SSE deduplication) ────────────────
-_seen_article_ids: set[str] = set()
+# ── Shared dedup window + alert channel (one poller per host) ────────────────
+_SEEN_NAMESPACE = "seen_article_ids"
+_SEEN_TTL = 24 * 3600
+_ALERT_CHANNEL = "news_alerts"
+_POLLER_LEASE = "news_alert_poller"
+_POLLER_LEASE_TTL = 120
+# Renewed on a heartbeat: poll intervals can be far longer than the TTL
+_POLLER_LEASE_RENEW_SECONDS = _POLLER_LEASE_TTL / 4
+_SSE_RETRY_MS = 3000
+_WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_poller_task: asyncio.Task | None = None
+
+# Concurrent /alerts requests share one Finnhub fetch + Gemini pass
+_alert_flights = SingleFlight()
+
+# Indexed snapshot of the live alerts, refreshed at most every 30s
+_ALERT_SET_TTL = 30.0
+_alert_set: AlertSet | None = None
+
+# Recently published alerts by story, so later copies fold into them
+_published_stories: OrderedDict[str, AlertRecord] = OrderedDict()
+
+
+async def _mark_seen(article_id: str) -> bool:
+    """Record an article ID in the shared dedup window. True if it was new."""
+    return await get_shared_state().add_if_absent(_SEEN_NAMESPACE, article_id, ttl=_SEEN_TTL)
+
+
+def _group_stories(articles: list[dict]) -> dict[str, list[dict]]:
+    """Group articles by story; near-duplicates join the original's group."""
+    stories: dict[str, list[dict]] = {}
+    for article in articles:
+        story = near_duplicate_of(article) or article_key(article)
+        stories.setdefault(story, []).append(article)
+    return stories
+
+
+def _fold_sources(alert: dict, copies: list[dict]) -> None:
+    """Record near-duplicate copies of a story as extra sources."""
+    sources = alert.setdefault("additional_sources", [])
+    known = {alert["url"], *(s["url"] for s in sources)}
+    for copy in copies:
+        if copy.get("url", "") not in known:
+            known.add(copy.get("url", ""))
+            sources.append({
+                "source": copy.get("source", "Unknown"),
+                "url": copy.get("url", ""),
+                "headline": copy.get("headline", ""),
+            })
+
+
+def _live_alert(article: dict, analysis: dict, copies: Optional[list[dict]] = None) -> dict:
+    """Build a live alert linked to the practice scenarios it resembles."""
+    alert = build_live_alert(article, analysis)
+    alert["related_scenarios"] = related_scenarios(
+        " ".join((alert["headline"], article.get("summary", ""), alert["impact_summary"]))
+    )
+    _fold_sources(alert, copies or [])
+    return alert
+
+
+def _remember_story(story: str, alert: dict) -> None:
+    _published_stories[story] = AlertRecord.from_dict(alert)
+    while len(_published_stories) > _settings.near_duplicate_window:
+        _published_stories.popitem(last=False)
+
+
+def _fold_into_story(story: str, copies: list[dict]) -> Optional[dict]:
+    """The story's published alert with ``copies`` folded in (None if unknown)."""
+    published = _published_stories.get(story)
+    if published is None:
+        return None
+    # Fresh dict: the published event must not change under existing readers
+    alert = published.as_dict()
+    _fold_sources(alert, copies)
+    _remember_story(story, alert)
+    return alert
+
+
+async def _archive(alerts: list[dict]) -> None:
+    """Append newly seen alerts to the on-disk archive.
+
+    An alert that gained sources is appended again under the same id; the
+    later record supersedes the earlier one.
+    """
+    if not alerts:
+        return
+    try:
+        await asyncio.to_thread(get_alert_archive().append, alerts)
+    except OSError as e:
+        print(f"[News] Alert archive write error: {e}")
+
+
+async def _current_alert_set() -> AlertSet:
+    """Return the indexed live alert snapshot, refreshing it when stale.
+
+    Concurrent refreshes are coalesced into one computation.
+    """
+    if _alert_set is None or _alert_set.age() > _ALERT_SET_TTL:
+        return await _alert_flights.do("live_alerts", _refresh_alert_set)
+    return _alert_set
+
+
+async def _refresh_alert_set() -> AlertSet:
+    global _alert_set
+    _alert_set = AlertSet(await _generate_live_alerts())
+    return _alert_set
 
 
 async def _generate_live_alerts() -> list[dict]:
@@ -35,31 +165,45 @@ async def _generate_live_alerts() -> list[dict]:
         # Fall back to scenario-based alerts if Finnhub is unavailable
         return await _generate_scenario_fallback_alerts()
 
+    # Analyze one article per new story concurrently; copies become extra sources
+    stories = list(_group_stories(articles).items())
+    unknown = [(story, group) for story, group in stories if story not in _published_stories]
+    analyses = await asyncio.gather(*(analyze_article(group[0]) for _, group in unknown))
+    analyzed = {story: analysis for (story, _), analysis in zip(unknown, analyses)}
+
     alerts: list[dict] = []
-    for article in articles:
-        analysis = await analyze_article(article)
-        alert = build_live_alert(article, analysis)
+    to_archive: list[dict] = []
+    for story, group in stories:
+        # Track seen IDs for SSE stream; any first sighting reaches the archive,
+        # whether it starts the story or is a new copy of an archived one
+        newly_seen = [a for a in group if a.get("id") and await _mark_seen(str(a["id"]))]
+        if story in analyzed:
+            alert = _live_alert(group[0], analyzed[story], group[1:])
+            _remember_story(story, alert)
+        else:
+            alert = _fold_into_story(story, group)
         alerts.append(alert)
+        if newly_seen:
+            to_archive.append(alert)
 
-        # Track seen IDs for SSE stream
-        _seen_article_ids.add(str(article.get("id", "")))
-
-    # Sort by severity: critical → high → medium
-    severity_order = {"critical": 0, "high": 1, "medium": 2}
-    alerts.sort(key=lambda a: severity_order.get(a["severity"], 3))
+    await _archive(to_archive)
     return alerts
 
 
 async def _generate_scenario_fallback_alerts() -> list[dict]:
     """Fallback: generate alerts from in-memory scenarios when Finnhub is down."""
-    alerts: list[dict] = []
-    for slug, scenario in SCENARIOS.items():
-        analysis = await analyze_scenario_news(
+    analyses = await asyncio.gather(*(
+        analyze_scenario_news(
             scenario_slug=slug,
             news_headline=scenario["news_headline"],
             news_body=scenario["news_body"],
             asset_name=scenario["asset_name"],
         )
+        for slug, scenario in SCENARIOS.items()
+    ))
+
+    alerts: list[dict] = []
+    for (slug, scenario), analysis in zip(SCENARIOS.items(), analyses):
         alert = build_alert_from_scenario(
             scenario_slug=slug,
             headline=scenario["news_headline"],
@@ -68,54 +212,253 @@ async def _generate_scenario_fallback_alerts() -> list[dict]:
         )
         alerts.append(alert)
 
-    severity_order = {"critical": 0, "high": 1, "medium": 2}
-    alerts.sort(key=lambda a: severity_order.get(a["severity"], 3))
     return alerts
 
 
 # ── GET /api/news/alerts ─────────────────────────────────────────────────────
 @router.get("/alerts", response_model=NewsAlertListResponse)
-async def list_alerts():
-    """Return all current market-impact alerts from live financial news."""
-    alerts = await _generate_live_alerts()
+async def list_alerts(
+    severity: Optional[str] = Query(None, pattern="^(critical|high|medium)$"),
+    sector: Optional[str] = None,
+    asset: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+):
+    """
+    Return current market-impact alerts from live financial news.
+
+    Sorted critical → high → medium, newest first. Optional filters by
+    severity, sector, asset (name or ticker) and time range are answered
+    from per-severity/sector/asset indexes. Pass `limit` to paginate and
+    the returned `next_cursor` as `cursor` for the next page.
+    """
+    alert_set = await _current_alert_set()
+    try:
+        alerts, total, next_cursor = alert_set.query(
+            severity=severity,
+            sector=sector,
+            asset=asset,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return NewsAlertListResponse(
+        alerts=[NewsAlert(**a.as_dict()) for a in alerts],
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
+# ── GET /api/news/history ────────────────────────────────────────────────────
+@router.get("/history", response_model=NewsAlertListResponse)
+async def alert_history(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    severity: Optional[str] = Query(None, pattern="^(critical|high|medium)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Return archived alerts flagged between `since` and `until`, oldest first.
+
+    An alert that later gained sources appears again under the same id
+    when it was updated; the later record supersedes the earlier one.
+
+    The archive's sidecar index is binary-searched for the time range, so
+    queries seek straight to the matching records instead of scanning.
+    """
+    alerts = await asyncio.to_thread(
+        get_alert_archive().query,
+        since.timestamp() if since else None,
+        until.timestamp() if until else None,
+        severity,
+        limit,
+        offset,
+    )
     return NewsAlertListResponse(
         alerts=[NewsAlert(**a) for a in alerts],
         total=len(alerts),
     )
 
 
-# ── GET /api/news/alerts/stream ──────────────────────────────────────────────
-async def _live_alert_event_generator():
-    """SSE generator — polls Finnhub every 45s for new articles."""
+# ── GET /api/news/search ─────────────────────────────────────────────────────
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_alerts(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = False,
+):
+    """
+    Full-text search over archived alerts, ranked with BM25.
+
+    Matches headline, impact summary, sectors and asset. Terms ending in `*`
+    (or the last term when `prefix=true`) match by prefix, e.g. `NVD*`.
+    """
+    hits = await asyncio.to_thread(get_search_index().search, q, limit, prefix)
+    # An alert re-archived with more sources is one hit: best rank, latest record
+    latest: dict[str, tuple[float, dict]] = {}
+    for score, alert in hits:
+        latest[alert["id"]] = (latest.get(alert["id"], (score,))[0], alert)
+    return NewsSearchResponse(
+        query=q,
+        hits=[NewsSearchHit(score=score, alert=NewsAlert(**alert)) for score, alert in latest.values()],
+        total=len(latest),
+    )
+
+
+async def prewarm_search_index() -> None:
+    """Warm-up job: index everything already in the alert archive."""
+    await asyncio.to_thread(get_search_index().sync)
+
+
+# ── Live ingestion (one poller per host) ─────────────────────────────────────
+async def _hold_poller_lease() -> bool:
+    """Only the worker holding the poller lease talks to Finnhub."""
+    return await get_shared_state().acquire_lease(_POLLER_LEASE, _WORKER_ID, ttl=_POLLER_LEASE_TTL)
+
+
+async def _renew_poller_lease() -> None:
+    """Keep the lease held between polls; take it over if its holder died."""
     while True:
-        await asyncio.sleep(45)
+        try:
+            await _hold_poller_lease()
+        except Exception as e:
+            print(f"[News] Poller lease renewal error: {e}")
+        await asyncio.sleep(_POLLER_LEASE_RENEW_SECONDS)
+
+
+async def _run_poller() -> None:
+    await asyncio.gather(_renew_poller_lease(), _ingestor.run())
+
+
+async def _publish_new_articles(category: str, articles: list[dict]) -> None:
+    """Analyze articles no worker has seen yet, archive and publish them.
+
+    Near-duplicates of a recently published story are folded into its alert,
+    which is re-published and re-archived under the same alert id instead of
+    a new alert.
+    """
+    new_articles = [
+        a for a in articles
+        if not str(a.get("id", "")) or await _mark_seen(str(a.get("id", "")))
+    ]
+    fresh: list[tuple[str, list[dict]]] = []
+    updated: list[dict] = []
+    for story, group in _group_stories(new_articles).items():
+        alert = _fold_into_story(story, group)
+        if alert is not None:
+            updated.append(alert)
+        else:
+            fresh.append((story, group))
+
+    analyses = await asyncio.gather(*(analyze_article(group[0]) for _, group in fresh))
+    alerts = []
+    for (story, group), analysis in zip(fresh, analyses):
+        alert = _live_alert(group[0], analysis, group[1:])
+        _remember_story(story, alert)
+        alerts.append(alert)
 
-        articles = await fetch_finnhub_news(category="general", limit=5)
+    await _archive(alerts + updated)
+    state = get_shared_state()
+    for alert in alerts + updated:
+        await state.publish(_ALERT_CHANNEL, alert)
+
+
+_settings = get_settings()
+_ingestor = NewsIngestor(
+    fetch=fetch_finnhub_news_strict,
+    handle=_publish_new_articles,
+    should_poll=_hold_poller_lease,
+    requests_per_minute=_settings.finnhub_requests_per_minute,
+    min_interval=_settings.news_poll_min_seconds,
+    max_interval=_settings.news_poll_max_seconds,
+)
 
-        for article in articles:
-            article_id = str(article.get("id", ""))
+# This worker's replay buffer + fan-out for streaming clients
+_alert_hub = AlertHub(_ALERT_CHANNEL, buffer_size=_settings.sse_replay_buffer_size)
+_topic_router = TopicRouter()
 
-            # Only emit articles we haven't seen before
-            if article_id and article_id in _seen_article_ids:
-                continue
 
-            _seen_article_ids.add(article_id)
-            analysis = await analyze_article(article)
-            alert = build_live_alert(article, analysis)
+def start_live_alerts() -> None:
+    """Start this worker's poller loop and alert hub if not running yet."""
+    global _poller_task
+    if _poller_task is None or _poller_task.done():
+        _poller_task = asyncio.create_task(_run_poller())
+    _alert_hub.start()
+    _topic_router.start(_alert_hub)
 
-            yield f"data: {json.dumps(alert)}\n\n"
+
+def stop_live_alerts() -> None:
+    """Cancel this worker's poller loop and alert hub (called on shutdown)."""
+    global _poller_task
+    if _poller_task is not None:
+        _poller_task.cancel()
+        _poller_task = None
+    _topic_router.stop()
+    _alert_hub.stop()
+
+
+# ── GET /api/news/ingest/metrics ─────────────────────────────────────────────
+@router.get("/ingest/metrics")
+async def ingest_metrics():
+    """Per-category poll intervals, arrival rates and freshness for this worker."""
+    return _ingestor.metrics()
+
+
+# ── GET /api/news/alerts/stream ──────────────────────────────────────────────
+async def prewarm_alerts() -> None:
+    """Warm-up job: fetch and analyze the current news feed."""
+    await _current_alert_set()
+
+
+async def _live_alert_event_generator(last_event_id: Optional[int]):
+    """SSE generator — replays missed alerts, then relays live ones.
+
+    Each event carries its monotonic `id:`; idle periods emit heartbeat
+    comments so proxies don't cut the connection. When missed alerts can't
+    be replayed, a `reset` event tells the client to refetch `/alerts`.
+    """
+    start_live_alerts()
+    yield f"retry: {_SSE_RETRY_MS}\n\n"
+    async for event in _alert_hub.listen(last_event_id, _settings.sse_heartbeat_seconds):
+        if event is None:
+            yield ": keepalive\n\n"
+            continue
+        if isinstance(event, StreamReset):
+            reset = {"last_event_id": event.last_event_id, "refetch": "/api/news/alerts"}
+            yield f"id: {event.resume_id}\nevent: reset\ndata: {json.dumps(reset)}\n\n"
+            continue
+        event_id, alert = event
+        yield f"id: {event_id}\ndata: {json.dumps(alert)}\n\n"
 
 
 @router.get("/alerts/stream")
-async def stream_alerts():
+async def stream_alerts(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    since_id: Optional[int] = Query(None, ge=0, description="Resume after this event id"),
+):
     """
     SSE endpoint — clients receive new live market-impact alerts as they arrive.
 
-    Polls Finnhub every ~45s for fresh articles.
-    Connect with `new EventSource('/api/news/alerts/stream')`.
+    Finnhub's general, forex, crypto and merger feeds are polled at
+    adaptive intervals (see `/api/news/ingest/metrics`).
+    Connect with `new EventSource('/api/news/alerts/stream')`. On reconnect
+    the browser sends `Last-Event-ID` and only the missed alerts are replayed.
+    If they are no longer buffered, a `reset` event is sent instead: reload
+    `/api/news/alerts`, then keep listening.
     """
+    resume_id = since_id
+    if last_event_id and last_event_id.isdigit():
+        resume_id = int(last_event_id)
+
     return StreamingResponse(
-        _live_alert_event_generator(),
+        _live_alert_event_generator(resume_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -123,3 +466,84 @@ async def stream_alerts():
             "X-Accel-Buffering": "no",
         },
     )
+
+
+# ── WS /api/news/alerts/ws ───────────────────────────────────────────────────
+async def _send_alert_batches(websocket: WebSocket, subscriber: Subscriber, send_lock: asyncio.Lock) -> None:
+    """Drain the subscriber's queue, folding bursts into one frame each."""
+    loop = asyncio.get_running_loop()
+    window = _settings.ws_batch_window_ms / 1000
+    while True:
+        batch = [await subscriber.queue.get()]
+        deadline = loop.time() + window
+        while len(batch) < _settings.ws_max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(subscriber.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        async with send_lock:
+            await websocket.send_json({
+                "type": "alerts",
+                "last_event_id": batch[-1][0],
+                "alerts": [alert for _, alert in batch],
+                "dropped": subscriber.dropped,
+            })
+
+
+@router.websocket("/alerts/ws")
+async def alerts_websocket(websocket: WebSocket):
+    """
+    WebSocket alert channel with server-side topic subscriptions.
+
+    Send `{"action": "subscribe", "min_severity": "high", "sectors": [...],
+    "assets": [...]}` to (re)define the subscription; an alert is delivered
+    only if it matches every filter given (any listed sector, any listed
+    asset, at or above the severity). Bursts are batched into a single
+    `{"type": "alerts", ...}` frame. Per-message deflate is negotiated by
+    the ASGI server (uvicorn enables it by default).
+    """
+    await websocket.accept()
+    start_live_alerts()
+    subscriber = _topic_router.add()
+    send_lock = asyncio.Lock()
+    sender = asyncio.create_task(_send_alert_batches(websocket, subscriber, send_lock))
+
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+                action = message.get("action")
+                if action == "subscribe":
+                    clauses = subscription_topics(
+                        min_severity=message.get("min_severity"),
+                        sectors=message.get("sectors"),
+                        assets=message.get("assets"),
+                    )
+                    _topic_router.update(subscriber, clauses)
+                    reply = {"type": "subscribed", "topics": [sorted(c) for c in clauses]}
+                elif action == "unsubscribe":
+                    _topic_router.update(subscriber, [])
+                    reply = {"type": "unsubscribed"}
+                elif action == "ping":
+                    reply = {"type": "pong"}
+                else:
+                    reply = {"type": "error", "detail": f"Unknown action '{action}'"}
+            except (ValueError, AttributeError, TypeError) as e:
+                reply = {"type": "error", "detail": str(e)}
+
+            async with send_lock:
+                await websocket.send_json(reply)
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        _topic_router.remove(subscriber)
+        # Retrieve the sender's outcome so a send failure is logged, not lost
+        (outcome,) = await asyncio.gather(sender, return_exceptions=True)
+        if isinstance(outcome, Exception):
+            print(f"[News] WebSocket alert sender failed: {outcome!r}")
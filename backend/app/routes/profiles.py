@@ -0,0 +1,31 @@
+"""Profile routes — the signed-in player's XP and stored predictions."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models.schemas import ProfileResponse, UserPrediction, UserPredictionListResponse
+from app.services.auth import require_user
+from app.services.repository import get_prediction_repository, get_profile_repository
+
+router = APIRouter(prefix="/api/profiles", tags=["profiles"])
+
+
+@router.get("/me", response_model=ProfileResponse)
+async def get_profile(user_id: str = Depends(require_user)):
+    """Return the signed-in player's profile."""
+    profile = await get_profile_repository().get(user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="No profile for this user")
+    return ProfileResponse(**profile)
+
+
+@router.get("/me/predictions", response_model=UserPredictionListResponse)
+async def get_user_predictions(
+    user_id: str = Depends(require_user),
+    limit: int = Query(100, ge=1, le=500),
+):
+    """The signed-in player's predictions, newest first."""
+    rows = await get_prediction_repository().for_user(user_id, limit)
+    return UserPredictionListResponse(
+        predictions=[UserPrediction(**row) for row in rows],
+        total=len(rows),
+    )
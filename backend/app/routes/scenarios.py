@@ -1,6 +1,10 @@
 """Scenario routes — serve scenario metadata and chart data."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from functools import lru_cache, partial
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.models.schemas import (
     ScenarioResponse,
@@ -8,219 +12,88 @@ from app.models.schemas import (
     ChartDataResponse,
     PredictionResultResponse,
     PredictionSubmitRequest,
+    SimulationResponse,
+    ScenarioStatsResponse,
 )
-from app.data.mock_chart_data import get_pre_event_data, get_post_event_data
+from app.data.mock_chart_data import CHART_SLUGS, get_pre_event_data, get_post_event_data
+from app.data.scenario_data import SCENARIOS
+from app.services.auth import optional_user
+from app.services.chart_resample import RESOLUTIONS, aggregate, lttb
+from app.services.records import BarSeries
+from app.services.scenario_index import get_scenario_index
+from app.services.simulation import simulate
+from app.config import get_settings
 from app.services.gemini_service import generate_game_master_explanation
+from app.services.jobs import DONE, Job, JobQueueFull, get_job_queue
+from app.services.llm_dispatch import Priority
+from app.services.prediction_stats import get_prediction_stats
+from app.services.repository import get_prediction_repository, get_scenario_repository
+from app.services.request_context import latency_budget
+from app.services.shared_state import get_shared_state
 
 router = APIRouter(prefix="/api/scenarios", tags=["scenarios"])
 
-# ── In-memory scenario registry ─────────────────────────────────────────────
-
-SCENARIOS: dict[str, dict] = {
-    "zero-day-vulnerability": {
-        "slug": "zero-day-vulnerability",
-        "title": "The Zero-Day Vulnerability",
-        "description": (
-            "A major cybersecurity breach rocks the tech industry. A zero-day "
-            "exploit has been discovered in enterprise defense networks, "
-            "compromising critical infrastructure worldwide."
-        ),
-        "asset_name": "CYBERFORT (CBFT)",
-        "news_headline": (
-            "🚨 BREAKING: Major cybersecurity breach. Hackers exploit a "
-            "zero-day vulnerability, compromising enterprise defense networks."
-        ),
-        "news_body": (
-            "Security researchers have confirmed that a sophisticated threat "
-            "actor has exploited a previously unknown vulnerability in "
-            "CyberFort's flagship enterprise defense platform. The breach has "
-            "affected over 2,000 organizations globally, including Fortune 500 "
-            "companies and government agencies. CyberFort's stock is under "
-            "intense scrutiny as investors assess the damage."
-        ),
-        "difficulty": "beginner",
-        "actual_outcome": "DOWN",
-        "ml_prediction": "DOWN",
-        "ml_confidence": 0.87,
-        "xp_reward": 150,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-    "earnings-surprise-rally": {
-        "slug": "earnings-surprise-rally",
-        "title": "Earnings Surprise Rally",
-        "description": (
-            "A tech giant beats earnings estimates by 40%, shattering analyst "
-            "expectations. Revenue growth accelerated and guidance was raised. "
-            "Will the momentum carry forward?"
-        ),
-        "asset_name": "NVIDIA (NVDA)",
-        "news_headline": (
-            "🚀 BREAKING: NVIDIA smashes Q3 earnings — revenue up 94% YoY, "
-            "beats estimates by 40%."
-        ),
-        "news_body": (
-            "NVIDIA reported record quarterly revenue of $18.1B, driven by "
-            "explosive AI chip demand. Data center revenue tripled year-over-year. "
-            "The company raised Q4 guidance well above Wall Street estimates. "
-            "Analysts are upgrading price targets across the board."
-        ),
-        "difficulty": "beginner",
-        "actual_outcome": "UP",
-        "ml_prediction": "UP",
-        "ml_confidence": 0.92,
-        "xp_reward": 100,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-    "interest-rate-shock": {
-        "slug": "interest-rate-shock",
-        "title": "Interest Rate Shock",
-        "description": (
-            "The Federal Reserve announces an unexpected 50 basis point rate "
-            "hike amid persistent inflation, defying market expectations of "
-            "a pause."
-        ),
-        "asset_name": "S&P 500 (SPY)",
-        "news_headline": (
-            "⚠️ BREAKING: Fed surprises markets with 50bp rate hike — "
-            "signals more tightening ahead."
-        ),
-        "news_body": (
-            "The Federal Reserve raised interest rates by 50 basis points in a "
-            "move that stunned financial markets. Chair Powell cited persistent "
-            "core inflation and a tight labor market. Bond yields surged as "
-            "traders repriced rate expectations. Growth stocks are under "
-            "significant selling pressure."
-        ),
-        "difficulty": "intermediate",
-        "actual_outcome": "DOWN",
-        "ml_prediction": "DOWN",
-        "ml_confidence": 0.78,
-        "xp_reward": 200,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-    "crypto-flash-crash": {
-        "slug": "crypto-flash-crash",
-        "title": "Crypto Flash Crash",
-        "description": (
-            "A major cryptocurrency exchange faces a catastrophic security "
-            "breach. Billions in user funds may be compromised. Panic spreads "
-            "across the crypto market."
-        ),
-        "asset_name": "Bitcoin (BTC)",
-        "news_headline": (
-            "🔴 BREAKING: Major crypto exchange hacked — $2.3B in user funds "
-            "potentially compromised."
-        ),
-        "news_body": (
-            "CryptoVault, the world's third-largest exchange by volume, has "
-            "confirmed a security breach affecting hot wallets. Withdrawals "
-            "are frozen. On-chain analysts report large outflows to unknown "
-            "wallets. The hack echoes the FTX collapse and has triggered "
-            "widespread fear across the crypto ecosystem."
-        ),
-        "difficulty": "advanced",
-        "actual_outcome": "DOWN",
-        "ml_prediction": "DOWN",
-        "ml_confidence": 0.84,
-        "xp_reward": 350,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-    "oil-supply-disruption": {
-        "slug": "oil-supply-disruption",
-        "title": "Oil Supply Disruption",
-        "description": (
-            "OPEC+ announces a surprise production cut of 2 million barrels "
-            "per day, far exceeding market expectations. Global energy markets "
-            "are rattled."
-        ),
-        "asset_name": "Crude Oil (CL)",
-        "news_headline": (
-            "🛢️ BREAKING: OPEC+ slashes output by 2M bpd — biggest cut "
-            "since COVID pandemic."
-        ),
-        "news_body": (
-            "OPEC+ ministers agreed to a surprise production cut of 2 million "
-            "barrels per day starting next month. The decision came despite "
-            "pressure from Western nations to increase supply. Saudi Arabia's "
-            "energy minister cited market stability concerns. Energy analysts "
-            "warn of $100+ oil prices if cuts are sustained."
-        ),
-        "difficulty": "intermediate",
-        "actual_outcome": "UP",
-        "ml_prediction": "UP",
-        "ml_confidence": 0.81,
-        "xp_reward": 250,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-    "tech-ipo-frenzy": {
-        "slug": "tech-ipo-frenzy",
-        "title": "Tech IPO Frenzy",
-        "description": (
-            "A hot AI startup goes public at a massive valuation. First-day "
-            "trading sees enormous volume. Is it sustainable growth or peak "
-            "hype?"
-        ),
-        "asset_name": "AI Startup (AIUP)",
-        "news_headline": (
-            "🔥 BREAKING: AI startup AIUP surges 80% on IPO day — valued "
-            "at $45B with no profits."
-        ),
-        "news_body": (
-            "AIUP, an AI infrastructure company, priced its IPO at $42 and "
-            "soared to $76 in first-day trading. The company has $200M in "
-            "annual revenue but has never been profitable. Insiders face a "
-            "90-day lockup. Some analysts warn of frothy valuations while "
-            "AI bulls say it's still early innings."
-        ),
-        "difficulty": "beginner",
-        "actual_outcome": "DOWN",
-        "ml_prediction": "DOWN",
-        "ml_confidence": 0.69,
-        "xp_reward": 150,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-    "currency-war": {
-        "slug": "currency-war",
-        "title": "Currency War",
-        "description": (
-            "US-EU trade tensions escalate dramatically. New tariffs are "
-            "announced and retaliatory measures are expected. Currency markets "
-            "brace for impact."
-        ),
-        "asset_name": "EUR/USD",
-        "news_headline": (
-            "💱 BREAKING: US imposes 25% tariffs on EU goods — Brussels "
-            "vows retaliation within 48 hours."
-        ),
-        "news_body": (
-            "The US has imposed broad 25% tariffs on EU industrial goods, "
-            "citing unfair trade practices. The European Commission called the "
-            "move 'unjustified' and is preparing retaliatory tariffs on US tech "
-            "and agriculture exports. Currency traders are repositioning "
-            "as safe-haven flows intensify."
-        ),
-        "difficulty": "advanced",
-        "actual_outcome": "DOWN",
-        "ml_prediction": "DOWN",
-        "ml_confidence": 0.73,
-        "xp_reward": 400,
-        "chart_days": 30,
-        "reveal_days": 5,
-    },
-}
+
+def related_scenarios(text: str, k: int = 3) -> list[dict]:
+    """Scenarios whose text most resembles ``text``, best first.
+
+    Scenarios added to the registry, or whose text changed, since the last
+    call are (re-)indexed first.
+    """
+    index = get_scenario_index()
+    for slug, scenario in SCENARIOS.items():
+        index.add(slug, " ".join((
+            scenario["title"],
+            scenario["description"],
+            scenario["news_headline"],
+            scenario["news_body"],
+            scenario["asset_name"],
+        )))
+    return [
+        {"slug": slug, "title": SCENARIOS[slug]["title"], "score": score}
+        for slug, score in index.match(text, k=k)
+        if slug in SCENARIOS
+    ]
+
+
+# One worker per host pre-generates; the others read the shared cache
+_PREWARM_CLAIM_NAMESPACE = "warmup_claims"
+_PREWARM_CLAIM_TTL = 12 * 3600  # well inside the 24 h explanation cache TTL
+
+
+async def prewarm_explanations() -> None:
+    """Warm-up job: pre-generate Game Master analyses for every reveal.
+
+    Runs on the first worker to claim it; restarts within the claim TTL skip it.
+    """
+    claimed = await get_shared_state().add_if_absent(
+        _PREWARM_CLAIM_NAMESPACE, "scenario_explanations", ttl=_PREWARM_CLAIM_TTL,
+    )
+    if not claimed:
+        print("[Warm-up] Game Master explanations already pre-generated by another worker")
+        return
+    await asyncio.gather(*(
+        generate_game_master_explanation(
+            scenario_title=scenario["title"],
+            scenario_description=scenario["description"],
+            news_headline=scenario["news_headline"],
+            asset_name=scenario["asset_name"],
+            actual_outcome=scenario["actual_outcome"],
+            user_prediction=prediction,
+            ml_prediction=scenario["ml_prediction"],
+            ml_confidence=scenario["ml_confidence"],
+            priority=Priority.PREFETCH,
+        )
+        for scenario in SCENARIOS.values()
+        for prediction in ("UP", "DOWN")
+    ))
 
 
 # ── GET /api/scenarios ───────────────────────────────────────────────────────
 @router.get("", response_model=ScenarioListResponse)
 async def list_scenarios():
     """Return all available trading scenarios."""
-    scenarios = [ScenarioResponse(**s) for s in SCENARIOS.values()]
+    scenarios = [ScenarioResponse(**s) for s in await get_scenario_repository().all()]
     return ScenarioListResponse(scenarios=scenarios, total=len(scenarios))
 
 
@@ -228,72 +101,223 @@ async def list_scenarios():
 @router.get("/{slug}", response_model=ScenarioResponse)
 async def get_scenario(slug: str):
     """Return a single scenario by slug."""
-    scenario = SCENARIOS.get(slug)
+    scenario = await get_scenario_repository().get(slug)
     if not scenario:
         raise HTTPException(status_code=404, detail=f"Scenario '{slug}' not found")
     return ScenarioResponse(**scenario)
 
 
+def _require_chart(slug: str) -> None:
+    """404 for scenarios added only to the database, which have no bundled bars."""
+    if slug not in CHART_SLUGS:
+        raise HTTPException(status_code=404, detail=f"No chart data available for scenario '{slug}'")
+
+
 # ── GET /api/scenarios/{slug}/chart ──────────────────────────────────────────
+@lru_cache(maxsize=64)
+def _aggregated_bars(slug: str, phase: str, resolution: str) -> BarSeries:
+    """Bars for one scenario phase at ``resolution``, computed once."""
+    bars = get_pre_event_data(slug) if phase == "pre" else get_post_event_data(slug)
+    return aggregate(bars, resolution)
+
+
+@lru_cache(maxsize=256)
+def _downsampled_bars(slug: str, phase: str, resolution: str, max_points: int) -> BarSeries:
+    return lttb(_aggregated_bars(slug, phase, resolution), max_points)
+
+
 @router.get("/{slug}/chart", response_model=ChartDataResponse)
-async def get_scenario_chart(slug: str, phase: str = "pre"):
+async def get_scenario_chart(
+    slug: str,
+    phase: str = "pre",
+    resolution: str = Query("daily", description="daily | weekly | monthly"),
+    max_points: Optional[int] = Query(None, ge=2, le=5000, description="Downsample to at most this many bars (LTTB)"),
+):
     """
     Return OHLC chart data for a scenario.
 
     Query params:
         phase: "pre" (default) — 30 bars before the event
                "post" — 5 bars after the event (reveal)
+        resolution: "daily" (default), "weekly" or "monthly" OHLC aggregation
+        max_points: shape-preserving downsampling over close prices
     """
-    scenario = SCENARIOS.get(slug)
+    scenario = await get_scenario_repository().get(slug)
     if not scenario:
         raise HTTPException(status_code=404, detail=f"Scenario '{slug}' not found")
+    _require_chart(slug)
 
-    if phase == "pre":
-        bars = get_pre_event_data(slug)
-    elif phase == "post":
-        bars = get_post_event_data(slug)
-    else:
+    if phase not in ("pre", "post"):
         raise HTTPException(status_code=400, detail="phase must be 'pre' or 'post'")
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {list(RESOLUTIONS)}")
+
+    source = _aggregated_bars(slug, phase, resolution)
+    bars = _downsampled_bars(slug, phase, resolution, max_points) if max_points else source
 
     return ChartDataResponse(
         scenario_slug=slug,
         asset_name=scenario["asset_name"],
-        bars=bars,
+        bars=bars.to_dicts(),
         total_bars=len(bars),
+        resolution=resolution,
+        source_bars=len(source),
     )
 
 
+# ── GET /api/scenarios/{slug}/simulate ───────────────────────────────────────
+@lru_cache(maxsize=128)
+def _simulation(slug: str, n_paths: int, seed: int) -> dict:
+    return simulate(
+        get_pre_event_data(slug).close.tolist(),
+        get_post_event_data(slug).close.tolist(),
+        n_paths=n_paths,
+        seed=seed,
+    )
+
+
+@router.get("/{slug}/simulate", response_model=SimulationResponse)
+async def simulate_scenario(
+    slug: str,
+    n_paths: int = Query(10_000, ge=100, le=200_000),
+    seed: int = Query(0, ge=0),
+):
+    """
+    Monte Carlo "what-if" paths for the reveal window.
+
+    Drift and volatility are fitted on the pre-event bars; the response has
+    percentile bands per reveal day, P(UP) and how unusual the actual
+    outcome was. Cached per (slug, n_paths, seed).
+    """
+    if await get_scenario_repository().get(slug) is None:
+        raise HTTPException(status_code=404, detail=f"Scenario '{slug}' not found")
+    _require_chart(slug)
+    return SimulationResponse(scenario_slug=slug, **_simulation(slug, n_paths, seed))
+
+
+# ── GET /api/scenarios/{slug}/stats ──────────────────────────────────────────
+@router.get("/{slug}/stats", response_model=ScenarioStatsResponse)
+async def get_scenario_stats(slug: str):
+    """How the community predicted this scenario (totals as of this worker's last flush plus its unflushed counts)."""
+    if await get_scenario_repository().get(slug) is None:
+        raise HTTPException(status_code=404, detail=f"Scenario '{slug}' not found")
+    return ScenarioStatsResponse(scenario_slug=slug, **get_prediction_stats().stats(slug))
+
+
+async def _store_prediction(user_id: str, slug: str, result: dict) -> bool:
+    """Persist a user's first prediction on ``slug`` and award its XP.
+
+    True if this call stored it. The reveal is still returned if this fails
+    (e.g. no profile row yet).
+    """
+    try:
+        inserted = await get_prediction_repository().insert_many([{"user_id": user_id, "scenario_slug": slug, **result}])
+    except Exception as e:
+        print(f"[Scenarios] Could not store prediction on {slug} for {user_id}: {e}")
+        return False
+    return bool(inserted)
+
+
+async def _store_explanation(user_id: str, slug: str, job: Job) -> None:
+    """Write an async reveal's finished explanation into the stored prediction."""
+    if job.status != DONE or job.result is None:
+        return
+    try:
+        await get_prediction_repository().set_explanation(user_id, slug, job.result)
+    except Exception as e:
+        print(f"[Scenarios] Could not store explanation on {slug} for {user_id}: {e}")
+
+
 # ── POST /api/scenarios/{slug}/predict ───────────────────────────────────────
-@router.post("/{slug}/predict", response_model=PredictionResultResponse)
-async def submit_prediction(slug: str, body: PredictionSubmitRequest):
+@router.post(
+    "/{slug}/predict",
+    response_model=PredictionResultResponse,
+    dependencies=[Depends(latency_budget(get_settings().reveal_latency_budget_seconds))],
+)
+async def submit_prediction(
+    slug: str,
+    body: PredictionSubmitRequest,
+    mode: str = Query("sync", pattern="^(sync|async)$"),
+    user_id: Optional[str] = Depends(optional_user),
+):
     """
     Submit a user prediction and get the reveal result.
 
     Returns the actual outcome, ML prediction, reveal chart bars,
     AI-generated Game Master explanation, and correctness flags.
+
+    With ``mode=async`` the response comes back without waiting for Gemini
+    and carries ``explanation_job_id``; fetch the explanation from
+    ``GET /api/jobs/{id}``. A stored prediction gets the explanation
+    once the job finishes.
+
+    With a Supabase access token (``Authorization: Bearer``) the player's
+    first prediction on the scenario is stored and earns XP; later
+    submissions can't change it.
     """
-    scenario = SCENARIOS.get(slug)
+    scenario = await get_scenario_repository().get(slug)
     if not scenario:
         raise HTTPException(status_code=404, detail=f"Scenario '{slug}' not found")
 
     if body.user_prediction not in ("UP", "DOWN"):
         raise HTTPException(status_code=400, detail="Prediction must be 'UP' or 'DOWN'")
+    if "ml_prediction" not in scenario:
+        # Scenarios added only to the database have no bundled mock ML fields
+        raise HTTPException(status_code=404, detail=f"No ML prediction available for scenario '{slug}'")
+    _require_chart(slug)
 
     actual = scenario["actual_outcome"]
     ml_pred = scenario["ml_prediction"]
     ml_confidence = scenario["ml_confidence"]
 
-    # ── Call the Game Master AI ───────────────────────────────────────────
-    ai_explanation = await generate_game_master_explanation(
-        scenario_title=scenario["title"],
-        scenario_description=scenario["description"],
-        news_headline=scenario["news_headline"],
-        asset_name=scenario["asset_name"],
-        actual_outcome=actual,
-        user_prediction=body.user_prediction,
-        ml_prediction=ml_pred,
-        ml_confidence=ml_confidence,
-    )
+    community = get_prediction_stats()
+    community.record(slug, body.user_prediction, correct=(body.user_prediction == actual))
+
+    def explain():
+        return generate_game_master_explanation(
+            scenario_title=scenario["title"],
+            scenario_description=scenario["description"],
+            news_headline=scenario["news_headline"],
+            asset_name=scenario["asset_name"],
+            actual_outcome=actual,
+            user_prediction=body.user_prediction,
+            ml_prediction=ml_pred,
+            ml_confidence=ml_confidence,
+        )
+
+    # ── Call the Game Master AI (inline, or as a job the client polls) ────
+    ai_explanation, job = None, None
+    if mode == "async":
+        try:
+            job = get_job_queue().submit("explanation", f"explanation:{slug}:{body.user_prediction}", explain)
+        except JobQueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Explanation queue is full, retry later",
+                headers={"Retry-After": "5"},
+            )
+        if job.status == DONE:
+            ai_explanation = job.result
+    else:
+        ai_explanation = await explain()
+
+    xp_earned = scenario["xp_reward"] if body.user_prediction == actual else 25
+    if user_id is not None:
+        stored = await _store_prediction(user_id, slug, {
+            "user_prediction": body.user_prediction,
+            "ml_prediction": ml_pred,
+            "actual_outcome": actual,
+            "is_user_correct": body.user_prediction == actual,
+            "is_ml_correct": ml_pred == actual,
+            "xp_earned": xp_earned,
+            "ai_explanation": ai_explanation,
+        })
+        if stored and ai_explanation is None and job is not None:
+            # Stored without its explanation: add it once the job has it
+            if job.finished:
+                await _store_explanation(user_id, slug, job)
+            else:
+                get_job_queue().on_done(job, partial(_store_explanation, user_id, slug))
 
     return PredictionResultResponse(
         scenario_slug=slug,
@@ -302,7 +326,9 @@ async def submit_prediction(slug: str, body: PredictionSubmitRequest):
         actual_outcome=actual,
         is_user_correct=(body.user_prediction == actual),
         is_ml_correct=(ml_pred == actual),
-        xp_earned=scenario["xp_reward"] if body.user_prediction == actual else 25,
-        reveal_bars=get_post_event_data(slug),
+        xp_earned=xp_earned,
+        reveal_bars=get_post_event_data(slug).to_dicts(),
         ai_explanation=ai_explanation,
+        explanation_job_id=job.id if job else None,
+        community=community.stats(slug),
     )
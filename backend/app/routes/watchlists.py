@@ -0,0 +1,63 @@
+"""Watchlist routes — per-user watchlists and personalized alert feeds."""
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from app.data.watchlist_data import read_watchlist, save_watchlist, delete_watchlist
+from app.models.news_alerts import NewsAlert, NewsAlertListResponse
+from app.services.watchlists import get_watchlist_matcher
+
+router = APIRouter(prefix="/api/watchlists", tags=["watchlists"])
+
+
+class WatchlistRequest(BaseModel):
+    """Full replacement of a user's watchlist."""
+    symbols: list[str] = []   # tickers or asset names, e.g. "NVDA", "Gold"
+    sectors: list[str] = []   # e.g. "Technology", "Energy"
+
+
+class WatchlistResponse(BaseModel):
+    user_id: str
+    symbols: list[str]
+    sectors: list[str]
+
+
+@router.get("/{user_id}", response_model=WatchlistResponse)
+async def get_watchlist(user_id: str):
+    """Return a user's watchlist."""
+    watchlist = await asyncio.to_thread(read_watchlist, user_id)
+    if watchlist is None:
+        raise HTTPException(status_code=404, detail=f"No watchlist for user '{user_id}'")
+    return WatchlistResponse(user_id=user_id, **watchlist)
+
+
+@router.put("/{user_id}", response_model=WatchlistResponse)
+async def put_watchlist(user_id: str, body: WatchlistRequest):
+    """Create or replace a user's watchlist."""
+    watchlist = await asyncio.to_thread(save_watchlist, user_id, body.symbols, body.sectors)
+    await asyncio.to_thread(get_watchlist_matcher().sync)
+    return WatchlistResponse(user_id=user_id, **watchlist)
+
+
+@router.delete("/{user_id}")
+async def remove_watchlist(user_id: str):
+    """Delete a user's watchlist and feed."""
+    if not await asyncio.to_thread(delete_watchlist, user_id):
+        raise HTTPException(status_code=404, detail=f"No watchlist for user '{user_id}'")
+    await asyncio.to_thread(get_watchlist_matcher().sync)
+    return {"deleted": user_id}
+
+
+@router.get("/{user_id}/feed", response_model=NewsAlertListResponse)
+async def get_personalized_feed(
+    user_id: str,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Most recent alerts matching the user's watched symbols or sectors, newest first."""
+    alerts = await asyncio.to_thread(get_watchlist_matcher().feed, user_id, limit)
+    return NewsAlertListResponse(
+        alerts=[NewsAlert(**a) for a in alerts],
+        total=len(alerts),
+    )
@@ -0,0 +1,253 @@
+"""Admission control and load shedding for expensive routes.
+
+Each guarded route gets a ``RouteGate`` with:
+
+- a concurrency limit: requests beyond it wait in a bounded FIFO queue;
+- a queue bound and wait timeout: when the queue is full, or a request has
+  waited too long, it is shed with ``503`` and a ``Retry-After`` estimated
+  from recent service times. Routes with a latency budget never wait past
+  what is left of it, counted from the request's arrival;
+- per-client token buckets: a client over its rate gets ``429`` with the
+  time until its next token as ``Retry-After``. Behind a reverse proxy
+  every request comes from the proxy's address, so the client is taken
+  from ``X-Forwarded-For`` when the peer is a configured trusted proxy;
+  the header is ignored from anyone else, since clients can forge it.
+
+Unguarded routes (health checks, static scenario data, streams) pass
+straight through, so they stay fast while the expensive ones degrade.
+"""
+
+import asyncio
+import ipaddress
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.request_context import current_request
+
+# Token buckets remembered per route before the least recent are dropped
+_MAX_CLIENTS = 10_000
+# Weight of the newest request in the service-time EWMA
+_SERVICE_ALPHA = 0.2
+
+
+@dataclass
+class RouteLimit:
+    """Admission policy for requests matching ``method`` + ``path`` (regex)."""
+    name: str
+    method: str
+    path: str
+    max_concurrency: int
+    max_queue: int
+    queue_timeout: float = 10.0
+    rate_per_minute: float = 0.0  # per client; 0 = no rate limit
+    burst: int = 1
+    latency_budget: float = 0.0  # seconds from arrival; 0 = none
+
+
+class QueueFull(Exception):
+    """The route's wait queue is full or the wait timed out."""
+
+
+class RouteGate:
+    """Concurrency limit, bounded queue and client rate limits for one route."""
+
+    def __init__(self, limit: RouteLimit) -> None:
+        self.limit = limit
+        self.pattern = re.compile(limit.path)
+        self.running = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.service_time = 1.0  # EWMA seconds per admitted request
+        self.admitted = 0
+        self.shed = 0
+        self.rate_limited = 0
+
+    def matches(self, method: str, path: str) -> bool:
+        return method == self.limit.method and self.pattern.fullmatch(path) is not None
+
+    # ── Per-client token bucket ──────────────────────────────────────────────
+
+    def take_token(self, client: str) -> float:
+        """Spend one of ``client``'s tokens. Returns 0, or seconds until one is due."""
+        rate = self.limit.rate_per_minute / 60
+        if rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (float(self.limit.burst), now))
+        tokens = min(float(self.limit.burst), tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+            self.rate_limited += 1
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > _MAX_CLIENTS:
+            self._buckets.popitem(last=False)
+        return wait
+
+    # ── Concurrency slots ────────────────────────────────────────────────────
+
+    def retry_after(self) -> int:
+        """Seconds until a queued request would likely be served."""
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(self.service_time * backlog / self.limit.max_concurrency))
+
+    def queue_timeout(self) -> float:
+        """How long the current request may wait for a slot."""
+        timeout = self.limit.queue_timeout
+        request = current_request()
+        if self.limit.latency_budget > 0 and request is not None:
+            timeout = min(timeout, request.arrived + self.limit.latency_budget - time.monotonic())
+        return max(0.0, timeout)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if needed. Raises ``QueueFull``."""
+        if self.running < self.limit.max_concurrency and not self._waiters:
+            self.running += 1
+            return
+        if len(self._waiters) >= self.limit.max_queue:
+            self.shed += 1
+            raise QueueFull()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout())
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over as we gave up
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.shed += 1
+                raise QueueFull()
+            raise
+
+    def release(self) -> None:
+        """Hand the slot to the next live waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def record_service_time(self, seconds: float) -> None:
+        self.admitted += 1
+        self.service_time = _SERVICE_ALPHA * seconds + (1 - _SERVICE_ALPHA) * self.service_time
+
+    def stats(self) -> dict:
+        return {
+            "route": self.limit.name,
+            "running": self.running,
+            "queued": len(self._waiters),
+            "max_concurrency": self.limit.max_concurrency,
+            "max_queue": self.limit.max_queue,
+            "service_time_seconds": round(self.service_time, 3),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "rate_limited": self.rate_limited,
+        }
+
+
+_gates: list[RouteGate] = []
+
+
+def admission_stats() -> list[dict]:
+    """Per-route admission counters for every guarded route."""
+    return [gate.stats() for gate in _gates]
+
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def parse_networks(spec: str) -> list[Network]:
+    """Comma-separated addresses / CIDR ranges, e.g. ``"10.0.0.0/8, ::1"``."""
+    return [ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip()]
+
+
+def _is_trusted(address: str, trusted: list[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+
+def _client_id(scope: Scope, trusted: list[Network]) -> str:
+    """The client's address: the peer, or the forwarded one via trusted proxies.
+
+    ``X-Forwarded-For`` is read right to left (nearest hop first), skipping
+    trusted proxies; the first untrusted address is the client.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
+    forwarded = [
+        value.decode("latin-1")
+        for name, value in scope.get("headers", ())
+        if name == b"x-forwarded-for"
+    ]
+    hops = [hop.strip() for header in forwarded for hop in header.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted):
+            return hop
+    return hops[0] if hops else peer
+
+
+def _reject(status: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying ``RouteLimit`` policies."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[list[RouteLimit]] = None,
+        trusted_proxies: Optional[list[Network]] = None,
+    ) -> None:
+        self.app = app
+        self.gates = [RouteGate(limit) for limit in limits or []]
+        self.trusted_proxies = trusted_proxies or []
+        _gates.extend(self.gates)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        gate = None
+        if scope["type"] == "http":
+            gate = next((g for g in self.gates if g.matches(scope["method"], scope["path"])), None)
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        wait = gate.take_token(_client_id(scope, self.trusted_proxies))
+        if wait > 0:
+            await _reject(429, f"Rate limit exceeded for {gate.limit.name}", wait)(scope, receive, send)
+            return
+
+        try:
+            await gate.acquire()
+        except QueueFull:
+            await _reject(503, f"{gate.limit.name} is overloaded, retry later", gate.retry_after())(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+            gate.record_service_time(time.monotonic() - started)
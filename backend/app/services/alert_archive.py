@@ -0,0 +1,222 @@
+"""Append-only on-disk archive of analyzed news alerts.
+
+Two files live in the archive directory:
+
+- ``alerts.jsonl``: one JSON alert per line, only ever appended to.
+- ``alerts.idx``: fixed-size binary records, one per alert, in append order
+  (``archived_at`` ms, byte offset, byte length, severity code).
+
+``archived_at`` is forced to be non-decreasing, so history queries binary
+search the memory-mapped index for the time range, filter by severity
+without touching the data file, and then read only the matching byte
+ranges. Memory use is bounded by the page size and the result limit, not
+by the archive size. Appends take an exclusive ``flock`` so several
+workers can share one archive.
+
+A crash mid-append can leave a partial index record or an unindexed tail
+in the data file. Both are cut off on open and before every append, so
+later records stay aligned.
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.config import get_settings
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "archive"
+
+# archived_at_ms (u64), offset (u64), length (u32), severity (u8), padding
+_RECORD = struct.Struct("<QQIB3x")
+
+SEVERITY_CODES: dict[str, int] = {"critical": 0, "high": 1, "medium": 2}
+
+
+class _IndexView:
+    """Sequence of ``archived_at`` values over a mapped index, for bisect."""
+
+    def __init__(self, buf: mmap.mmap, count: int) -> None:
+        self._buf = buf
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> int:
+        return _RECORD.unpack_from(self._buf, i * _RECORD.size)[0]
+
+
+class AlertArchive:
+    """Append-only JSONL alert log with a sidecar timestamp/offset index."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.data_path = directory / "alerts.jsonl"
+        self.index_path = directory / "alerts.idx"
+        self.data_path.touch(exist_ok=True)
+        self.index_path.touch(exist_ok=True)
+        with open(self.index_path, "r+b") as idx, open(self.data_path, "r+b") as data:
+            fcntl.flock(idx, fcntl.LOCK_EX)
+            try:
+                self._repair(idx, data)
+            finally:
+                fcntl.flock(idx, fcntl.LOCK_UN)
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def append(self, alerts: list[dict]) -> list[dict]:
+        """Append alerts to the archive and return them with ``archived_at``."""
+        if not alerts:
+            return []
+
+        archived: list[dict] = []
+        with open(self.index_path, "r+b") as idx, open(self.data_path, "ab") as data:
+            fcntl.flock(idx, fcntl.LOCK_EX)
+            try:
+                self._repair(idx, data)
+                last_ms = self._last_archived_ms(idx)
+                offset = data.seek(0, os.SEEK_END)
+                idx.seek(0, os.SEEK_END)
+
+                for alert in alerts:
+                    last_ms = max(int(time.time() * 1000), last_ms)
+                    record = {**alert, "archived_at": last_ms / 1000}
+                    line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+                    data.write(line)
+                    idx.write(_RECORD.pack(
+                        last_ms,
+                        offset,
+                        len(line),
+                        SEVERITY_CODES.get(alert.get("severity", ""), 255),
+                    ))
+                    offset += len(line)
+                    archived.append(record)
+
+                # Data must hit the file before the index points at it
+                data.flush()
+                idx.flush()
+            finally:
+                fcntl.flock(idx, fcntl.LOCK_UN)
+        return archived
+
+    @staticmethod
+    def _repair(idx, data) -> None:
+        """Drop a torn trailing index record and unindexed data (lock held)."""
+        size = idx.seek(0, os.SEEK_END)
+        if size % _RECORD.size:
+            print(f"[Alert Archive] Truncating partial index record ({size % _RECORD.size} bytes)")
+            size -= size % _RECORD.size
+            idx.truncate(size)
+        data_end = 0
+        if size:
+            idx.seek(size - _RECORD.size)
+            _, offset, length, _ = _RECORD.unpack(idx.read(_RECORD.size))
+            data_end = offset + length
+        if os.fstat(data.fileno()).st_size > data_end:
+            print("[Alert Archive] Truncating unindexed data after the last record")
+            os.ftruncate(data.fileno(), data_end)
+
+    @staticmethod
+    def _last_archived_ms(idx) -> int:
+        size = idx.seek(0, os.SEEK_END)
+        if size < _RECORD.size:
+            return 0
+        idx.seek(size - _RECORD.size)
+        return _RECORD.unpack(idx.read(_RECORD.size))[0]
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self.index_path.stat().st_size // _RECORD.size
+
+    @contextmanager
+    def _mapped(self):
+        """Map the index and data files read-only for the current record count."""
+        count = len(self)
+        if count == 0:
+            yield None, None, 0
+            return
+        with open(self.index_path, "rb") as idx_file, open(self.data_path, "rb") as data_file:
+            idx = mmap.mmap(idx_file.fileno(), count * _RECORD.size, access=mmap.ACCESS_READ)
+            data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield idx, data, count
+            finally:
+                idx.close()
+                data.close()
+
+    @staticmethod
+    def _read(idx: mmap.mmap, data: mmap.mmap, position: int) -> dict:
+        _, start, length, _ = _RECORD.unpack_from(idx, position * _RECORD.size)
+        return json.loads(data[start:start + length])
+
+    def iter_from(self, position: int) -> Iterator[tuple[int, dict]]:
+        """Stream ``(position, alert)`` pairs from index ``position`` onwards."""
+        with self._mapped() as (idx, data, count):
+            for i in range(position, count):
+                yield i, self._read(idx, data, i)
+
+    def get_many(self, positions: list[int]) -> list[dict]:
+        """Fetch alerts by archive position, in the order given."""
+        with self._mapped() as (idx, data, count):
+            return [self._read(idx, data, i) for i in positions if 0 <= i < count]
+
+    def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        severity: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> list[dict]:
+        """Return archived alerts in ``[since, until]`` (UNIX seconds), oldest first."""
+        return list(self.iter_range(since, until, severity, limit, offset))
+
+    def iter_range(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        severity: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[dict]:
+        """Stream archived alerts in a time range without loading the archive."""
+        severity_code = SEVERITY_CODES.get(severity) if severity else None
+        if severity and severity_code is None:
+            return
+
+        with self._mapped() as (idx, data, count):
+            if count == 0:
+                return
+            view = _IndexView(idx, count)
+            lo = bisect_left(view, int(since * 1000)) if since is not None else 0
+            hi = bisect_right(view, int(until * 1000)) if until is not None else count
+
+            skipped = emitted = 0
+            for i in range(lo, hi):
+                code = _RECORD.unpack_from(idx, i * _RECORD.size)[3]
+                if severity_code is not None and code != severity_code:
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                yield self._read(idx, data, i)
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+
+
+@lru_cache()
+def get_alert_archive() -> AlertArchive:
+    """Process-wide alert archive in ``ALERT_ARCHIVE_DIR``."""
+    directory = get_settings().alert_archive_dir
+    return AlertArchive(Path(directory) if directory else _DEFAULT_DIR)
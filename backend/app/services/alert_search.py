@@ -0,0 +1,149 @@
+"""Full-text search over archived news alerts.
+
+An in-memory inverted index mirrors the alert archive: document ids are
+archive positions, so only postings live in memory and matching alerts are
+read back from the archive. The index catches up incrementally with
+whatever any worker has appended since the last query.
+
+Postings are compact ``array`` buffers (uint32 doc ids, uint16 term
+frequencies) that NumPy scores in place with BM25. Query terms ending in
+``*`` (and, with ``prefix=True``, the last term) expand to every indexed
+term with that prefix, which is how partial tickers such as ``NVD*`` match.
+"""
+
+import re
+import threading
+from array import array
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+import numpy as np
+
+from app.services.alert_archive import AlertArchive, get_alert_archive
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def alert_tokens(alert: dict) -> list[str]:
+    """Searchable tokens of an alert: headline, impact, sectors and asset."""
+    return tokenize(" ".join((
+        alert.get("headline", ""),
+        alert.get("impact_summary", ""),
+        " ".join(alert.get("affected_sectors", [])),
+        alert.get("asset_name", ""),
+    )))
+
+
+class AlertSearchIndex:
+    """BM25 inverted index over alerts, keyed by archive position."""
+
+    def __init__(self, archive: AlertArchive) -> None:
+        self.archive = archive
+        self._lock = threading.Lock()
+        self._term_ids: dict[str, int] = {}
+        self._sorted_terms: list[str] = []
+        self._doc_ids: list[array] = []     # per term: uint32 archive positions
+        self._term_freqs: list[array] = []  # per term: uint16 term frequencies
+        self._doc_lengths = array("I")
+        self._total_length = 0
+        self._length_norms: np.ndarray | None = None  # per-doc BM25 length term
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    # ── Indexing ─────────────────────────────────────────────────────────────
+
+    def _add(self, position: int, alert: dict) -> None:
+        tokens = alert_tokens(alert)
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        for term, tf in counts.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = len(self._doc_ids)
+                self._term_ids[term] = term_id
+                self._doc_ids.append(array("I"))
+                self._term_freqs.append(array("H"))
+                insort(self._sorted_terms, term)
+            self._doc_ids[term_id].append(position)
+            self._term_freqs[term_id].append(min(tf, 0xFFFF))
+
+        self._doc_lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self._length_norms = None
+
+    def sync(self) -> int:
+        """Index archive records appended since the last sync. Returns how many."""
+        with self._lock:
+            start = len(self._doc_lengths)
+            for position, alert in self.archive.iter_from(start):
+                self._add(position, alert)
+            return len(self._doc_lengths) - start
+
+    # ── Querying ─────────────────────────────────────────────────────────────
+
+    def _expand(self, term: str, prefix: bool) -> list[int]:
+        """Term ids matching ``term`` exactly, or every term it prefixes."""
+        if not prefix:
+            term_id = self._term_ids.get(term)
+            return [term_id] if term_id is not None else []
+        ids = []
+        i = bisect_left(self._sorted_terms, term)
+        while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(term):
+            ids.append(self._term_ids[self._sorted_terms[i]])
+            i += 1
+        return ids
+
+    def search(self, query: str, limit: int = 20, prefix: bool = False) -> list[tuple[float, dict]]:
+        """Return up to ``limit`` ``(score, alert)`` pairs, best first."""
+        self.sync()
+
+        raw_terms = query.lower().split()
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if n_docs == 0 or not raw_terms:
+                return []
+
+            if self._length_norms is None:
+                doc_lengths = np.array(self._doc_lengths, dtype=np.float64)
+                avg_length = max(self._total_length / n_docs, 1.0)
+                self._length_norms = _K1 * (1 - _B + _B * doc_lengths / avg_length)
+            length_norms = self._length_norms
+            scores = np.zeros(n_docs, dtype=np.float64)
+
+            for i, raw in enumerate(raw_terms):
+                is_prefix = raw.endswith("*") or (prefix and i == len(raw_terms) - 1)
+                for term in tokenize(raw):
+                    for term_id in self._expand(term, is_prefix):
+                        docs = np.frombuffer(self._doc_ids[term_id], dtype=np.uint32)
+                        tf = np.frombuffer(self._term_freqs[term_id], dtype=np.uint16).astype(np.float64)
+                        idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                        scores[docs] += idf * tf * (_K1 + 1) / (tf + length_norms[docs])
+                        # Release the buffer views before sync() may grow the arrays
+                        del docs, tf
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            ranked = matched[np.argsort(-scores[matched], kind="stable")]
+            hits = [(float(scores[p]), int(p)) for p in ranked]
+
+        alerts = self.archive.get_many([p for _, p in hits])
+        return [(score, alert) for (score, _), alert in zip(hits, alerts)]
+
+
+@lru_cache()
+def get_search_index() -> AlertSearchIndex:
+    """Process-wide search index over the alert archive."""
+    return AlertSearchIndex(get_alert_archive())
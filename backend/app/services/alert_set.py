@@ -0,0 +1,119 @@
+"""Indexed snapshot of the current live alerts.
+
+The live alert list is kept in severity order (critical → high → medium,
+newest first within a severity) together with per-severity, per-sector and
+per-asset position indexes, so filtered and paginated queries intersect
+small posting lists instead of re-sorting and scanning every alert.
+
+Cursors encode the sort key of the last alert returned, so they stay valid
+when the snapshot is refreshed between pages.
+
+Alerts are held as compact ``AlertRecord``s; callers convert the page they
+return with ``as_dict()``.
+"""
+
+import base64
+import json
+import re
+import time
+from bisect import bisect_right
+from typing import Optional
+
+from app.services.records import AlertRecord
+
+SEVERITY_ORDER: dict[str, int] = {"critical": 0, "high": 1, "medium": 2}
+
+_ASSET_TOKEN_RE = re.compile(r"[a-z0-9&/.\-]+")
+
+
+def _sort_key(alert: AlertRecord) -> tuple:
+    return (SEVERITY_ORDER.get(alert.severity, 3), -alert.ts, alert.id)
+
+
+def asset_keys(asset_name: str) -> set[str]:
+    """Lookup keys for an asset: the full name plus each ticker-like token."""
+    name = asset_name.lower().strip()
+    return {name, *_ASSET_TOKEN_RE.findall(name)} - {""}
+
+
+def encode_cursor(alert: AlertRecord) -> str:
+    return base64.urlsafe_b64encode(json.dumps(_sort_key(alert)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        rank, neg_ts, alert_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (int(rank), float(neg_ts), str(alert_id))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+class AlertSet:
+    """Current alerts in severity order with secondary indexes."""
+
+    def __init__(self, alerts: list[dict]) -> None:
+        self.built_at = time.monotonic()
+        self.alerts = sorted((AlertRecord.from_dict(a) for a in alerts), key=_sort_key)
+        self._keys = [_sort_key(a) for a in self.alerts]
+        self._by_severity: dict[str, list[int]] = {}
+        self._by_sector: dict[str, list[int]] = {}
+        self._by_asset: dict[str, list[int]] = {}
+
+        for pos, alert in enumerate(self.alerts):
+            self._by_severity.setdefault(alert.severity, []).append(pos)
+            for sector in {s.lower() for s in alert.affected_sectors}:
+                self._by_sector.setdefault(sector, []).append(pos)
+            for key in asset_keys(alert.asset_name or ""):
+                self._by_asset.setdefault(key, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def age(self) -> float:
+        """Seconds since this snapshot was built."""
+        return time.monotonic() - self.built_at
+
+    def _candidates(self, severity: Optional[str], sector: Optional[str], asset: Optional[str]) -> list[int]:
+        """Positions matching every given filter, in sort order."""
+        postings = []
+        if severity:
+            postings.append(self._by_severity.get(severity, []))
+        if sector:
+            postings.append(self._by_sector.get(sector.lower(), []))
+        if asset:
+            postings.append(self._by_asset.get(asset.lower().strip(), []))
+
+        if not postings:
+            return list(range(len(self.alerts)))
+
+        postings.sort(key=len)
+        smallest, rest = postings[0], [set(p) for p in postings[1:]]
+        return [pos for pos in smallest if all(pos in s for s in rest)]
+
+    def query(
+        self,
+        severity: Optional[str] = None,
+        sector: Optional[str] = None,
+        asset: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[list[AlertRecord], int, Optional[str]]:
+        """Return ``(page, total_matching, next_cursor)``."""
+        positions = self._candidates(severity, sector, asset)
+        if since is not None or until is not None:
+            lo = since if since is not None else float("-inf")
+            hi = until if until is not None else float("inf")
+            positions = [p for p in positions if lo <= self.alerts[p].ts <= hi]
+
+        total = len(positions)
+        start = 0
+        if cursor:
+            after = decode_cursor(cursor)
+            start = bisect_right(positions, after, key=lambda p: self._keys[p])
+
+        end = total if limit is None else min(start + limit, total)
+        page = [self.alerts[p] for p in positions[start:end]]
+        next_cursor = encode_cursor(page[-1]) if page and end < total else None
+        return page, total, next_cursor
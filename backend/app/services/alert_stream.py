@@ -0,0 +1,155 @@
+"""Per-worker alert fan-out hub with a replay ring buffer.
+
+One pump task per worker tails the shared alert channel and keeps the most
+recent events, with their monotonic ids, in a bounded ring buffer. Every
+streaming client of that worker reads from the buffer, so a client that
+reconnects with ``Last-Event-ID`` gets exactly the events it missed, and
+idle clients get periodic heartbeats so proxies keep the connection open.
+
+On start the buffer is pre-filled from the events the shared backend still
+retains. With the SQLite backend that covers worker restarts, so clients
+reconnecting after a deploy can still resume.
+
+When a client's ``Last-Event-ID`` predates the buffer (or a slow reader
+falls behind it), the missed events can't be replayed. ``listen`` then
+yields a ``StreamReset`` so the client knows to refetch the full list.
+"""
+
+import asyncio
+from bisect import bisect_right
+from collections import deque
+from typing import AsyncIterator, Optional, Union
+
+from app.services.shared_state import get_shared_state
+
+
+class StreamReset:
+    """Events after ``last_event_id`` were missed and can't be replayed.
+
+    Streaming continues after ``resume_id``; the client should reload the
+    current alerts instead of relying on the replay.
+    """
+
+    __slots__ = ("last_event_id", "resume_id")
+
+    def __init__(self, last_event_id: int, resume_id: int) -> None:
+        self.last_event_id = last_event_id
+        self.resume_id = resume_id
+
+
+class AlertHub:
+    """Replay buffer + local fan-out for one shared-state channel."""
+
+    def __init__(self, channel: str, buffer_size: int = 500) -> None:
+        self.channel = channel
+        self.buffer: deque[tuple[int, dict]] = deque(maxlen=buffer_size)
+        self._signal = asyncio.Event()
+        self._backfilled = asyncio.Event()
+        self._pump_task: Optional[asyncio.Task] = None
+        # Events with an id up to this one may be missing from the buffer
+        self._horizon = 0
+
+    @property
+    def latest_id(self) -> int:
+        return self.buffer[-1][0] if self.buffer else 0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the pump task if it isn't running yet."""
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.create_task(self._pump())
+
+    def stop(self) -> None:
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            self._pump_task = None
+
+    async def _backfill(self) -> None:
+        """Load the most recent retained events into the empty buffer."""
+        state = get_shared_state()
+        after = max(0, await state.last_event_id(self.channel) - self.buffer.maxlen)
+        self._horizon = after
+        while True:
+            events = await state.read_events(self.channel, after, limit=self.buffer.maxlen)
+            if not events:
+                return
+            for event in events:
+                after = event[0]
+                self._append(event)
+
+    async def _pump(self) -> None:
+        state = get_shared_state()
+        try:
+            if not self.buffer:
+                await self._backfill()
+        except Exception as e:
+            print(f"[Alert Hub] {self.channel} backfill error: {e}")
+        finally:
+            self._backfilled.set()
+
+        after = self.latest_id
+        while True:
+            try:
+                async for event in state.subscribe(self.channel, after_id=after):
+                    after = event[0]
+                    self._append(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Alert Hub] {self.channel} pump error: {e}")
+                await asyncio.sleep(1.0)
+
+    def _append(self, event: tuple[int, dict]) -> None:
+        if len(self.buffer) == self.buffer.maxlen:
+            self._horizon = self.buffer[0][0]  # about to be evicted
+        self.buffer.append(event)
+        signal, self._signal = self._signal, asyncio.Event()
+        signal.set()
+
+    # ── Readers ──────────────────────────────────────────────────────────────
+
+    def replay(self, after_id: int) -> list[tuple[int, dict]]:
+        """Buffered events with id greater than ``after_id``, oldest first."""
+        if after_id >= self.latest_id:
+            return []
+        start = bisect_right(self.buffer, after_id, key=lambda e: e[0])
+        return [self.buffer[i] for i in range(start, len(self.buffer))]
+
+    async def listen(
+        self,
+        last_event_id: Optional[int] = None,
+        heartbeat_seconds: float = 15.0,
+    ) -> AsyncIterator[Union[tuple[int, dict], StreamReset, None]]:
+        """Yield missed then live events; ``None`` marks a heartbeat.
+
+        A ``StreamReset`` is yielded instead of a replay when events after
+        ``last_event_id`` are no longer buffered, or when it is ahead of
+        anything buffered (e.g. the in-process backend restarted and ids
+        reset); streaming then continues from the present.
+        """
+        await self._backfilled.wait()
+        last = self.latest_id
+        if last_event_id is not None:
+            if last_event_id < self._horizon or last_event_id > last:
+                yield StreamReset(last_event_id, last)
+            else:
+                last = last_event_id
+
+        while True:
+            signal = self._signal
+            if last < self._horizon:
+                # Fell behind the ring buffer while the consumer was busy
+                missed, last = last, self.latest_id
+                yield StreamReset(missed, last)
+                continue
+            pending = self.replay(last)
+            if pending:
+                for event in pending:
+                    last = event[0]
+                    yield event
+                continue
+            try:
+                await asyncio.wait_for(signal.wait(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield None
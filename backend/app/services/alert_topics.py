@@ -0,0 +1,152 @@
+"""Topic-based alert routing for WebSocket subscribers.
+
+Each subscription is a list of clauses, one per field it sets:
+
+- ``severity:<level>``: one per severity at or above the requested minimum
+- ``sector:<name>``: lowercased sector names
+- ``asset:<key>``: asset names or tickers, as indexed by ``asset_keys``
+- ``all``: when no filter is given
+
+An alert matches a subscription when every clause has at least one topic
+in common with the alert (AND across fields, OR within a field), so
+``min_severity=high`` with ``sectors=[Tech]`` only delivers high or
+critical Tech alerts. Separate subscriptions are independent.
+
+The router keeps a precomputed ``topic → subscriber ids`` map over each
+subscriber's smallest clause. Routing an alert means computing the alert's
+handful of topics, taking the union of their subscriber sets as candidates
+and checking the remaining clauses of just those, so the cost depends on
+the number of matches, not on the number of connected clients.
+"""
+
+import asyncio
+import itertools
+from typing import Optional
+
+from app.services.alert_set import SEVERITY_ORDER, asset_keys
+from app.services.alert_stream import AlertHub
+
+
+def subscription_topics(
+    min_severity: Optional[str] = None,
+    sectors: Optional[list[str]] = None,
+    assets: Optional[list[str]] = None,
+) -> list[frozenset[str]]:
+    """Translate a subscription request into clauses that must all match."""
+    clauses: list[frozenset[str]] = []
+    if min_severity:
+        if min_severity not in SEVERITY_ORDER:
+            raise ValueError(f"min_severity must be one of {list(SEVERITY_ORDER)}")
+        threshold = SEVERITY_ORDER[min_severity]
+        clauses.append(frozenset(f"severity:{s}" for s, rank in SEVERITY_ORDER.items() if rank <= threshold))
+    for field, values in (("sector", sectors), ("asset", assets)):
+        topics = frozenset(f"{field}:{v.lower().strip()}" for v in values or [] if v.strip())
+        if topics:
+            clauses.append(topics)
+    return clauses or [frozenset({"all"})]
+
+
+def alert_topics(alert: dict) -> set[str]:
+    """Every topic an alert is published under."""
+    topics = {"all", f"severity:{alert.get('severity', '')}"}
+    topics |= {f"sector:{s.lower()}" for s in alert.get("affected_sectors", [])}
+    topics |= {f"asset:{k}" for k in asset_keys(alert.get("asset_name", ""))}
+    return topics
+
+
+class Subscriber:
+    """One connected client: its clauses and a bounded outbound queue."""
+
+    def __init__(self, subscriber_id: int, max_queue: int) -> None:
+        self.id = subscriber_id
+        self.clauses: list[frozenset[str]] = []
+        self.topics: frozenset[str] = frozenset()  # indexed clause
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, event: tuple[int, dict]) -> None:
+        """Queue an event, dropping the oldest one if the client is too slow."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    def matches(self, topics: set[str]) -> bool:
+        """Whether an alert with ``topics`` satisfies every clause."""
+        return bool(self.clauses) and all(not clause.isdisjoint(topics) for clause in self.clauses)
+
+
+class TopicRouter:
+    """Routes hub events to subscribers through a topic → subscribers map."""
+
+    def __init__(self, max_queue: int = 1000) -> None:
+        self.max_queue = max_queue
+        self._ids = itertools.count(1)
+        self._subscribers: dict[int, Subscriber] = {}
+        self._topic_map: dict[str, set[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    # ── Subscription management ──────────────────────────────────────────────
+
+    def add(self) -> Subscriber:
+        subscriber = Subscriber(next(self._ids), self.max_queue)
+        self._subscribers[subscriber.id] = subscriber
+        return subscriber
+
+    def update(self, subscriber: Subscriber, clauses: list[frozenset[str]]) -> None:
+        """Replace a subscriber's clauses, keeping the topic map in sync.
+
+        Only the smallest clause is indexed: every match has to satisfy it
+        anyway, and it yields the fewest candidates to check.
+        """
+        topics = min(clauses, key=len) if clauses else frozenset()
+        for topic in subscriber.topics - topics:
+            members = self._topic_map.get(topic)
+            if members is not None:
+                members.discard(subscriber.id)
+                if not members:
+                    del self._topic_map[topic]
+        for topic in topics - subscriber.topics:
+            self._topic_map.setdefault(topic, set()).add(subscriber.id)
+        subscriber.topics = topics
+        subscriber.clauses = list(clauses)
+
+    def remove(self, subscriber: Subscriber) -> None:
+        self.update(subscriber, [])
+        self._subscribers.pop(subscriber.id, None)
+
+    # ── Routing ──────────────────────────────────────────────────────────────
+
+    def route(self, event: tuple[int, dict]) -> int:
+        """Deliver one event to every matching subscriber. Returns how many."""
+        topics = alert_topics(event[1])
+        candidates: set[int] = set()
+        for topic in topics:
+            members = self._topic_map.get(topic)
+            if members:
+                candidates |= members
+        matched = 0
+        for subscriber_id in candidates:
+            subscriber = self._subscribers[subscriber_id]
+            if subscriber.matches(topics):
+                subscriber.offer(event)
+                matched += 1
+        return matched
+
+    def start(self, hub: AlertHub) -> None:
+        """Start routing live events from ``hub``."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(hub))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, hub: AlertHub) -> None:
+        async for event in hub.listen(heartbeat_seconds=3600):
+            if isinstance(event, tuple):  # not a heartbeat or a reset
+                self.route(event)
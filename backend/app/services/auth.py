@@ -0,0 +1,98 @@
+"""Supabase access tokens → the signed-in player's user id.
+
+The frontend signs players in with Supabase Auth and sends the session's
+access token as ``Authorization: Bearer <jwt>``. The token's ``sub`` claim
+is the player's ``auth.users`` id, which ``profiles`` and ``predictions``
+are keyed by. The repository pool connects with a role that bypasses row
+level security, so routes must take the user from a verified token and
+never from the request body or an unchecked path parameter.
+
+Tokens are verified with ``SUPABASE_JWT_SECRET`` (HS256, the project's
+legacy JWT secret) when it is set, otherwise against the project's JWKS at
+``SUPABASE_URL/auth/v1/.well-known/jwks.json`` (asymmetric signing keys).
+
+Routes use the dependencies:
+
+- ``optional_user``: the user id, or ``None`` without a token (anonymous
+  play still works); an invalid token is a 401.
+- ``require_user``: the user id; 401 without a valid token.
+"""
+
+import asyncio
+from functools import lru_cache
+from typing import Optional
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.config import get_settings
+
+_AUDIENCE = "authenticated"
+_ASYMMETRIC = ["RS256", "ES256", "EdDSA"]
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+class AuthNotConfigured(RuntimeError):
+    """Neither a JWT secret nor a Supabase URL is configured."""
+
+
+@lru_cache()
+def _jwks_client() -> jwt.PyJWKClient:
+    url = get_settings().supabase_url.rstrip("/")
+    if not url:
+        raise AuthNotConfigured("Set SUPABASE_JWT_SECRET or SUPABASE_URL to verify access tokens")
+    return jwt.PyJWKClient(f"{url}/auth/v1/.well-known/jwks.json", cache_keys=True)
+
+
+async def verify_token(token: str) -> str:
+    """The ``sub`` (user id) of a valid Supabase access token.
+
+    Raises ``jwt.InvalidTokenError`` for bad, expired or foreign tokens.
+    """
+    secret = get_settings().supabase_jwt_secret
+    if secret:
+        key, algorithms = secret, ["HS256"]
+    else:
+        # PyJWKClient fetches (and caches) the key set with blocking I/O
+        signing_key = await asyncio.to_thread(_jwks_client().get_signing_key_from_jwt, token)
+        key, algorithms = signing_key.key, _ASYMMETRIC
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        audience=_AUDIENCE,
+        options={"require": ["sub", "exp"]},
+    )
+    return claims["sub"]
+
+
+async def optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Optional[str]:
+    """Route dependency: the signed-in user's id, or ``None`` without a token."""
+    if credentials is None:
+        return None
+    try:
+        return await verify_token(credentials.credentials)
+    except AuthNotConfigured as e:
+        print(f"[Auth] {e}")
+        raise HTTPException(status_code=503, detail="Sign-in is not available")
+    except (jwt.InvalidTokenError, jwt.PyJWKClientError) as e:
+        raise HTTPException(
+            status_code=401,
+            detail=f"Invalid access token: {e}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def require_user(user_id: Optional[str] = Depends(optional_user)) -> str:
+    """Route dependency: the signed-in user's id; 401 without a token."""
+    if user_id is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Sign in to access this resource",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
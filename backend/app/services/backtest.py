@@ -0,0 +1,154 @@
+"""Vectorized backtests of prediction strategies across scenarios.
+
+Every scenario becomes one row of a matrix: the pre-event closes, the reveal
+closes and the labelled outcome. A strategy maps the whole batch to a vector
+of P(UP) in one NumPy pass, and every metric is computed column-wise:
+
+- accuracy of the implied UP/DOWN call
+- Brier score of P(UP) against the outcome
+- a reliability curve (mean predicted P(UP) vs observed UP rate per bin)
+- hypothetical P&L of going long/short one unit from the last pre-event
+  close to the last reveal close
+
+Results are cached per (strategy, model version, catalog fingerprint).
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+
+@dataclass
+class ScenarioBatch:
+    """Column-aligned backtest inputs for N scenarios."""
+    slugs: list[str]
+    pre_close: np.ndarray      # (N, pre_len) closes shown before the prediction
+    post_close: np.ndarray     # (N, post_len) reveal closes
+    outcome_up: np.ndarray     # (N,) 1.0 if the labelled outcome is UP
+    ml_up: np.ndarray          # (N,) 1.0 if the ML pick is UP
+    ml_confidence: np.ndarray  # (N,) confidence in the ML pick
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha1()
+        for array in (self.pre_close, self.post_close, self.outcome_up, self.ml_up, self.ml_confidence):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update("\0".join(self.slugs).encode())
+        return digest.hexdigest()[:16]
+
+
+def build_batch(cases: list[dict]) -> ScenarioBatch:
+    """Stack cases ``{slug, pre_close, post_close, actual_outcome, ml_prediction,
+    ml_confidence}`` into a batch, right-aligning ragged pre-event windows."""
+    pre_len = min(len(c["pre_close"]) for c in cases)
+    post_len = min(len(c["post_close"]) for c in cases)
+    return ScenarioBatch(
+        slugs=[c["slug"] for c in cases],
+        pre_close=np.array([c["pre_close"][-pre_len:] for c in cases], dtype=np.float64),
+        post_close=np.array([c["post_close"][:post_len] for c in cases], dtype=np.float64),
+        outcome_up=np.array([c["actual_outcome"] == "UP" for c in cases], dtype=np.float64),
+        ml_up=np.array([c["ml_prediction"] == "UP" for c in cases], dtype=np.float64),
+        ml_confidence=np.array([c["ml_confidence"] for c in cases], dtype=np.float64),
+    )
+
+
+# ── Strategies: batch → P(UP) ────────────────────────────────────────────────
+
+def _ml(batch: ScenarioBatch) -> np.ndarray:
+    return np.where(batch.ml_up == 1.0, batch.ml_confidence, 1.0 - batch.ml_confidence)
+
+
+def _trend(batch: ScenarioBatch, sign: float) -> np.ndarray:
+    """Logistic on the pre-event return measured in units of its volatility."""
+    returns = np.diff(np.log(batch.pre_close), axis=1)
+    score = returns.sum(axis=1) / (returns.std(axis=1) * np.sqrt(returns.shape[1]) + 1e-12)
+    return 1.0 / (1.0 + np.exp(-sign * score))
+
+
+def _always_up(batch: ScenarioBatch) -> np.ndarray:
+    return np.full(len(batch), 0.6)
+
+
+# name → (model version, strategy). Bump the version when a rule changes.
+STRATEGIES: dict[str, tuple[str, Callable[[ScenarioBatch], np.ndarray]]] = {
+    "ml": ("scenario-picks", _ml),
+    "momentum": ("momentum-v1", lambda b: _trend(b, 1.0)),
+    "mean_reversion": ("mean-reversion-v1", lambda b: _trend(b, -1.0)),
+    "always_up": ("always-up-v1", _always_up),
+}
+
+
+def model_version(strategy: str, batch: ScenarioBatch) -> str:
+    """Strategy version; the ML picks are versioned by their content."""
+    version = STRATEGIES[strategy][0]
+    if strategy == "ml":
+        digest = hashlib.sha1(batch.ml_up.tobytes() + batch.ml_confidence.tobytes()).hexdigest()[:8]
+        version = f"{version}-{digest}"
+    return version
+
+
+# ── Metrics ──────────────────────────────────────────────────────────────────
+
+def evaluate(p_up: np.ndarray, batch: ScenarioBatch, bins: int = 10) -> dict:
+    """Accuracy, Brier score, reliability curve and P&L of ``p_up``."""
+    y = batch.outcome_up
+    call_up = p_up >= 0.5
+    position = np.where(call_up, 1.0, -1.0)
+    trade_return = batch.post_close[:, -1] / batch.pre_close[:, -1] - 1.0
+    pnl = position * trade_return
+
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    which = np.clip(np.digitize(p_up, edges[1:-1]), 0, bins - 1)
+    counts = np.bincount(which, minlength=bins)
+    predicted = np.bincount(which, weights=p_up, minlength=bins)
+    observed = np.bincount(which, weights=y, minlength=bins)
+    calibration = [
+        {
+            "bin_low": round(float(edges[i]), 3),
+            "bin_high": round(float(edges[i + 1]), 3),
+            "count": int(counts[i]),
+            "mean_predicted": round(float(predicted[i] / counts[i]), 4),
+            "observed_up_rate": round(float(observed[i] / counts[i]), 4),
+        }
+        for i in range(bins) if counts[i]
+    ]
+
+    return {
+        "scenarios": len(batch),
+        "accuracy": round(float(np.mean(call_up == (y == 1.0))), 4),
+        "brier_score": round(float(np.mean((p_up - y) ** 2)), 4),
+        "calibration": calibration,
+        "total_return": round(float(pnl.sum()), 4),
+        "mean_return": round(float(pnl.mean()), 4),
+        "win_rate": round(float(np.mean(pnl > 0)), 4),
+    }
+
+
+# ── Cached entry point ───────────────────────────────────────────────────────
+
+_cache: dict[tuple, dict] = {}
+_cache_lock = threading.Lock()
+
+
+def run_backtest(strategy: str, batch: ScenarioBatch, bins: int = 10) -> dict:
+    """Backtest ``strategy`` over ``batch``; cached by model version."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {list(STRATEGIES)}")
+    version = model_version(strategy, batch)
+    key = (strategy, version, batch.fingerprint(), bins)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    p_up = STRATEGIES[strategy][1](batch)
+    result = {"strategy": strategy, "model_version": version, **evaluate(p_up, batch, bins)}
+    with _cache_lock:
+        _cache[key] = result
+    return {**result, "cached": False}
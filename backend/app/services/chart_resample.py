@@ -0,0 +1,78 @@
+"""OHLC resampling for the chart API.
+
+- ``aggregate`` rolls daily bars up into weekly (ISO week) or calendar-month
+  bars: first open, highest high, lowest low, last close, stamped with the
+  first bar's time.
+- ``lttb`` downsamples to at most ``max_points`` bars with Largest-Triangle-
+  Three-Buckets over close prices. It keeps the bars that carry the visual
+  shape of the series (peaks, troughs, turns) and always keeps the first and
+  last bar. Selected bars are returned unchanged, so OHLC stays truthful.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services.records import BarSeries
+
+RESOLUTIONS: tuple[str, ...] = ("daily", "weekly", "monthly")
+
+
+def _period(ts: int, resolution: str) -> tuple[int, int]:
+    day = datetime.fromtimestamp(ts, tz=timezone.utc)
+    if resolution == "weekly":
+        year, week, _ = day.isocalendar()
+        return (year, week)
+    return (day.year, day.month)
+
+
+def aggregate(bars: BarSeries, resolution: str) -> BarSeries:
+    """Aggregate time-ordered daily bars to ``resolution``."""
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of {list(RESOLUTIONS)}")
+    if resolution == "daily" or not len(bars):
+        return bars
+
+    periods = [_period(ts, resolution) for ts in bars.time.tolist()]
+    starts = np.array([0] + [i for i in range(1, len(periods)) if periods[i] != periods[i - 1]], dtype=np.intp)
+    ends = np.append(starts[1:], len(periods)) - 1
+    return BarSeries(
+        time=bars.time[starts],
+        open=bars.open[starts],
+        high=np.maximum.reduceat(bars.high, starts),
+        low=np.minimum.reduceat(bars.low, starts),
+        close=bars.close[ends],
+    )
+
+
+def lttb(bars: BarSeries, max_points: int) -> BarSeries:
+    """Largest-Triangle-Three-Buckets downsampling over close prices."""
+    n = len(bars)
+    if max_points >= n:
+        return bars
+    if max_points <= 2:
+        return bars.take([0, n - 1])
+
+    xs = bars.time.astype(np.float64)
+    ys = bars.close
+    bucket = (n - 2) / (max_points - 2)
+
+    selected = [0]
+    a = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+
+        # Average of the next bucket is the third triangle vertex
+        next_start, next_end = end, min(int((i + 2) * bucket) + 1, n)
+        if i == max_points - 3:
+            next_start, next_end = n - 1, n
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+
+        areas = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(np.argmax(areas))
+        selected.append(a)
+
+    selected.append(n - 1)
+    return bars.take(selected)
@@ -4,25 +4,36 @@ Takes the scenario context, actual outcome, user prediction, and ML prediction,
 then returns a structured JSON explanation with winner, summaries, and takeaways.
 """
 
+import asyncio
 import json
-import google.generativeai as genai
+import hashlib
 
 from app.config import get_settings
+from app.services.hedging import LatencyTracker, hedged
+from app.services.llm_dispatch import Priority, get_dispatcher
+from app.services.llm_registry import get_model
+from app.services.llm_usage import TokenBudgetExceeded, admit, estimate_tokens
+from app.services.request_context import remaining_seconds
+from app.services.shared_state import get_shared_state
 
 settings = get_settings()
 
-# ── Configure Gemini ─────────────────────────────────────────────────────────
-genai.configure(api_key=settings.gemini_api_key)
+# ── Gemini model config (client is built lazily by the registry) ─────────────
+_MODEL_NAME = "gemini-2.0-flash"
+_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "max_output_tokens": 1024,
+    "response_mime_type": "application/json",
+}
+
+_CALL_SITE = "game_master"
+# Recent Game Master latencies; the p95 decides when to send a hedge request
+_latency = LatencyTracker()
 
-_MODEL = genai.GenerativeModel(
-    model_name="gemini-2.0-flash",
-    generation_config={
-        "temperature": 0.7,
-        "top_p": 0.9,
-        "max_output_tokens": 1024,
-        "response_mime_type": "application/json",
-    },
-)
+# ── Shared explanation cache (keyed by prompt hash) ──────────────────────────
+_EXPLANATION_NAMESPACE = "game_master_explanations"
+_EXPLANATION_TTL = 24 * 3600
 
 # ── System Prompt ─────────────────────────────────────────────────────────────
 _SYSTEM_PROMPT = """You are the **Game Master** of TradeQuest, a gamified finance education platform.
@@ -53,6 +64,10 @@ RULES:
 - The "winner" field must be exactly one of: "user", "ml", "both", "neither"
 """
 
+_PRIMING_REPLY = "Understood. I am the Game Master. Send me a scenario and I will analyze it."
+# Resent with every call; reported by the token accounting prefix report
+_PREFIX_TOKENS = estimate_tokens(_SYSTEM_PROMPT, _PRIMING_REPLY)
+
 
 async def generate_game_master_explanation(
     scenario_title: str,
@@ -63,12 +78,16 @@ async def generate_game_master_explanation(
     user_prediction: str,
     ml_prediction: str,
     ml_confidence: float,
+    priority: Priority = Priority.INTERACTIVE,
 ) -> dict:
     """
     Call Gemini to generate the Game Master's post-prediction analysis.
 
     Returns a dict with: winner, outcome_summary, user_analysis,
     ml_analysis, learning_takeaway, fun_fact.
+
+    Successful explanations are cached by prompt, so identical reveals (and
+    reveals pre-generated during warm-up) skip the Gemini call.
     """
     user_prompt = f"""## Scenario: {scenario_title}
 
@@ -83,34 +102,82 @@ async def generate_game_master_explanation(
 
 Analyze this outcome and provide your Game Master verdict."""
 
-    try:
-        response = await _MODEL.generate_content_async(
-            [
-                {"role": "user", "parts": [_SYSTEM_PROMPT]},
-                {"role": "model", "parts": ["Understood. I am the Game Master. Send me a scenario and I will analyze it."]},
-                {"role": "user", "parts": [user_prompt]},
-            ]
-        )
-
-        # Parse the JSON response
-        result = json.loads(response.text)
-
-        # Validate required keys
-        required_keys = {"winner", "outcome_summary", "user_analysis", "ml_analysis", "learning_takeaway", "fun_fact"}
-        if not required_keys.issubset(result.keys()):
-            missing = required_keys - result.keys()
-            raise ValueError(f"Missing keys in Gemini response: {missing}")
-
-        return result
+    state = get_shared_state()
+    cache_key = hashlib.md5(user_prompt.encode()).hexdigest()
+    cached = await state.get(_EXPLANATION_NAMESPACE, cache_key)
+    if cached is not None:
+        return cached
 
+    task = asyncio.ensure_future(_explain(user_prompt, priority, cache_key))
+    timeout = remaining_seconds()
+    try:
+        if timeout is None:
+            return await task
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    except asyncio.TimeoutError:
+        if settings.llm_background_fill:
+            # Let the call finish and fill the cache for the next identical reveal
+            print(f"[Game Master] Latency budget ({timeout:.1f}s) exhausted — fallback now, cache fill in background")
+            task.add_done_callback(_log_background_fill)
+        else:
+            print(f"[Game Master] Latency budget ({timeout:.1f}s) exhausted — cancelling Gemini call")
+            task.cancel()
+        return _fallback_explanation(actual_outcome, user_prediction, ml_prediction)
     except json.JSONDecodeError:
         # Fallback if Gemini doesn't return valid JSON
         return _fallback_explanation(actual_outcome, user_prediction, ml_prediction)
+    except TokenBudgetExceeded as e:
+        print(f"[Game Master] {e} — using fallback")
+        return _fallback_explanation(actual_outcome, user_prediction, ml_prediction)
     except Exception as e:
         print(f"[Game Master] Gemini error: {e}")
         return _fallback_explanation(actual_outcome, user_prediction, ml_prediction)
 
 
+async def _explain(user_prompt: str, priority: Priority, cache_key: str) -> dict:
+    """One Gemini round trip (hedged past p95): budget, call, validate, cache."""
+    max_output = _GENERATION_CONFIG["max_output_tokens"]
+    prompt_tokens = _PREFIX_TOKENS + estimate_tokens(user_prompt)
+    model = get_model(_MODEL_NAME, _GENERATION_CONFIG)
+
+    with admit(_CALL_SITE, _MODEL_NAME, prompt_tokens, max_output) as reservation:
+        allowed = reservation.max_output_tokens
+        overrides = {"max_output_tokens": allowed} if allowed < max_output else None
+
+        async def attempt():
+            async with get_dispatcher().slot(priority):
+                with reservation.attempt():
+                    return await model.generate_content_async(
+                        [
+                            {"role": "user", "parts": [_SYSTEM_PROMPT]},
+                            {"role": "model", "parts": [_PRIMING_REPLY]},
+                            {"role": "user", "parts": [user_prompt]},
+                        ],
+                        generation_config=overrides,
+                    )
+
+        response = await hedged(attempt, _latency, enabled=settings.llm_hedge_enabled)
+        reservation.record(response, _PREFIX_TOKENS)
+
+    # Parse the JSON response
+    result = json.loads(response.text)
+
+    # Validate required keys
+    required_keys = {"winner", "outcome_summary", "user_analysis", "ml_analysis", "learning_takeaway", "fun_fact"}
+    if not required_keys.issubset(result.keys()):
+        missing = required_keys - result.keys()
+        raise ValueError(f"Missing keys in Gemini response: {missing}")
+
+    await get_shared_state().set(_EXPLANATION_NAMESPACE, cache_key, result, ttl=_EXPLANATION_TTL)
+    return result
+
+
+def _log_background_fill(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[Game Master] Background cache fill failed: {task.exception()}")
+
+
 def _determine_winner(user_prediction: str, ml_prediction: str, actual: str) -> str:
     """Determine who won."""
     user_correct = user_prediction == actual
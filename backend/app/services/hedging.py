@@ -0,0 +1,70 @@
+"""Hedged requests for latency-critical upstream calls.
+
+``hedged()`` starts a call and, if it hasn't finished by the call site's
+observed p95 latency, starts an identical second attempt. Whichever
+succeeds first wins and the other is cancelled. Tail latency is then
+bounded by roughly p95 plus a typical call, at the cost of duplicating the
+slowest ~5% of calls.
+
+The cancelled attempt has usually been sent already and is billed for its
+prompt, so LLM call sites wrap each attempt in
+``llm_usage.Reservation.attempt()`` to account for the loser as well.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Recent successful call latencies for one call site."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency quantile, or None until enough samples are collected."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _timed(call: Callable[[], Awaitable[T]], tracker: LatencyTracker) -> T:
+    started = time.monotonic()
+    result = await call()
+    tracker.record(time.monotonic() - started)
+    return result
+
+
+async def hedged(call: Callable[[], Awaitable[T]], tracker: LatencyTracker, enabled: bool = True) -> T:
+    """Await ``call()``, hedging with a second attempt past the p95 latency."""
+    delay = tracker.quantile(0.95) if enabled else None
+    attempts = [asyncio.ensure_future(_timed(call, tracker))]
+    try:
+        if delay is None:
+            return await attempts[0]
+
+        done, _ = await asyncio.wait(attempts, timeout=delay)
+        if not done:
+            print(f"[Hedging] No response after p95 ({delay:.2f}s) — sending hedge request")
+            attempts.append(asyncio.ensure_future(_timed(call, tracker)))
+
+        pending = set(attempts)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+        # Every attempt failed: surface the first attempt's error
+        return attempts[0].result()
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
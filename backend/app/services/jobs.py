@@ -0,0 +1,189 @@
+"""Background job queue for slow work that clients fetch later.
+
+A route that would otherwise hold its connection open for a Gemini call
+submits the call as a job, answers right away with the job id, and the
+client polls (or long-polls) ``GET /api/jobs/{id}`` for the result.
+
+- A fixed pool of worker tasks drains a bounded FIFO; when it is full,
+  ``submit`` raises ``JobQueueFull`` and the route sheds the request.
+- Jobs carry a dedup key. Submitting a key whose job is still queued,
+  running or holding a fresh result returns that job instead of a new one.
+- Finished jobs expire ``ttl_seconds`` after completion and are swept
+  lazily on the next submit or lookup.
+- ``on_done`` registers follow-up work (e.g. storing the result) that the
+  worker runs once the job has finished, whether it succeeded or not.
+- A worker cancelled mid-job (shutdown) marks the job failed, so pollers
+  never see a job stuck in ``running``.
+
+Workers run in an empty context, so the request that started them isn't
+charged for (or deadlined by) the jobs they run.
+"""
+
+import asyncio
+import contextvars
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import get_settings
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueueFull(Exception):
+    """The job queue has no room for another job."""
+
+
+class Job:
+    """One unit of background work and its outcome."""
+
+    __slots__ = ("id", "kind", "key", "fn", "status", "result", "error",
+                 "created_at", "finished_at", "_done", "_callbacks")
+
+    def __init__(self, kind: str, key: str, fn: Callable[[], Awaitable[Any]]) -> None:
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.fn = fn
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._done = asyncio.Event()
+        self._callbacks: list[Callable[["Job"], Awaitable[None]]] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Bounded FIFO of jobs drained by a fixed pool of worker tasks."""
+
+    def __init__(self, workers: int = 4, max_queue: int = 256, ttl_seconds: float = 600.0) -> None:
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queue)
+        self._jobs: dict[str, Job] = {}
+        self._by_key: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def _ensure_workers(self) -> None:
+        self._tasks = [t for t in self._tasks if not t.done()]
+        empty = contextvars.Context()
+        while len(self._tasks) < self.workers:
+            self._tasks.append(empty.run(asyncio.create_task, self._work()))
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            try:
+                job.result = await job.fn()
+                job.status = DONE
+            except Exception as e:
+                print(f"[Jobs] {job.kind} job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = FAILED
+            finally:
+                if job.status == RUNNING:  # cancelled mid-job
+                    job.error = "Cancelled before finishing"
+                    job.status = FAILED
+                job.fn = None
+                job.finished_at = time.time()
+                job._done.set()
+                self._queue.task_done()
+            await self._run_callbacks(job)
+
+    @staticmethod
+    async def _run_callbacks(job: Job) -> None:
+        callbacks, job._callbacks = job._callbacks, []
+        for callback in callbacks:
+            try:
+                await callback(job)
+            except Exception as e:
+                print(f"[Jobs] {job.kind} job {job.id} follow-up failed: {e}")
+
+    # ── Submit / look up ─────────────────────────────────────────────────────
+
+    def _sweep(self) -> None:
+        """Drop finished jobs past their TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        stale = [job for job in self._jobs.values() if job.finished and job.finished_at < cutoff]
+        for job in stale:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    def submit(self, kind: str, key: str, fn: Callable[[], Awaitable[Any]]) -> Job:
+        """Queue ``fn`` unless a live job for ``key`` exists; return the job."""
+        self._sweep()
+        existing = self._by_key.get(key)
+        if existing is not None and existing.status != FAILED:
+            return existing
+
+        job = Job(kind, key, fn)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"{self._queue.qsize()} jobs already queued")
+        self._jobs[job.id] = job
+        self._by_key[key] = job
+        self._ensure_workers()
+        return job
+
+    def on_done(self, job: Job, callback: Callable[[Job], Awaitable[None]]) -> None:
+        """Await ``callback(job)`` in the worker once ``job`` has finished.
+
+        Only for jobs that haven't finished yet; check ``job.finished`` first.
+        """
+        job._callbacks.append(callback)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._sweep()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Return once ``job`` has finished or ``timeout`` seconds have passed."""
+        if not job.finished and timeout > 0:
+            try:
+                await asyncio.wait_for(job._done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def stats(self) -> dict:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {"workers": len(self._tasks), "max_queue": self._queue.maxsize, **counts}
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    cfg = get_settings()
+    return JobQueue(
+        workers=cfg.job_workers,
+        max_queue=cfg.job_max_queue,
+        ttl_seconds=cfg.job_ttl_seconds,
+    )
@@ -0,0 +1,138 @@
+"""Priority dispatch queue shared by every Gemini call site.
+
+All LLM calls take a slot from one dispatcher before hitting Gemini:
+
+- ``INTERACTIVE``: a user is waiting on the answer (prediction reveals).
+- ``BACKGROUND``: news analysis for alerts.
+- ``PREFETCH``: speculative work such as warm-up pre-generation.
+
+Free slots go to the highest-priority waiter whose class is under its own
+concurrency limit. Waiters age: every ``aging_seconds`` spent in the queue
+promotes them one class, so background work is never starved outright.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from functools import lru_cache
+
+from app.config import get_settings
+
+
+class Priority(IntEnum):
+    """LLM call priority classes (lower value wins)."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    PREFETCH = 2
+
+
+class _Waiter:
+    """A queued slot request."""
+
+    __slots__ = ("priority", "enqueued_at", "seq", "future")
+
+    def __init__(self, priority: Priority, seq: int) -> None:
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.seq = seq
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class LLMDispatcher:
+    """Global + per-class concurrency limits with priority and aging."""
+
+    def __init__(self, max_concurrency: int, class_limits: dict[Priority, int], aging_seconds: float) -> None:
+        self.max_concurrency = max_concurrency
+        self.class_limits = class_limits
+        self.aging_seconds = aging_seconds
+        self._running: dict[Priority, int] = {p: 0 for p in Priority}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> int:
+        if self.aging_seconds <= 0:
+            return waiter.priority
+        promoted = int((now - waiter.enqueued_at) / self.aging_seconds)
+        return max(0, waiter.priority - promoted)
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        return (
+            sum(self._running.values()) < self.max_concurrency
+            and self._running[priority] < self.class_limits.get(priority, self.max_concurrency)
+        )
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the best eligible waiters."""
+        # Drop waiters cancelled since they queued
+        self._waiters = [w for w in self._waiters if not w.future.done()]
+        while self._waiters:
+            now = time.monotonic()
+            eligible = [w for w in self._waiters if self._has_capacity(w.priority)]
+            if not eligible:
+                return
+            best = min(eligible, key=lambda w: (self._effective_priority(w, now), w.seq))
+            self._waiters.remove(best)
+            self._running[best.priority] += 1
+            best.future.set_result(None)
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait for a slot in ``priority``'s class."""
+        if not self._waiters and self._has_capacity(priority):
+            self._running[priority] += 1
+            return
+
+        waiter = _Waiter(priority, next(self._seq))
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted just as we were cancelled — hand it back
+                self.release(priority)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._dispatch()
+            raise
+
+    def release(self, priority: Priority) -> None:
+        """Return a slot and wake the next waiter."""
+        self._running[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority):
+        """``async with dispatcher.slot(Priority.INTERACTIVE): ...``"""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def stats(self) -> dict:
+        """Running and queued calls per priority class."""
+        return {
+            p.name.lower(): {
+                "running": self._running[p],
+                "queued": sum(1 for w in self._waiters if w.priority == p),
+                "limit": self.class_limits.get(p, self.max_concurrency),
+            }
+            for p in Priority
+        }
+
+
+@lru_cache()
+def get_dispatcher() -> LLMDispatcher:
+    """Process-wide LLM dispatcher configured from settings."""
+    settings = get_settings()
+    return LLMDispatcher(
+        max_concurrency=settings.llm_max_concurrency,
+        class_limits={
+            Priority.INTERACTIVE: settings.llm_interactive_limit,
+            Priority.BACKGROUND: settings.llm_background_limit,
+            Priority.PREFETCH: settings.llm_prefetch_limit,
+        },
+        aging_seconds=settings.llm_aging_seconds,
+    )
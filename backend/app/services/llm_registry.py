@@ -0,0 +1,51 @@
+"""Shared, lazily-initialized Gemini model registry.
+
+The Google Generative AI SDK is heavy to import, so nothing here touches it
+until the first model is actually requested. The SDK is configured once per
+process and one ``GenerativeModel`` is kept per distinct model config.
+"""
+
+import json
+import threading
+from typing import Any
+
+from app.config import get_settings
+
+_lock = threading.Lock()
+_genai: Any = None
+_models: dict[str, Any] = {}
+
+
+def _config_key(model_name: str, generation_config: dict) -> str:
+    """Stable registry key for a (model, generation config) pair."""
+    return f"{model_name}:{json.dumps(generation_config, sort_keys=True)}"
+
+
+def get_genai() -> Any:
+    """Import and configure the Gemini SDK on first use."""
+    global _genai
+    if _genai is None:
+        with _lock:
+            if _genai is None:
+                import google.generativeai as genai
+
+                genai.configure(api_key=get_settings().gemini_api_key)
+                _genai = genai
+    return _genai
+
+
+def get_model(model_name: str, generation_config: dict) -> Any:
+    """Return the shared ``GenerativeModel`` for this model config."""
+    key = _config_key(model_name, generation_config)
+    model = _models.get(key)
+    if model is None:
+        genai = get_genai()
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                model = genai.GenerativeModel(
+                    model_name=model_name,
+                    generation_config=generation_config,
+                )
+                _models[key] = model
+    return model
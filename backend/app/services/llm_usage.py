@@ -0,0 +1,274 @@
+"""Token and cost accounting for Gemini calls.
+
+Every call records the ``usage_metadata`` of its response under a
+(call site, route, model) key. The route comes from the request context, or
+is ``background`` for warm-up and pollers. Totals are kept for the process
+lifetime and in per-minute buckets for rolling windows of up to an hour.
+
+Each call site also reports the size of the fixed prefix it resends on every
+call (system prompt plus priming turn). The prefix report shows what that
+repetition costs, and how much of it the API already served from cache.
+
+Requests can carry a token budget (``LLM_REQUEST_TOKEN_BUDGET``).
+``admit()`` is checked before each call. It lowers ``max_output_tokens`` to
+fit the remaining budget, or raises ``TokenBudgetExceeded`` so the caller
+takes its fallback path. It returns a ``Reservation`` to use as a context
+manager around the call: if the block exits without recording a response
+(an error, a timeout), the reserved tokens go back to the budget.
+
+Attempts that were sent but then cancelled, such as the losing half of a
+hedged call, are still billed for their prompt. Wrapping each attempt in
+``Reservation.attempt()`` charges those prompt tokens as ``abandoned``.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from app.services.request_context import current_request
+
+# USD per million tokens: (input, output). Cached input is billed at 25%.
+_PRICES_PER_MILLION: dict[str, tuple[float, float]] = {
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+}
+_CACHED_INPUT_DISCOUNT = 0.25
+_CHARS_PER_TOKEN = 4
+# Below this many output tokens a response isn't worth requesting
+_MIN_OUTPUT_TOKENS = 128
+_ROLLING_MINUTES = 60
+
+
+class TokenBudgetExceeded(Exception):
+    """The current request has no token budget left for this call."""
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token count for budgeting and prefix sizing (~4 chars/token)."""
+    return sum(len(t) for t in texts) // _CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class UsageTotals:
+    calls: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    prefix_tokens: int = 0
+    downgraded: int = 0
+    refused: int = 0
+    abandoned: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, other: "UsageTotals") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["cost_usd"] = round(self.cost_usd, 6)
+        return data
+
+
+def _cost(model: str, prompt: int, output: int, cached: int) -> float:
+    price_in, price_out = _PRICES_PER_MILLION.get(model, _PRICES_PER_MILLION["gemini-2.0-flash"])
+    billed_in = (prompt - cached) + cached * _CACHED_INPUT_DISCOUNT
+    return (billed_in * price_in + output * price_out) / 1_000_000
+
+
+# (call_site, route, model)
+Key = tuple[str, str, str]
+
+
+class UsageLedger:
+    """Lifetime and rolling per-(call site, route, model) usage totals."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._lifetime: dict[Key, UsageTotals] = {}
+        self._minutes: deque[tuple[int, dict[Key, UsageTotals]]] = deque(maxlen=_ROLLING_MINUTES)
+
+    def _bucket(self) -> dict[Key, UsageTotals]:
+        minute = int(time.time() // 60)
+        if not self._minutes or self._minutes[-1][0] != minute:
+            self._minutes.append((minute, {}))
+        return self._minutes[-1][1]
+
+    def add(self, key: Key, usage: UsageTotals) -> None:
+        with self._lock:
+            self._lifetime.setdefault(key, UsageTotals()).add(usage)
+            self._bucket().setdefault(key, UsageTotals()).add(usage)
+
+    def totals(self, window_seconds: Optional[int] = None) -> dict[Key, UsageTotals]:
+        """Per-key totals for the lifetime, or the last ``window_seconds``."""
+        with self._lock:
+            if window_seconds is None:
+                buckets = [self._lifetime]
+            else:
+                since = int(time.time() // 60) - max(1, window_seconds // 60) + 1
+                buckets = [b for minute, b in self._minutes if minute >= since]
+            merged: dict[Key, UsageTotals] = {}
+            for bucket in buckets:
+                for key, usage in bucket.items():
+                    merged.setdefault(key, UsageTotals()).add(usage)
+        return merged
+
+
+_ledger = UsageLedger()
+
+
+def _key(call_site: str, model: str) -> Key:
+    request = current_request()
+    return (call_site, request.route if request else "background", model)
+
+
+# ── Call-site hooks ──────────────────────────────────────────────────────────
+
+class Reservation:
+    """Tokens ``admit`` set aside for one call, released unless recorded."""
+
+    def __init__(self, call_site: str, model: str, prompt_tokens: int, max_output_tokens: int, reserved: int = 0) -> None:
+        self.call_site = call_site
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.max_output_tokens = max_output_tokens
+        self.reserved = reserved
+        self._request = current_request()
+
+    def __enter__(self) -> "Reservation":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.reserved and self._request is not None:
+            self._request.tokens_used -= self.reserved
+        self.reserved = 0
+
+    def record(self, response, prefix_tokens: int = 0) -> None:
+        """Account the response and swap the reservation for its actual usage."""
+        record_usage(self.call_site, self.model, response, prefix_tokens, reserved=self.reserved)
+        self.reserved = 0
+
+    @contextmanager
+    def attempt(self):
+        """Wrap one sent attempt; charge its prompt if it is cancelled in flight."""
+        try:
+            yield
+        except asyncio.CancelledError:
+            if self._request is not None:
+                self._request.tokens_used += self.prompt_tokens
+            _ledger.add(_key(self.call_site, self.model), UsageTotals(
+                abandoned=1,
+                prompt_tokens=self.prompt_tokens,
+                cost_usd=_cost(self.model, self.prompt_tokens, 0, 0),
+            ))
+            raise
+
+
+def admit(call_site: str, model: str, prompt_tokens: int, max_output_tokens: int) -> Reservation:
+    """Reserve a call's tokens under the current request's budget.
+
+    The reservation's ``max_output_tokens`` is the requested cap when it
+    fits, or a lower cap when only part of it fits. Raises
+    ``TokenBudgetExceeded`` when too little is left.
+
+    The admitted tokens are reserved against the budget right away, so
+    concurrent calls from one request can't overspend it together;
+    ``Reservation.record`` later swaps the reservation for the actual count.
+    """
+    request = current_request()
+    remaining = request.tokens_remaining if request else None
+    if remaining is None:
+        return Reservation(call_site, model, prompt_tokens, max_output_tokens)
+
+    allowed = min(max_output_tokens, remaining - prompt_tokens)
+    if allowed < _MIN_OUTPUT_TOKENS:
+        _ledger.add(_key(call_site, model), UsageTotals(refused=1))
+        raise TokenBudgetExceeded(
+            f"{call_site}: ~{prompt_tokens} prompt tokens but only {remaining} left in this request's budget"
+        )
+    if allowed < max_output_tokens:
+        _ledger.add(_key(call_site, model), UsageTotals(downgraded=1))
+    request.tokens_used += prompt_tokens + allowed
+    return Reservation(call_site, model, prompt_tokens, allowed, reserved=prompt_tokens + allowed)
+
+
+def record_usage(call_site: str, model: str, response, prefix_tokens: int = 0, reserved: int = 0) -> None:
+    """Account one response's ``usage_metadata`` (missing fields count as 0).
+
+    ``reserved`` is what ``admit`` set aside for this call.
+    """
+    meta = getattr(response, "usage_metadata", None)
+    prompt = int(getattr(meta, "prompt_token_count", 0) or 0)
+    output = int(getattr(meta, "candidates_token_count", 0) or 0)
+    cached = int(getattr(meta, "cached_content_token_count", 0) or 0)
+
+    request = current_request()
+    if request is not None:
+        request.tokens_used += prompt + output - reserved
+
+    _ledger.add(_key(call_site, model), UsageTotals(
+        calls=1,
+        prompt_tokens=prompt,
+        output_tokens=output,
+        cached_tokens=cached,
+        prefix_tokens=min(prefix_tokens, prompt) if prompt else prefix_tokens,
+        cost_usd=_cost(model, prompt, output, cached),
+    ))
+
+
+# ── Reports ──────────────────────────────────────────────────────────────────
+
+def usage_report(window_seconds: Optional[int] = None) -> dict:
+    """Totals overall and grouped by call site, route and model."""
+    totals = _ledger.totals(window_seconds)
+    overall = UsageTotals()
+    groups: dict[str, dict[str, UsageTotals]] = {"call_site": {}, "route": {}, "model": {}}
+    for (call_site, route, model), usage in totals.items():
+        overall.add(usage)
+        for dimension, value in (("call_site", call_site), ("route", route), ("model", model)):
+            groups[dimension].setdefault(value, UsageTotals()).add(usage)
+
+    def rows(dimension: str) -> list[dict]:
+        ranked = sorted(groups[dimension].items(), key=lambda kv: kv[1].cost_usd, reverse=True)
+        return [{dimension: name, **usage.as_dict()} for name, usage in ranked]
+
+    return {
+        "window_seconds": window_seconds,
+        "totals": overall.as_dict(),
+        "by_call_site": rows("call_site"),
+        "by_route": rows("route"),
+        "by_model": rows("model"),
+    }
+
+
+def prefix_report(window_seconds: Optional[int] = None) -> list[dict]:
+    """What the repeated system-prompt prefix costs, per call site."""
+    per_site: dict[tuple[str, str], UsageTotals] = {}
+    for (call_site, _, model), usage in _ledger.totals(window_seconds).items():
+        per_site.setdefault((call_site, model), UsageTotals()).add(usage)
+
+    report = []
+    for (call_site, model), usage in sorted(per_site.items()):
+        if not usage.calls:
+            continue
+        price_in = _PRICES_PER_MILLION.get(model, _PRICES_PER_MILLION["gemini-2.0-flash"])[0]
+        prefix_cost = usage.prefix_tokens * price_in / 1_000_000
+        report.append({
+            "call_site": call_site,
+            "model": model,
+            "calls": usage.calls,
+            "prefix_tokens_per_call": round(usage.prefix_tokens / usage.calls),
+            "prefix_tokens": usage.prefix_tokens,
+            "prefix_share_of_prompt": round(usage.prefix_tokens / usage.prompt_tokens, 4) if usage.prompt_tokens else None,
+            "prefix_cost_usd": round(prefix_cost, 6),
+            "cached_tokens": usage.cached_tokens,
+            # Upper bound on savings if every prefix were served from cache
+            "max_cache_savings_usd": round(prefix_cost * (1 - _CACHED_INPUT_DISCOUNT), 6),
+        })
+    return report
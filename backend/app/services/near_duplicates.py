@@ -0,0 +1,115 @@
+"""Near-duplicate detection for news articles (MinHash + LSH banding).
+
+An article's headline and summary are reduced to their set of content words
+and summarised by a MinHash signature, whose matching positions estimate
+the Jaccard similarity of two sets. Syndicated copies and reworded headlines
+keep most of their words, so they score high. Unrelated stories share few.
+
+Signatures are cut into bands of a few rows. Articles that agree on every
+row of at least one band land in the same bucket, so a lookup only compares
+against the handful of bucket-mates, which are then verified against the
+similarity threshold. The index keeps a bounded window of recent originals
+and caps every bucket, so checking an article costs the same however much
+news has been seen.
+"""
+
+import hashlib
+from collections import OrderedDict, deque
+from typing import Optional
+
+import numpy as np
+
+from app.services.alert_search import tokenize
+
+_BANDS = 10
+_ROWS = 3
+_NUM_HASHES = _BANDS * _ROWS
+_MAX_BUCKET = 16
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with after over into than".split()
+)
+
+_rng = np.random.default_rng(0x5EED)
+_SEEDS = _rng.integers(0, 2**63, size=_NUM_HASHES, dtype=np.uint64)
+_MULTIPLIERS = _rng.integers(0, 2**63, size=_NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+
+
+def shingles(text: str) -> set[str]:
+    """Content words of ``text``."""
+    return {t for t in tokenize(text) if t not in _STOPWORDS}
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature (``_NUM_HASHES`` uint64 values) of ``text``."""
+    words = shingles(text)
+    if not words:
+        return np.zeros(_NUM_HASHES, dtype=np.uint64)
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "little") for w in words],
+        dtype=np.uint64,
+    )
+    # Multiply-xorshift family; uint64 arithmetic wraps by design
+    mixed = (hashes[:, None] ^ _SEEDS) * _MULTIPLIERS
+    return (mixed ^ (mixed >> np.uint64(29))).min(axis=0)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def _bands(signature: np.ndarray) -> list[tuple[int, bytes]]:
+    return [(b, signature[b * _ROWS:(b + 1) * _ROWS].tobytes()) for b in range(_BANDS)]
+
+
+class NearDuplicateIndex:
+    """Bounded window of recent originals, bucketed by MinHash band."""
+
+    def __init__(self, window: int = 2000, threshold: float = 0.5) -> None:
+        self.threshold = threshold
+        self._window = window
+        self._signatures: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._buckets: dict[tuple[int, bytes], deque[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def original_of(self, key: str, signature: np.ndarray) -> Optional[str]:
+        """Key of a near-identical earlier article, or None.
+
+        Articles without a near-duplicate are recorded as originals.
+        Repeated calls for the same key give the same answer.
+        """
+        if key in self._signatures or not signature.any():
+            return None
+
+        bands = _bands(signature)
+        best, best_score = None, self.threshold
+        for band in bands:
+            for other in self._buckets.get(band, ()):
+                score = similarity(self._signatures[other], signature)
+                if score >= best_score:
+                    best, best_score = other, score
+        if best is not None:
+            return best
+
+        self._signatures[key] = signature
+        for band in bands:
+            bucket = self._buckets.setdefault(band, deque())
+            if len(bucket) >= _MAX_BUCKET:
+                bucket.popleft()
+            bucket.append(key)
+        if len(self._signatures) > self._window:
+            self._evict()
+        return None
+
+    def _evict(self) -> None:
+        key, signature = self._signatures.popitem(last=False)
+        for band in _bands(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band]
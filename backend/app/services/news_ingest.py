@@ -0,0 +1,209 @@
+"""Multi-category Finnhub ingestion with adaptive polling.
+
+Each Finnhub news category (general, forex, crypto, merger) gets its own
+poll loop. After every poll the loop re-plans its interval from:
+
+- the observed arrival rate of new articles (EWMA), aiming for roughly one
+  new article per poll, clamped to ``[min_interval, max_interval]``;
+- the time of day — outside US market hours intervals stretch, except for
+  crypto, which trades around the clock;
+- a global request budget shared by all categories and every worker on
+  the host (a token bucket in shared state, sized below Finnhub's
+  per-minute rate limit). If the planned intervals would overspend it,
+  they are stretched proportionally.
+
+Per-category freshness metrics are exposed through ``metrics()``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from app.services.shared_state import get_shared_state
+
+CATEGORIES: tuple[str, ...] = ("general", "forex", "crypto", "merger")
+
+# Categories whose news flow follows the equity trading day
+_MARKET_HOURS_CATEGORIES = {"general", "forex", "merger"}
+# Interval multiplier outside market hours / on weekends
+_OFF_HOURS_FACTOR = 3.0
+# Weight of the newest observation in the arrival-rate EWMA
+_RATE_ALPHA = 0.3
+
+
+def is_us_market_hours(now: Optional[datetime] = None) -> bool:
+    """Approximate NYSE regular session (13:30–20:00 UTC, Mon–Fri)."""
+    now = now or datetime.now(timezone.utc)
+    minutes = now.hour * 60 + now.minute
+    return now.weekday() < 5 and 13 * 60 + 30 <= minutes < 20 * 60
+
+
+class RequestBudget:
+    """Token bucket shared by every category's poll loop, kept in shared state
+    so a poller lease handover can't start a second, full bucket."""
+
+    def __init__(self, name: str, per_minute: float) -> None:
+        self.name = name
+        self.per_minute = per_minute
+        self.capacity = max(1.0, per_minute / 6)
+
+    async def acquire(self) -> float:
+        """Spend one request token: ``0.0``, or the seconds until one is available."""
+        return await get_shared_state().take_token(self.name, self.per_minute, self.capacity)
+
+
+@dataclass
+class CategoryState:
+    """Adaptive polling state and freshness metrics for one category."""
+    category: str
+    interval: float
+    min_interval: float
+    max_interval: float
+    base_interval: float = 0.0           # rate-driven interval before the clock factor
+    arrival_rate: float = 0.0            # new articles per second (EWMA)
+    newest_article_ts: int = 0           # Finnhub `datetime` of newest article seen
+    newest_article_id: int = 0           # Finnhub `id`, used as `minId` on the next poll
+    last_poll_at: Optional[float] = None
+    last_success_at: Optional[float] = None
+    last_new_article_at: Optional[float] = None
+    detection_lag: Optional[float] = None  # EWMA seconds from publish to ingest
+    polls: int = 0
+    errors: int = 0
+    budget_skips: int = 0
+    new_articles: int = 0
+    _last_poll_monotonic: Optional[float] = field(default=None, repr=False)
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        return {
+            "category": self.category,
+            "interval_seconds": round(self.interval, 1),
+            "arrival_rate_per_min": round(self.arrival_rate * 60, 3),
+            "newest_article_age_seconds": round(now - self.newest_article_ts, 1) if self.newest_article_ts else None,
+            "seconds_since_success": round(now - self.last_success_at, 1) if self.last_success_at else None,
+            "seconds_since_new_article": round(now - self.last_new_article_at, 1) if self.last_new_article_at else None,
+            "detection_lag_seconds": round(self.detection_lag, 1) if self.detection_lag is not None else None,
+            "polls": self.polls,
+            "errors": self.errors,
+            "budget_skips": self.budget_skips,
+            "new_articles": self.new_articles,
+        }
+
+
+def _clocked_interval(state: CategoryState) -> float:
+    """``state.base_interval`` stretched outside market hours, clamped."""
+    interval = state.base_interval
+    if state.category in _MARKET_HOURS_CATEGORIES and not is_us_market_hours():
+        interval *= _OFF_HOURS_FACTOR
+    return min(state.max_interval, max(state.min_interval, interval))
+
+
+# fetch(category, limit, min_id) -> articles; raises on upstream errors
+FetchFn = Callable[[str, int, Optional[int]], Awaitable[list[dict]]]
+HandleFn = Callable[[str, list[dict]], Awaitable[None]]
+GateFn = Callable[[], Awaitable[bool]]
+
+
+class NewsIngestor:
+    """Concurrent, adaptively scheduled poll loops over Finnhub categories."""
+
+    def __init__(
+        self,
+        fetch: FetchFn,
+        handle: HandleFn,
+        should_poll: GateFn,
+        categories: tuple[str, ...] = CATEGORIES,
+        requests_per_minute: float = 30.0,
+        budget_name: str = "finnhub_requests",
+        min_interval: float = 15.0,
+        max_interval: float = 600.0,
+        initial_interval: float = 45.0,
+        fetch_limit: int = 10,
+    ) -> None:
+        self._fetch = fetch
+        self._handle = handle
+        self._should_poll = should_poll
+        self.budget = RequestBudget(budget_name, requests_per_minute)
+        self.fetch_limit = fetch_limit
+        self.states = {
+            c: CategoryState(c, initial_interval, min_interval, max_interval, base_interval=initial_interval)
+            for c in categories
+        }
+
+    def metrics(self) -> dict:
+        """Per-category freshness metrics plus the global request budget."""
+        return {
+            "requests_per_minute_budget": self.budget.per_minute,
+            "planned_requests_per_minute": round(sum(60 / s.interval for s in self.states.values()), 2),
+            "market_hours": is_us_market_hours(),
+            "categories": [s.snapshot() for s in self.states.values()],
+        }
+
+    async def run(self) -> None:
+        """Run every category's poll loop concurrently until cancelled."""
+        await asyncio.gather(*(self._poll_loop(s) for s in self.states.values()))
+
+    async def _poll_loop(self, state: CategoryState) -> None:
+        while True:
+            await asyncio.sleep(state.interval)
+            try:
+                if not await self._should_poll():
+                    continue
+                wait = await self.budget.acquire()
+                if wait:
+                    state.budget_skips += 1
+                    await asyncio.sleep(wait)
+                    continue
+                await self._poll_once(state)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.errors += 1
+                print(f"[News Ingest] {state.category} poll error: {e}")
+            self._plan_interval(state)
+
+    async def _poll_once(self, state: CategoryState) -> None:
+        now_monotonic = time.monotonic()
+        state.polls += 1
+        state.last_poll_at = time.time()
+
+        articles = await self._fetch(state.category, self.fetch_limit, state.newest_article_id or None)
+        state.last_success_at = time.time()
+
+        fresh = [a for a in articles if int(a.get("datetime", 0) or 0) > state.newest_article_ts]
+        elapsed = now_monotonic - state._last_poll_monotonic if state._last_poll_monotonic else state.interval
+        state._last_poll_monotonic = now_monotonic
+        state.arrival_rate = _RATE_ALPHA * (len(fresh) / max(elapsed, 1.0)) + (1 - _RATE_ALPHA) * state.arrival_rate
+
+        if not fresh:
+            return
+
+        state.new_articles += len(fresh)
+        state.last_new_article_at = time.time()
+        state.newest_article_ts = max(int(a.get("datetime", 0) or 0) for a in fresh)
+        state.newest_article_id = max([state.newest_article_id] + [int(a.get("id", 0) or 0) for a in fresh])
+        lag = max(0.0, time.time() - state.newest_article_ts)
+        state.detection_lag = lag if state.detection_lag is None else (
+            _RATE_ALPHA * lag + (1 - _RATE_ALPHA) * state.detection_lag
+        )
+
+        await self._handle(state.category, fresh)
+
+    def _plan_interval(self, state: CategoryState) -> None:
+        """Re-plan one category's interval from arrival rate, clock and budget."""
+        if state.arrival_rate > 0:
+            base = 1 / state.arrival_rate
+        else:
+            base = state.base_interval * 1.5  # quiet: back off gradually
+        state.base_interval = min(state.max_interval, max(state.min_interval, base))
+
+        # Every interval is re-derived from its base, so budget stretching
+        # applied on earlier passes never compounds
+        planned = {c: _clocked_interval(s) for c, s in self.states.items()}
+        planned_per_minute = sum(60 / interval for interval in planned.values())
+        scale = max(1.0, planned_per_minute / self.budget.per_minute)
+        for c, s in self.states.items():
+            s.interval = min(s.max_interval, planned[c] * scale)
+
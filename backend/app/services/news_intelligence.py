@@ -4,33 +4,45 @@ Fetches real financial news from Finnhub, then uses Gemini AI to analyze
 each article for severity ranking and market-impact assessment.
 """
 
+import asyncio
 import json
 import uuid
 import hashlib
 from datetime import datetime, timezone
 
 import httpx
-import google.generativeai as genai
 
 from app.config import get_settings
+from app.services.llm_dispatch import Priority, get_dispatcher
+from app.services.llm_registry import get_model
+from app.services.llm_usage import TokenBudgetExceeded, admit, estimate_tokens
+from app.services.near_duplicates import NearDuplicateIndex, minhash
+from app.services.shared_state import get_shared_state
 
 settings = get_settings()
 
-# ── Configure Gemini ─────────────────────────────────────────────────────────
-genai.configure(api_key=settings.gemini_api_key)
-
-_MODEL = genai.GenerativeModel(
-    model_name="gemini-2.0-flash",
-    generation_config={
-        "temperature": 0.5,
-        "top_p": 0.85,
-        "max_output_tokens": 512,
-        "response_mime_type": "application/json",
-    },
-)
+# ── Gemini model config (client is built lazily by the registry) ─────────────
+_MODEL_NAME = "gemini-2.0-flash"
+_GENERATION_CONFIG = {
+    "temperature": 0.5,
+    "top_p": 0.85,
+    "max_output_tokens": 512,
+    "response_mime_type": "application/json",
+}
 
-# ── In-memory cache (keyed by article content hash) ──────────────────────────
-_analysis_cache: dict[str, dict] = {}
+# ── Shared analysis cache (keyed by article content hash) ────────────────────
+_ANALYSIS_NAMESPACE = "news_analysis"
+_ANALYSIS_TTL = 24 * 3600
+# A worker claims an article before calling Gemini; others wait for its result
+_CLAIM_NAMESPACE = "news_analysis_claims"
+_CLAIM_TTL = 30.0
+_CLAIM_POLL_INTERVAL = 0.25
+
+# Recent originals that reworded / syndicated copies are matched against
+_near_duplicates = NearDuplicateIndex(
+    window=settings.near_duplicate_window,
+    threshold=settings.near_duplicate_threshold,
+)
 
 # ── Finnhub config ───────────────────────────────────────────────────────────
 _FINNHUB_BASE = "https://finnhub.io/api/v1"
@@ -60,8 +72,13 @@ If no specific ticker is mentioned, use the most relevant broad market indicator
 Keep each field concise and actionable. Max 2 sectors in affected_sectors.
 """
 
+_CALL_SITE = "analyze_article"
+_PRIMING_REPLY = "Ready. Send me a news article to analyze."
+# Resent with every call; reported by the token accounting prefix report
+_PREFIX_TOKENS = estimate_tokens(_SYSTEM_PROMPT, _PRIMING_REPLY)
+
 
-async def fetch_finnhub_news(category: str = "general", limit: int = 15) -> list[dict]:
+async def fetch_finnhub_news(category: str = "general", limit: int = 15, min_id: int | None = None) -> list[dict]:
     """
     Fetch latest market news from the Finnhub API.
 
@@ -73,37 +90,78 @@ async def fetch_finnhub_news(category: str = "general", limit: int = 15) -> list
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                f"{_FINNHUB_BASE}/news",
-                params={"category": category, "token": _FINNHUB_KEY},
-            )
-            resp.raise_for_status()
-            articles = resp.json()
-
-            # Finnhub returns newest first; take top `limit`
-            return articles[:limit] if isinstance(articles, list) else []
-
+        return await fetch_finnhub_news_strict(category, limit, min_id)
     except Exception as e:
         print(f"[News Intelligence] Finnhub fetch error: {e}")
         return []
 
 
+async def fetch_finnhub_news_strict(category: str = "general", limit: int = 15, min_id: int | None = None) -> list[dict]:
+    """
+    Like ``fetch_finnhub_news`` but raises on upstream errors.
+
+    With ``min_id`` Finnhub only returns articles newer than that id.
+    Used by the ingestion loop, which tracks errors per category.
+    """
+    if not _FINNHUB_KEY:
+        return []
+
+    params = {"category": category, "token": _FINNHUB_KEY}
+    if min_id:
+        params["minId"] = min_id
+
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        resp = await client.get(f"{_FINNHUB_BASE}/news", params=params)
+        resp.raise_for_status()
+        articles = resp.json()
+
+        # Finnhub returns newest first; take top `limit`
+        return articles[:limit] if isinstance(articles, list) else []
+
+
 def _article_hash(article: dict) -> str:
     """Create a stable hash for an article to use as cache key."""
     key = f"{article.get('id', '')}-{article.get('headline', '')}"
     return hashlib.md5(key.encode()).hexdigest()
 
 
-async def analyze_article(article: dict) -> dict:
+def article_key(article: dict) -> str:
+    """Stable identity of an article (its analysis cache key)."""
+    return _article_hash(article)
+
+
+def near_duplicate_of(article: dict) -> str | None:
+    """Key of a recent article telling the same story, or None if original."""
+    text = f"{article.get('headline', '')} {article.get('summary', '')}"
+    return _near_duplicates.original_of(_article_hash(article), minhash(text))
+
+
+async def analyze_article(article: dict, priority: Priority = Priority.BACKGROUND) -> dict:
     """
     Use Gemini to analyze a Finnhub news article and produce an alert dict.
 
-    Results are cached by article hash so repeated calls are free.
+    Results are cached by article hash in the shared state backend, so each
+    article is analyzed once per host rather than once per worker.
     """
+    state = get_shared_state()
     cache_key = _article_hash(article)
-    if cache_key in _analysis_cache:
-        return _analysis_cache[cache_key]
+    cached = await state.get(_ANALYSIS_NAMESPACE, cache_key)
+    if cached is not None:
+        return cached
+
+    original_key = near_duplicate_of(article)
+    if original_key is not None:
+        # Syndicated / reworded copy: reuse the original's analysis
+        cached = await state.get(_ANALYSIS_NAMESPACE, original_key)
+        if cached is not None:
+            await state.set(_ANALYSIS_NAMESPACE, cache_key, cached, ttl=_ANALYSIS_TTL)
+            return cached
+
+    if not await state.add_if_absent(_CLAIM_NAMESPACE, cache_key, ttl=_CLAIM_TTL):
+        # Another worker is already analyzing this article — wait for it
+        cached = await _wait_for_analysis(cache_key)
+        if cached is not None:
+            return cached
 
     headline = article.get("headline", "Financial News Update")
     summary = article.get("summary", "")
@@ -120,13 +178,23 @@ async def analyze_article(article: dict) -> dict:
 Analyze this news and produce your market-impact alert."""
 
     try:
-        response = await _MODEL.generate_content_async(
-            [
-                {"role": "user", "parts": [_SYSTEM_PROMPT]},
-                {"role": "model", "parts": ["Ready. Send me a news article to analyze."]},
-                {"role": "user", "parts": [user_prompt]},
-            ]
-        )
+        max_output = _GENERATION_CONFIG["max_output_tokens"]
+        prompt_tokens = _PREFIX_TOKENS + estimate_tokens(user_prompt)
+        model = get_model(_MODEL_NAME, _GENERATION_CONFIG)
+        with admit(_CALL_SITE, _MODEL_NAME, prompt_tokens, max_output) as reservation:
+            allowed = reservation.max_output_tokens
+            overrides = {"max_output_tokens": allowed} if allowed < max_output else None
+            async with get_dispatcher().slot(priority):
+                with reservation.attempt():
+                    response = await model.generate_content_async(
+                        [
+                            {"role": "user", "parts": [_SYSTEM_PROMPT]},
+                            {"role": "model", "parts": [_PRIMING_REPLY]},
+                            {"role": "user", "parts": [user_prompt]},
+                        ],
+                        generation_config=overrides,
+                    )
+            reservation.record(response, _PREFIX_TOKENS)
         result = json.loads(response.text)
 
         # Validate required keys
@@ -138,14 +206,30 @@ Analyze this news and produce your market-impact alert."""
         if result["severity"] not in ("critical", "high", "medium"):
             result["severity"] = "medium"
 
+    except TokenBudgetExceeded as e:
+        # Don't cache a budget fallback; a later request may afford the call
+        print(f"[News Intelligence] {e} — using fallback")
+        return _fallback_analysis(headline, related)
     except Exception as e:
         print(f"[News Intelligence] Gemini analysis error: {e}")
         result = _fallback_analysis(headline, related)
 
-    _analysis_cache[cache_key] = result
+    await state.set(_ANALYSIS_NAMESPACE, cache_key, result, ttl=_ANALYSIS_TTL)
     return result
 
 
+async def _wait_for_analysis(cache_key: str) -> dict | None:
+    """Poll the shared cache until the claiming worker stores its result."""
+    state = get_shared_state()
+    deadline = asyncio.get_running_loop().time() + _CLAIM_TTL
+    while asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(_CLAIM_POLL_INTERVAL)
+        cached = await state.get(_ANALYSIS_NAMESPACE, cache_key)
+        if cached is not None:
+            return cached
+    return None
+
+
 def _fallback_analysis(headline: str, related: str) -> dict:
     """Deterministic fallback when Gemini is unavailable."""
     return {
@@ -157,6 +241,15 @@ def _fallback_analysis(headline: str, related: str) -> dict:
     }
 
 
+def alert_id(article: dict) -> str:
+    """Stable alert id: the same article keeps it across refreshes (and cursors stay valid)."""
+    if article.get("id"):
+        name = f"finnhub:{article['id']}"
+    else:
+        name = article.get("url") or article_key(article)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
 def build_live_alert(article: dict, analysis: dict) -> dict:
     """Assemble a full NewsAlert dict from a Finnhub article + Gemini analysis."""
     # Convert Finnhub UNIX timestamp to ISO string
@@ -167,7 +260,7 @@ def build_live_alert(article: dict, analysis: dict) -> dict:
         timestamp = datetime.now(timezone.utc).isoformat()
 
     return {
-        "id": str(uuid.uuid4()),
+        "id": alert_id(article),
         "severity": analysis["severity"],
         "headline": article.get("headline", "Financial Update"),
         "impact_summary": analysis["impact_summary"],
@@ -210,7 +303,7 @@ def build_alert_from_scenario(
 ) -> dict:
     """Fallback: build an alert from scenario data."""
     return {
-        "id": str(uuid.uuid4()),
+        "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"scenario:{scenario_slug}")),
         "severity": analysis["severity"],
         "headline": headline,
         "impact_summary": analysis["impact_summary"],
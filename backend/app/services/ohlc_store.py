@@ -0,0 +1,158 @@
+"""Memory-mapped columnar store for historical OHLC bars.
+
+One file holds every symbol:
+
+    header   8-byte magic, uint64 row count, uint64 index length
+    index    JSON ``{"symbols": {symbol: [first_row, row_count]}}``, padded
+             to 8 bytes
+    columns  time (int64 UNIX seconds), open, high, low, close, volume
+             (float64), each ``row_count`` values long
+
+Rows of a symbol are contiguous and sorted by time, so a date range is two
+``searchsorted`` calls over a zero-copy NumPy view. The file is mapped
+read-only, so every worker on a host shares the same page-cache pages
+instead of loading its own copy. Writers build a new file and rename it
+into place; readers pick it up on their next lookup.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.records import BarSeries
+
+_MAGIC = b"TQOHLC1\0"
+_HEADER = struct.Struct("<8sQQ")
+COLUMNS: tuple[str, ...] = ("time", "open", "high", "low", "close", "volume")
+_DTYPES = {"time": np.int64}  # everything else is float64
+
+_DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "ohlc" / "ohlc.bin"
+
+
+def _dtype(column: str):
+    return _DTYPES.get(column, np.float64)
+
+
+# ── Writing ──────────────────────────────────────────────────────────────────
+
+def write_store(path: Path, series: dict[str, dict[str, np.ndarray]]) -> int:
+    """Write ``{symbol: {column: values}}`` as a new store file. Returns rows.
+
+    Each symbol's rows are sorted by time; duplicate timestamps keep the
+    last value.
+    """
+    symbols: dict[str, list[int]] = {}
+    chunks: dict[str, list[np.ndarray]] = {c: [] for c in COLUMNS}
+    rows = 0
+    for symbol in sorted(series):
+        cols = series[symbol]
+        times = np.asarray(cols["time"], dtype=np.int64)
+        # Reverse-then-unique keeps the last occurrence of each timestamp
+        _, last = np.unique(times[::-1], return_index=True)
+        order = len(times) - 1 - last
+        symbols[symbol] = [rows, len(order)]
+        rows += len(order)
+        for column in COLUMNS:
+            values = cols.get(column)
+            if values is None:
+                values = np.zeros(len(times))
+            chunks[column].append(np.asarray(values, dtype=_dtype(column))[order])
+
+    index = json.dumps({"symbols": symbols}, separators=(",", ":")).encode()
+    index += b" " * (-len(index) % 8)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, rows, len(index)))
+        f.write(index)
+        for column in COLUMNS:
+            for chunk in chunks[column]:
+                f.write(chunk.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return rows
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+class OHLCStore:
+    """Read-only, memory-mapped view of a store file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._inode: Optional[int] = None
+        self._buf: Optional[mmap.mmap] = None
+        self._symbols: dict[str, list[int]] = {}
+        self._columns: dict[str, np.ndarray] = {}
+
+    def _refresh(self) -> None:
+        """(Re)map the file if it was replaced since the last lookup."""
+        try:
+            inode = self.path.stat().st_ino
+        except FileNotFoundError:
+            raise FileNotFoundError(f"OHLC store not found at {self.path} — run `python -m app.tools.ohlc ingest`")
+        if inode == self._inode:
+            return
+
+        with open(self.path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, index_len = _HEADER.unpack_from(buf)
+        if magic != _MAGIC:
+            buf.close()
+            raise ValueError(f"{self.path} is not an OHLC store")
+
+        offset = _HEADER.size
+        symbols = json.loads(buf[offset:offset + index_len])["symbols"]
+        offset += index_len
+        columns = {}
+        for column in COLUMNS:
+            columns[column] = np.frombuffer(buf, dtype=_dtype(column), count=rows, offset=offset)
+            offset += rows * 8
+
+        # Old views keep the previous mapping alive until they are dropped
+        self._inode, self._buf, self._symbols, self._columns = inode, buf, symbols, columns
+
+    def symbols(self) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._symbols)
+
+    def columns(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> dict[str, np.ndarray]:
+        """Zero-copy column views for ``symbol`` with ``start <= time < end``."""
+        with self._lock:
+            self._refresh()
+            if symbol not in self._symbols:
+                raise KeyError(f"Symbol '{symbol}' not in OHLC store")
+            first, count = self._symbols[symbol]
+            columns = {c: v[first:first + count] for c, v in self._columns.items()}
+
+        times = columns["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, side="left"))
+        return {c: v[lo:hi] for c, v in columns.items()}
+
+    def series(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> BarSeries:
+        """Bars for ``symbol`` with ``start <= time < end``, as zero-copy columns."""
+        return BarSeries.from_columns(self.columns(symbol, start, end))
+
+    def bars(self, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> list[dict]:
+        """Chart-ready bar dicts for ``symbol`` with ``start <= time < end``."""
+        return self.series(symbol, start, end).to_dicts()
+
+
+@lru_cache()
+def get_ohlc_store() -> OHLCStore:
+    """Process-wide store at ``OHLC_STORE_PATH``."""
+    path = get_settings().ohlc_store_path
+    return OHLCStore(Path(path) if path else _DEFAULT_PATH)
@@ -0,0 +1,165 @@
+"""Community prediction statistics ("62% of players predicted DOWN").
+
+Every worker process is one shard. Recording a prediction bumps a local
+pending counter: a dict update on the event loop, with no locks and no
+I/O. A flusher task pushes the pending deltas every
+``PREDICTION_STATS_FLUSH_SECONDS`` to ``StatsStore``, an on-disk SQLite
+file (``PREDICTION_STATS_PATH``) that every worker on the host shares and
+that survives restarts. A flush is one transaction that adds the deltas
+and reads back every scenario's totals.
+
+``stats()`` combines the totals read at the last flush with this worker's
+unflushed counts. It is O(1), never waits on storage, and includes the
+caller's own prediction right away; the reveal response and the stats
+endpoint both use it, so only the flusher touches SQLite. Other workers'
+predictions show up after at most one flush interval.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+
+_DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "prediction_stats.db"
+_FIELDS = ("up", "down", "correct")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenario_stats (
+    slug    TEXT PRIMARY KEY,
+    up      INTEGER NOT NULL DEFAULT 0,
+    down    INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class StatsStore:
+    """Durable per-scenario counters in a WAL-mode SQLite file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _run(self, fn, *args):
+        """Run ``fn(conn, *args)`` in a worker thread, serialised per process."""
+        def call():
+            with self._lock:
+                return fn(self._conn, *args)
+        return asyncio.to_thread(call)
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, rows: list[tuple[str, int, int, int]]) -> dict[str, int]:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO scenario_stats (slug, up, down, correct) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (slug) DO UPDATE SET up = up + excluded.up, "
+                "down = down + excluded.down, correct = correct + excluded.correct",
+                rows,
+            )
+            totals = conn.execute("SELECT slug, up, down, correct FROM scenario_stats").fetchall()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return {f"{slug}:{field}": count for slug, *counts in totals for field, count in zip(_FIELDS, counts)}
+
+    async def add(self, deltas: dict[str, int]) -> dict[str, int]:
+        """Add ``"slug:field"`` deltas and return every scenario's totals."""
+        by_slug: dict[str, list[int]] = {}
+        for name, delta in deltas.items():
+            slug, field = name.rsplit(":", 1)
+            by_slug.setdefault(slug, [0, 0, 0])[_FIELDS.index(field)] += delta
+        return await self._run(self._add, [(slug, *counts) for slug, counts in by_slug.items()])
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _summary(up: int, down: int, correct: int) -> dict:
+    total = up + down
+
+    def pct(n: int) -> float:
+        return round(100 * n / total, 1) if total else 0.0
+
+    return {
+        "total_predictions": total,
+        "up": up,
+        "down": down,
+        "correct": correct,
+        "pct_up": pct(up),
+        "pct_down": pct(down),
+        "pct_correct": pct(correct),
+    }
+
+
+class PredictionStats:
+    """Per-scenario UP/DOWN/correct counters, flushed periodically to ``store``."""
+
+    def __init__(self, store: StatsStore, flush_seconds: float = 5.0) -> None:
+        self.store = store
+        self.flush_seconds = flush_seconds
+        self._totals: dict[str, int] = {}   # "slug:field" → stored count, as of the last flush
+        self._pending: dict[str, int] = {}  # "slug:field" → not yet flushed (this worker)
+        self._flushing: dict[str, int] = {}  # deltas of the flush in progress
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, slug: str, prediction: str, correct: bool) -> None:
+        """Count one prediction for ``slug``."""
+        field = f"{slug}:{'up' if prediction == 'UP' else 'down'}"
+        self._pending[field] = self._pending.get(field, 0) + 1
+        if correct:
+            self._pending[f"{slug}:correct"] = self._pending.get(f"{slug}:correct", 0) + 1
+
+    def stats(self, slug: str) -> dict:
+        """Counts and percentages for ``slug`` from memory."""
+        return _summary(*(
+            sum(counts.get(f"{slug}:{f}", 0) for counts in (self._totals, self._flushing, self._pending))
+            for f in _FIELDS
+        ))
+
+    # ── Flushing ─────────────────────────────────────────────────────────────
+
+    async def flush(self) -> None:
+        """Push pending deltas and refresh the totals in one transaction."""
+        self._flushing, self._pending = self._pending, {}
+        try:
+            self._totals = await self.store.add(self._flushing)
+        except Exception as e:
+            print(f"[Prediction Stats] Flush failed, retrying next interval: {e}")
+            for field, count in self._flushing.items():
+                self._pending[field] = self._pending.get(field, 0) + count
+        finally:
+            self._flushing = {}
+
+    async def _run(self) -> None:
+        while True:
+            await self.flush()
+            await asyncio.sleep(self.flush_seconds)
+
+    def start(self) -> None:
+        """Start the flusher task if it isn't running yet."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and push whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+@lru_cache()
+def get_prediction_stats() -> PredictionStats:
+    cfg = get_settings()
+    path = Path(cfg.prediction_stats_path) if cfg.prediction_stats_path else _DEFAULT_PATH
+    return PredictionStats(StatsStore(path), cfg.prediction_stats_flush_seconds)
@@ -0,0 +1,158 @@
+"""Compact in-memory representations of alerts and OHLC bars.
+
+Alerts and bars used to be held as dicts (plus a Pydantic copy per object).
+Once alert history and long charts stay resident, per-object overhead
+outweighs the data itself:
+
+- ``AlertRecord`` is a slotted object. It has no per-instance ``__dict__``,
+  its low-cardinality strings (severity, sectors, source, asset) are
+  interned so every alert shares one copy, and the timestamp is parsed once.
+- ``BarSeries`` stores bars column-wise in numpy arrays (int64 times,
+  float64 prices): 40 bytes a bar instead of a dict with five boxed values.
+  Slices are views, so pre/post windows of a chart cost nothing.
+
+Both convert to plain dicts (for the API schema models) only at the
+response boundary. ``python -m app.tools.memory_bench`` measures the
+difference.
+"""
+
+import sys
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+# ── Alerts ───────────────────────────────────────────────────────────────────
+
+class AlertRecord:
+    """One alert with the fields of ``NewsAlert``."""
+
+    __slots__ = (
+        "id", "severity", "headline", "impact_summary", "affected_sectors",
+        "recommended_action", "asset_name", "source", "url", "image_url",
+        "timestamp", "related_scenarios", "additional_sources", "ts",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        severity: str,
+        headline: str,
+        impact_summary: str,
+        affected_sectors: Iterable[str],
+        recommended_action: str,
+        asset_name: str,
+        source: str,
+        url: str,
+        timestamp: str,
+        image_url: Optional[str] = None,
+        related_scenarios: Iterable[dict] = (),
+        additional_sources: Iterable[dict] = (),
+    ) -> None:
+        self.id = id
+        self.severity = sys.intern(severity)
+        self.headline = headline
+        self.impact_summary = impact_summary
+        self.affected_sectors = tuple(sys.intern(s) for s in affected_sectors)
+        self.recommended_action = recommended_action
+        self.asset_name = _intern(asset_name)
+        self.source = _intern(source)
+        self.url = url
+        self.image_url = image_url
+        self.timestamp = timestamp
+        self.related_scenarios = tuple(related_scenarios)
+        self.additional_sources = tuple(additional_sources)
+        try:
+            self.ts = datetime.fromisoformat(timestamp).timestamp()
+        except (TypeError, ValueError):
+            self.ts = 0.0
+
+    @classmethod
+    def from_dict(cls, alert: dict) -> "AlertRecord":
+        return cls(
+            id=alert["id"],
+            severity=alert["severity"],
+            headline=alert["headline"],
+            impact_summary=alert["impact_summary"],
+            affected_sectors=alert.get("affected_sectors", ()),
+            recommended_action=alert["recommended_action"],
+            asset_name=alert.get("asset_name", ""),
+            source=alert.get("source", ""),
+            url=alert.get("url", ""),
+            timestamp=alert.get("timestamp", ""),
+            image_url=alert.get("image_url"),
+            related_scenarios=alert.get("related_scenarios", ()),
+            additional_sources=alert.get("additional_sources", ()),
+        )
+
+    def as_dict(self) -> dict:
+        """The alert as a ``NewsAlert``-shaped dict (fresh lists, safe to mutate)."""
+        return {
+            "id": self.id,
+            "severity": self.severity,
+            "headline": self.headline,
+            "impact_summary": self.impact_summary,
+            "affected_sectors": list(self.affected_sectors),
+            "recommended_action": self.recommended_action,
+            "asset_name": self.asset_name,
+            "source": self.source,
+            "url": self.url,
+            "image_url": self.image_url,
+            "timestamp": self.timestamp,
+            "related_scenarios": list(self.related_scenarios),
+            "additional_sources": list(self.additional_sources),
+        }
+
+
+# ── Bars ─────────────────────────────────────────────────────────────────────
+
+BAR_FIELDS: tuple[str, ...] = ("time", "open", "high", "low", "close")
+
+
+class BarSeries:
+    """Time-ordered OHLC bars as parallel numpy columns."""
+
+    __slots__ = BAR_FIELDS
+
+    def __init__(self, time, open, high, low, close) -> None:
+        self.time = np.asarray(time, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[dict]) -> "BarSeries":
+        bars = list(bars)
+        return cls(*([bar[field] for bar in bars] for field in BAR_FIELDS))
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, np.ndarray]) -> "BarSeries":
+        """Wrap column arrays (e.g. ``OHLCStore.columns``) without copying."""
+        return cls(*(columns[field] for field in BAR_FIELDS))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[dict, "BarSeries"]:
+        if isinstance(index, slice):
+            return BarSeries(*(getattr(self, field)[index] for field in BAR_FIELDS))
+        return {field: getattr(self, field)[index].item() for field in BAR_FIELDS}
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.to_dicts())
+
+    def take(self, positions) -> "BarSeries":
+        """Bars at ``positions`` (a copy)."""
+        positions = np.asarray(positions, dtype=np.intp)
+        return BarSeries(*(getattr(self, field)[positions] for field in BAR_FIELDS))
+
+    def to_dicts(self) -> list[dict]:
+        """Chart-ready bar dicts, for the response boundary."""
+        columns = [getattr(self, field).tolist() for field in BAR_FIELDS]
+        return [dict(zip(BAR_FIELDS, row)) for row in zip(*columns)]
@@ -0,0 +1,462 @@
+"""Postgres repository layer for the Supabase tables.
+
+``supabase/schema.sql`` defines ``profiles``, ``scenarios``, ``predictions``
+and ``learning_progress``. This module talks to them directly over the
+Postgres protocol (asyncpg) instead of the REST API:
+
+- One connection pool per worker (``DATABASE_POOL_MIN``/``MAX``). Queries
+  are fixed SQL texts, so asyncpg prepares each statement once per
+  connection and reuses it. Set ``DATABASE_STATEMENT_CACHE_SIZE=0`` when
+  connecting through Supabase's transaction-mode pooler, which can't keep
+  prepared statements.
+- Bulk writes send whole batches as arrays and upsert them with a single
+  ``INSERT ... SELECT FROM unnest(...) ON CONFLICT DO UPDATE``.
+- Hot reads (scenario metadata) go through a per-worker read-through cache.
+  Concurrent misses for a key share one query. A worker's own writes
+  invalidate its entries; other workers see them once their TTL expires.
+
+asyncpg is only imported when the pool is first opened. With no
+``DATABASE_URL`` every repository serves the same calls from per-worker
+memory instead, starting from the bundled scenario catalog, so routes use
+one code path either way.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from app.config import get_settings
+from app.data.scenario_data import SCENARIOS
+from app.services.singleflight import SingleFlight
+
+
+class DatabaseUnavailable(Exception):
+    """No database is configured, or asyncpg isn't installed."""
+
+
+# ── Read-through cache ───────────────────────────────────────────────────────
+
+class ReadThroughCache:
+    """TTL cache in front of a loader; concurrent misses share one load."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._flights = SingleFlight()
+        self._generation = 0  # bumped by invalidate() so in-flight loads aren't stored
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return await self._flights.do(key, lambda: self._load(key, load))
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        value = await load()
+        if generation != self._generation:
+            return value
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when ``key`` is None."""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# ── Connection pool ──────────────────────────────────────────────────────────
+
+async def _init_connection(conn) -> None:
+    # Read jsonb columns (ai_explanation) as Python objects instead of strings
+    await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+class Database:
+    """Lazily opened asyncpg pool for ``DATABASE_URL``."""
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, statement_cache_size: int = 100) -> None:
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.statement_cache_size = statement_cache_size
+        self._pool = None
+        self._opening = SingleFlight()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.dsn)
+
+    async def pool(self):
+        if self._pool is None:
+            await self._opening.do("pool", self._open)
+        return self._pool
+
+    async def _open(self) -> None:
+        if self._pool is not None:
+            return
+        if not self.dsn:
+            raise DatabaseUnavailable("DATABASE_URL is not set")
+        try:
+            import asyncpg
+        except ImportError:
+            raise DatabaseUnavailable("The repository layer needs asyncpg: pip install asyncpg")
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            statement_cache_size=self.statement_cache_size,
+            init=_init_connection,
+        )
+        print(f"[Database] Pool open ({self.min_size}-{self.max_size} connections)")
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def fetch(self, sql: str, *args) -> list[dict]:
+        pool = await self.pool()
+        return [dict(row) for row in await pool.fetch(sql, *args)]
+
+    async def fetchrow(self, sql: str, *args) -> Optional[dict]:
+        pool = await self.pool()
+        row = await pool.fetchrow(sql, *args)
+        return dict(row) if row is not None else None
+
+    async def execute(self, sql: str, *args) -> str:
+        pool = await self.pool()
+        return await pool.execute(sql, *args)
+
+
+# ── Scenarios ────────────────────────────────────────────────────────────────
+
+_SCENARIO_COLUMNS = (
+    "slug", "title", "description", "asset_name", "news_headline", "news_body",
+    "difficulty", "actual_outcome", "xp_reward", "chart_days", "reveal_days",
+)
+_SCENARIO_TYPES = (
+    "text", "text", "text", "text", "text", "text",
+    "text", "text", "int", "int", "int",
+)
+
+_SELECT_SCENARIO = f"SELECT id, {', '.join(_SCENARIO_COLUMNS)} FROM public.scenarios WHERE slug = $1"
+_SELECT_SCENARIOS = f"SELECT id, {', '.join(_SCENARIO_COLUMNS)} FROM public.scenarios ORDER BY created_at"
+_UPSERT_SCENARIOS = f"""
+    INSERT INTO public.scenarios ({', '.join(_SCENARIO_COLUMNS)})
+    SELECT * FROM unnest({', '.join(f'${i}::{t}[]' for i, t in enumerate(_SCENARIO_TYPES, 1))})
+    ON CONFLICT (slug) DO UPDATE SET
+        {', '.join(f'{c} = EXCLUDED.{c}' for c in _SCENARIO_COLUMNS if c != 'slug')}
+"""
+
+
+class ScenarioRepository:
+    """Scenario catalog rows, read through a per-worker cache.
+
+    ``catalog`` is the bundled scenario registry: the whole store when no
+    database is configured, and otherwise the source of the mock ML fields
+    (``ml_prediction``, ``ml_confidence``) that the table has no columns for.
+    """
+
+    def __init__(self, db: Database, cache: ReadThroughCache, catalog: dict[str, dict]) -> None:
+        self.db = db
+        self.cache = cache
+        self.catalog = catalog
+
+    def _with_catalog(self, row: dict) -> dict:
+        return {**self.catalog.get(row["slug"], {}), **row}
+
+    async def get(self, slug: str) -> Optional[dict]:
+        if not self.db.configured:
+            return self.catalog.get(slug)
+        row = await self.cache.get(("scenario", slug), lambda: self.db.fetchrow(_SELECT_SCENARIO, slug))
+        return self._with_catalog(row) if row is not None else None
+
+    async def all(self) -> list[dict]:
+        if not self.db.configured:
+            return list(self.catalog.values())
+        rows = await self.cache.get(("scenarios",), lambda: self.db.fetch(_SELECT_SCENARIOS))
+        return [self._with_catalog(row) for row in rows]
+
+    async def upsert_many(self, scenarios: list[dict]) -> None:
+        """Insert or update scenarios by slug in one statement."""
+        if not scenarios:
+            return
+        if not self.db.configured:
+            for scenario in scenarios:
+                self.catalog[scenario["slug"]] = {**self.catalog.get(scenario["slug"], {}), **scenario}
+            return
+        columns = [[s.get(c) for s in scenarios] for c in _SCENARIO_COLUMNS]
+        await self.db.execute(_UPSERT_SCENARIOS, *columns)
+        self.cache.invalidate()
+
+
+# ── Predictions ──────────────────────────────────────────────────────────────
+
+# Data-modifying CTEs run to completion in one statement, so the XP award
+# sees exactly the rows this call inserted, even under concurrent submits.
+_INSERT_PREDICTIONS = """
+    WITH inserted AS (
+        INSERT INTO public.predictions (
+            user_id, scenario_id, user_prediction, ml_prediction, actual_outcome,
+            is_user_correct, is_ml_correct, xp_earned, ai_explanation
+        )
+        SELECT p.user_id, s.id, p.user_prediction, p.ml_prediction, p.actual_outcome,
+               p.is_user_correct, p.is_ml_correct, p.xp_earned, p.ai_explanation::jsonb
+        FROM unnest($1::uuid[], $2::text[], $3::text[], $4::text[], $5::text[],
+                    $6::bool[], $7::bool[], $8::int[], $9::text[])
+             AS p(user_id, slug, user_prediction, ml_prediction, actual_outcome,
+                  is_user_correct, is_ml_correct, xp_earned, ai_explanation)
+        JOIN public.scenarios s ON s.slug = p.slug
+        ON CONFLICT (user_id, scenario_id) DO NOTHING
+        RETURNING user_id, scenario_id, xp_earned
+    ), awarded AS (
+        UPDATE public.profiles AS pr SET xp = pr.xp + d.xp, updated_at = now()
+        FROM (SELECT user_id, sum(xp_earned)::int AS xp FROM inserted GROUP BY user_id) AS d
+        WHERE pr.id = d.user_id
+    )
+    SELECT i.user_id::text AS user_id, s.slug AS scenario_slug
+    FROM inserted i JOIN public.scenarios s ON s.id = i.scenario_id
+"""
+_SELECT_PREDICTION = """
+    SELECT s.slug AS scenario_slug, p.user_prediction, p.ml_prediction, p.actual_outcome,
+           p.is_user_correct, p.is_ml_correct, p.xp_earned, p.ai_explanation, p.created_at
+    FROM public.predictions p JOIN public.scenarios s ON s.id = p.scenario_id
+    WHERE p.user_id = $1 AND s.slug = $2
+"""
+_SELECT_USER_PREDICTIONS = """
+    SELECT s.slug AS scenario_slug, p.user_prediction, p.ml_prediction, p.actual_outcome,
+           p.is_user_correct, p.is_ml_correct, p.xp_earned, p.ai_explanation, p.created_at
+    FROM public.predictions p JOIN public.scenarios s ON s.id = p.scenario_id
+    WHERE p.user_id = $1
+    ORDER BY p.created_at DESC
+    LIMIT $2
+"""
+_SET_EXPLANATION = """
+    UPDATE public.predictions AS p SET ai_explanation = $3::jsonb
+    FROM public.scenarios s
+    WHERE s.id = p.scenario_id AND p.user_id = $1 AND s.slug = $2 AND p.ai_explanation IS NULL
+"""
+_PREDICTION_FIELDS = (
+    "user_id", "scenario_slug", "user_prediction", "ml_prediction", "actual_outcome",
+    "is_user_correct", "is_ml_correct", "xp_earned", "ai_explanation",
+)
+
+
+class PredictionRepository:
+    """One prediction per (user, scenario); rows name scenarios by slug.
+
+    A prediction is final once stored: later submissions for the same
+    scenario are ignored, so an answer can't be changed after the reveal.
+    """
+
+    def __init__(self, db: Database, profiles: "ProfileRepository") -> None:
+        self.db = db
+        self.profiles = profiles
+        self._memory: dict[str, dict[str, dict]] = {}  # user → slug → row, without a database
+
+    async def insert_many(self, predictions: list[dict]) -> set[tuple[str, str]]:
+        """Store first predictions and award their ``xp_earned`` in one statement.
+
+        Returns the ``(user_id, slug)`` pairs actually inserted. Rows that
+        already exist, or name slugs missing from ``scenarios``, are skipped
+        and earn nothing.
+        """
+        if not predictions:
+            return set()
+        if not self.db.configured:
+            now = datetime.now(timezone.utc)
+            inserted: set[tuple[str, str]] = set()
+            awards: dict[str, int] = {}
+            for p in predictions:
+                rows = self._memory.setdefault(p["user_id"], {})
+                if p["scenario_slug"] in rows:
+                    continue
+                rows[p["scenario_slug"]] = {
+                    **{f: p.get(f) for f in _PREDICTION_FIELDS if f != "user_id"},
+                    "created_at": now,
+                }
+                inserted.add((p["user_id"], p["scenario_slug"]))
+                awards[p["user_id"]] = awards.get(p["user_id"], 0) + (p.get("xp_earned") or 0)
+            await self.profiles.add_xp(awards)
+            return inserted
+        columns = [[p.get(f) for p in predictions] for f in _PREDICTION_FIELDS]
+        # Explanations travel as JSON text and are cast to jsonb in the query
+        columns[-1] = [json.dumps(v) if v is not None else None for v in columns[-1]]
+        rows = await self.db.fetch(_INSERT_PREDICTIONS, *columns)
+        return {(row["user_id"], row["scenario_slug"]) for row in rows}
+
+    async def set_explanation(self, user_id: str, slug: str, explanation: dict) -> None:
+        """Fill in the Game Master analysis of a prediction stored without one."""
+        if not self.db.configured:
+            row = self._memory.get(user_id, {}).get(slug)
+            if row is not None and row.get("ai_explanation") is None:
+                row["ai_explanation"] = explanation
+            return
+        await self.db.execute(_SET_EXPLANATION, user_id, slug, explanation)  # jsonb codec encodes
+
+    async def get(self, user_id: str, slug: str) -> Optional[dict]:
+        if not self.db.configured:
+            return self._memory.get(user_id, {}).get(slug)
+        return await self.db.fetchrow(_SELECT_PREDICTION, user_id, slug)
+
+    async def for_user(self, user_id: str, limit: int = 100) -> list[dict]:
+        """A user's predictions, newest first."""
+        if not self.db.configured:
+            rows = sorted(self._memory.get(user_id, {}).values(), key=lambda r: r["created_at"], reverse=True)
+            return rows[:limit]
+        return await self.db.fetch(_SELECT_USER_PREDICTIONS, user_id, limit)
+
+
+# ── Profiles ─────────────────────────────────────────────────────────────────
+
+_SELECT_PROFILE = """
+    SELECT id, username, display_name, avatar_url, xp, level, streak_days
+    FROM public.profiles WHERE id = $1
+"""
+_ADD_XP = """
+    UPDATE public.profiles AS p SET xp = p.xp + d.xp, updated_at = now()
+    FROM unnest($1::uuid[], $2::int[]) AS d(id, xp)
+    WHERE p.id = d.id
+"""
+
+
+class ProfileRepository:
+    """Gamification fields of ``profiles``.
+
+    In Postgres the rows are created on signup. Without a database a
+    profile is created the first time a user earns XP.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+        self._memory: dict[str, dict] = {}
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        if not self.db.configured:
+            profile = self._memory.get(user_id)
+            return dict(profile) if profile is not None else None
+        return await self.db.fetchrow(_SELECT_PROFILE, user_id)
+
+    async def add_xp(self, awards: dict[str, int]) -> None:
+        """Add XP to many users in one statement (``{user_id: xp}``)."""
+        if not awards:
+            return
+        if not self.db.configured:
+            for user_id, xp in awards.items():
+                profile = self._memory.setdefault(user_id, {
+                    "id": user_id,
+                    "username": f"trader_{user_id[:8]}",
+                    "display_name": "New Trader",
+                    "avatar_url": None,
+                    "xp": 0,
+                    "level": 1,
+                    "streak_days": 0,
+                })
+                profile["xp"] += xp
+            return
+        await self.db.execute(_ADD_XP, list(awards), list(awards.values()))
+
+
+# ── Learning progress ────────────────────────────────────────────────────────
+
+_UPSERT_PROGRESS = """
+    INSERT INTO public.learning_progress (user_id, scenario_id, takeaway_read, notes, completed_at)
+    SELECT p.user_id, s.id, p.takeaway_read, p.notes, p.completed_at
+    FROM unnest($1::uuid[], $2::text[], $3::bool[], $4::text[], $5::timestamptz[])
+         AS p(user_id, slug, takeaway_read, notes, completed_at)
+    JOIN public.scenarios s ON s.slug = p.slug
+    ON CONFLICT (user_id, scenario_id) DO UPDATE SET
+        takeaway_read = EXCLUDED.takeaway_read,
+        notes = COALESCE(EXCLUDED.notes, learning_progress.notes),
+        completed_at = COALESCE(EXCLUDED.completed_at, learning_progress.completed_at)
+"""
+_SELECT_USER_PROGRESS = """
+    SELECT s.slug AS scenario_slug, l.takeaway_read, l.notes, l.completed_at
+    FROM public.learning_progress l JOIN public.scenarios s ON s.id = l.scenario_id
+    WHERE l.user_id = $1
+"""
+_PROGRESS_FIELDS = ("user_id", "scenario_slug", "takeaway_read", "notes", "completed_at")
+
+
+class LearningProgressRepository:
+    """One progress row per (user, scenario); rows name scenarios by slug."""
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+        self._memory: dict[str, dict[str, dict]] = {}  # user → slug → row, without a database
+
+    async def upsert_many(self, progress: list[dict]) -> None:
+        if not progress:
+            return
+        if not self.db.configured:
+            for p in progress:
+                row = self._memory.setdefault(p["user_id"], {}).setdefault(p["scenario_slug"], {
+                    "scenario_slug": p["scenario_slug"], "notes": None, "completed_at": None,
+                })
+                row["takeaway_read"] = bool(p.get("takeaway_read"))
+                # Same COALESCE semantics as the upsert
+                for field in ("notes", "completed_at"):
+                    if p.get(field) is not None:
+                        row[field] = p[field]
+            return
+        columns = [[p.get(f) for p in progress] for f in _PROGRESS_FIELDS]
+        columns[2] = [bool(v) for v in columns[2]]
+        await self.db.execute(_UPSERT_PROGRESS, *columns)
+
+    async def for_user(self, user_id: str) -> list[dict]:
+        if not self.db.configured:
+            return list(self._memory.get(user_id, {}).values())
+        return await self.db.fetch(_SELECT_USER_PROGRESS, user_id)
+
+
+# ── Factories ────────────────────────────────────────────────────────────────
+
+@lru_cache()
+def get_database() -> Database:
+    cfg = get_settings()
+    return Database(
+        cfg.database_url,
+        min_size=cfg.database_pool_min,
+        max_size=cfg.database_pool_max,
+        statement_cache_size=cfg.database_statement_cache_size,
+    )
+
+
+@lru_cache()
+def get_scenario_repository() -> ScenarioRepository:
+    return ScenarioRepository(
+        get_database(),
+        ReadThroughCache(get_settings().database_cache_ttl_seconds),
+        SCENARIOS,
+    )
+
+
+@lru_cache()
+def get_prediction_repository() -> PredictionRepository:
+    return PredictionRepository(get_database(), get_profile_repository())
+
+
+@lru_cache()
+def get_profile_repository() -> ProfileRepository:
+    return ProfileRepository(get_database())
+
+
+@lru_cache()
+def get_learning_progress_repository() -> LearningProgressRepository:
+    return LearningProgressRepository(get_database())
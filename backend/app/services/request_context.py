@@ -0,0 +1,88 @@
+"""Per-request context shared with services through a contextvar.
+
+``RequestContextMiddleware`` binds a ``RequestContext`` for every HTTP and
+WebSocket request. Services deep in the call stack (e.g. LLM accounting)
+read it with ``current_request()`` instead of having it threaded through
+every signature. Tasks spawned while handling a request inherit it. Work
+started outside a request (warm-up, pollers) sees ``None``.
+
+Routes declare a latency budget with
+``dependencies=[Depends(latency_budget(seconds))]``. The deadline counts
+from when the request arrived at the middleware, so time spent queued in
+admission control comes out of the budget. Slow downstream calls check
+``remaining_seconds()`` and give up in time to answer.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class RequestContext:
+    """What services may need to know about the request they serve."""
+
+    def __init__(self, scope: Scope, token_budget: int = 0) -> None:
+        self.scope = scope
+        self.token_budget = token_budget  # 0 = unlimited
+        self.tokens_used = 0
+        self.arrived = time.monotonic()
+        self.deadline: Optional[float] = None  # time.monotonic() value
+
+    @property
+    def route(self) -> str:
+        """Route template (e.g. ``/api/scenarios/{slug}/predict``), else the path."""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "")
+
+    @property
+    def tokens_remaining(self) -> Optional[int]:
+        if self.token_budget <= 0:
+            return None
+        return max(0, self.token_budget - self.tokens_used)
+
+
+_current: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current.get()
+
+
+def remaining_seconds() -> Optional[float]:
+    """Time left before the current request's deadline (None = no deadline)."""
+    request = _current.get()
+    if request is None or request.deadline is None:
+        return None
+    return max(0.0, request.deadline - time.monotonic())
+
+
+def latency_budget(seconds: float):
+    """Route dependency that sets the request's deadline ``seconds`` after arrival."""
+    async def _set_deadline() -> None:
+        request = _current.get()
+        if request is not None and seconds > 0:
+            request.deadline = request.arrived + seconds
+    return _set_deadline
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware binding a ``RequestContext`` per request.
+
+    Register it outermost so ``arrived`` is taken before any queueing.
+    """
+
+    def __init__(self, app: ASGIApp, token_budget: int = 0) -> None:
+        self.app = app
+        self.token_budget = token_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _current.set(RequestContext(scope, self.token_budget))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
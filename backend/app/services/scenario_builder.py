@@ -0,0 +1,45 @@
+"""Build scenario charts from historical OHLC around an event date.
+
+A scenario chart is split the same way as the hand-made ones: ``pre_bars``
+bars strictly before the event date (shown before the prediction) and
+``post_bars`` bars from the event date on (the reveal).
+"""
+
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from app.services.ohlc_store import OHLCStore, get_ohlc_store
+
+
+def _event_ts(event_date: str | date) -> int:
+    if isinstance(event_date, str):
+        event_date = date.fromisoformat(event_date)
+    return int(datetime(event_date.year, event_date.month, event_date.day, tzinfo=timezone.utc).timestamp())
+
+
+def build_event_window(
+    symbol: str,
+    event_date: str | date,
+    pre_bars: int = 30,
+    post_bars: int = 5,
+    store: Optional[OHLCStore] = None,
+) -> tuple[list[dict], list[dict]]:
+    """Return ``(pre_event_bars, post_event_bars)`` for ``symbol``.
+
+    Raises ``KeyError`` for unknown symbols and ``ValueError`` when the
+    history around the event is too short.
+    """
+    store = store or get_ohlc_store()
+    times = store.columns(symbol)["time"]
+    split = int(np.searchsorted(times, _event_ts(event_date), side="left"))
+
+    if split < pre_bars or len(times) - split < post_bars:
+        raise ValueError(
+            f"{symbol} has {split} bars before and {len(times) - split} from {event_date}; "
+            f"need {pre_bars} and {post_bars}"
+        )
+
+    window = store.bars(symbol, start=int(times[split - pre_bars]), end=int(times[split + post_bars - 1]) + 1)
+    return window[:pre_bars], window[pre_bars:]
@@ -0,0 +1,113 @@
+"""Hashed TF-IDF similarity index linking news text to scenarios.
+
+Each scenario's text is tokenized into unigrams and bigrams, hashed into a
+fixed number of buckets (no vocabulary to maintain) and stored as a row of
+raw term counts. The count matrix grows geometrically, so adding a
+scenario is amortised O(1) rather than a copy of every existing row. IDF
+weighting and row normalisation are re-derived lazily on the first lookup
+after a change, so a lookup is a single matrix-vector product followed by
+a top-k partition.
+
+A digest of each scenario's indexed text is kept, so callers can pass every
+scenario on each lookup: unchanged ones are skipped, edited ones re-indexed.
+"""
+
+import hashlib
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from app.services.alert_search import tokenize
+
+_DIM = 1 << 14
+_INITIAL_ROWS = 16
+
+
+def _features(text: str) -> np.ndarray:
+    """Hashed unigram + bigram counts of ``text``."""
+    tokens = tokenize(text)
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts = np.zeros(_DIM, dtype=np.float32)
+    if grams:
+        buckets = np.fromiter((zlib.crc32(g.encode()) % _DIM for g in grams), dtype=np.int64, count=len(grams))
+        np.add.at(counts, buckets, 1.0)
+    return counts
+
+
+class ScenarioIndex:
+    """Top-k cosine similarity over hashed TF-IDF scenario vectors."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.slugs: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._digests: dict[str, bytes] = {}  # slug → digest of its indexed text
+        self._counts = np.zeros((0, _DIM), dtype=np.float32)  # rows past len(slugs) are spare
+        self._doc_freq = np.zeros(_DIM, dtype=np.float32)
+        self._idf: np.ndarray | None = None
+        self._matrix: np.ndarray | None = None  # idf-weighted, L2-normalised rows
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self._positions
+
+    def __len__(self) -> int:
+        return len(self.slugs)
+
+    def add(self, slug: str, text: str) -> bool:
+        """Index (or re-index) one scenario. False if ``text`` is already indexed."""
+        digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if self._digests.get(slug) == digest:
+            return False
+        counts = _features(text)
+        with self._lock:
+            position = self._positions.get(slug)
+            if position is None:
+                position = len(self.slugs)
+                if position == len(self._counts):
+                    grown = np.zeros((max(_INITIAL_ROWS, 2 * position), _DIM), dtype=np.float32)
+                    grown[:position] = self._counts
+                    self._counts = grown
+                self._positions[slug] = position
+                self.slugs.append(slug)
+            else:
+                self._doc_freq -= self._counts[position] > 0
+            self._counts[position] = counts
+            self._doc_freq += counts > 0
+            self._digests[slug] = digest
+            self._matrix = None
+        return True
+
+    def _weights(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._matrix is None:
+            n_docs = len(self.slugs)
+            self._idf = (np.log((1 + n_docs) / (1 + self._doc_freq)) + 1).astype(np.float32)
+            weighted = np.log1p(self._counts[:n_docs]) * self._idf
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            self._matrix = weighted / np.maximum(norms, 1e-12)
+        return self._matrix, self._idf
+
+    def match(self, text: str, k: int = 3, min_score: float = 0.05) -> list[tuple[str, float]]:
+        """Scenarios most similar to ``text`` as ``(slug, cosine)`` pairs."""
+        query = np.log1p(_features(text))
+        with self._lock:
+            if not self.slugs or not query.any():
+                return []
+            matrix, idf = self._weights()
+            slugs = self.slugs
+
+        query *= idf
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        scores = matrix @ query
+
+        k = min(k, len(slugs))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(slugs[i], round(float(scores[i]), 4)) for i in top if scores[i] >= min_score]
+
+
+@lru_cache()
+def get_scenario_index() -> ScenarioIndex:
+    """Process-wide scenario similarity index."""
+    return ScenarioIndex()
@@ -0,0 +1,376 @@
+"""Shared state backend — caches, dedup windows, leases, rate limits and alert fan-out.
+
+Every uvicorn worker is its own process, so plain module-level dicts are
+per-worker. This module hides that behind a small async interface with two
+implementations:
+
+- ``InProcessState``: plain dicts, for a single worker or local development.
+- ``SqliteState``: a WAL-mode SQLite file (in ``/dev/shm`` when available)
+  shared by every worker on the host. Pub/sub is an append-only ``events``
+  table that subscribers tail by id.
+
+Pick one with ``SHARED_STATE_BACKEND=memory|sqlite``.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+from app.config import get_settings
+
+# How many events each channel keeps for late subscribers
+_EVENT_RETENTION = 1000
+# How often SQLite subscribers look for new events (seconds)
+_SQLITE_POLL_INTERVAL = 0.5
+
+
+def _spend(tokens: float, elapsed: float, per_minute: float, capacity: float) -> tuple[float, float]:
+    """Refill a token bucket for ``elapsed`` seconds and try to spend one token.
+
+    Returns the new token count and ``0.0`` if one was spent, otherwise the
+    refilled count and the seconds until a token is available.
+    """
+    tokens = min(capacity, tokens + max(0.0, elapsed) * per_minute / 60)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) * 60 / per_minute
+
+
+class SharedState(ABC):
+    """Key/value store with TTLs, dedup, leases, token buckets and channel pub/sub."""
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the stored value, or ``None`` if missing or expired."""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serialisable value, optionally expiring after ``ttl`` seconds."""
+
+    @abstractmethod
+    async def add_if_absent(self, namespace: str, key: str, ttl: Optional[float] = None) -> bool:
+        """Atomically mark ``key`` as seen. Returns ``True`` only for the first caller."""
+
+    @abstractmethod
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lease. Returns ``True`` if ``owner`` holds it."""
+
+    @abstractmethod
+    async def take_token(self, name: str, per_minute: float, capacity: float) -> float:
+        """Spend one token from the named token bucket.
+
+        Returns ``0.0`` if a token was spent, otherwise the seconds until the
+        next one is available (nothing is spent).
+        """
+
+    @abstractmethod
+    async def publish(self, channel: str, message: dict) -> int:
+        """Append a message to ``channel`` and return its monotonic event id."""
+
+    @abstractmethod
+    async def read_events(self, channel: str, after_id: int, limit: int = 100) -> list[tuple[int, dict]]:
+        """Return up to ``limit`` retained events with id greater than ``after_id``."""
+
+    @abstractmethod
+    async def last_event_id(self, channel: str) -> int:
+        """Return the id of the newest event on ``channel`` (0 if none)."""
+
+    @abstractmethod
+    async def wait_for_events(self, channel: str, after_id: int) -> None:
+        """Block until ``channel`` may have events newer than ``after_id``."""
+
+    async def subscribe(self, channel: str, after_id: Optional[int] = None) -> AsyncIterator[tuple[int, dict]]:
+        """Yield ``(event_id, message)`` pairs published after ``after_id``.
+
+        With no ``after_id`` only events published from now on are yielded.
+        """
+        last = await self.last_event_id(channel) if after_id is None else after_id
+        while True:
+            events = await self.read_events(channel, last)
+            if not events:
+                await self.wait_for_events(channel, last)
+                continue
+            for event_id, message in events:
+                last = event_id
+                yield event_id, message
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# In-process backend
+# ══════════════════════════════════════════════════════════════════════════════
+
+class InProcessState(SharedState):
+    """Single-process backend built on plain dicts."""
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[str, str], tuple[Any, Optional[float]]] = {}
+        self._leases: dict[str, tuple[str, float]] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}  # name → (tokens, updated)
+        self._events: dict[str, deque[tuple[int, dict]]] = {}
+        self._signals: dict[str, asyncio.Event] = {}
+        self._next_id = 1
+
+    def _live(self, namespace: str, key: str) -> Optional[tuple[Any, Optional[float]]]:
+        entry = self._values.get((namespace, key))
+        if entry is not None and entry[1] is not None and entry[1] < time.time():
+            del self._values[(namespace, key)]
+            return None
+        return entry
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self._live(namespace, key)
+        return entry[0] if entry else None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        self._values[(namespace, key)] = (value, expires_at)
+
+    async def add_if_absent(self, namespace: str, key: str, ttl: Optional[float] = None) -> bool:
+        if self._live(namespace, key) is not None:
+            return False
+        await self.set(namespace, key, True, ttl)
+        return True
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        holder = self._leases.get(name)
+        if holder is None or holder[0] == owner or holder[1] < now:
+            self._leases[name] = (owner, now + ttl)
+            return True
+        return False
+
+    async def take_token(self, name: str, per_minute: float, capacity: float) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(name, (capacity, now))
+        tokens, wait = _spend(tokens, now - updated, per_minute, capacity)
+        self._buckets[name] = (tokens, now)
+        return wait
+
+    async def publish(self, channel: str, message: dict) -> int:
+        event_id = self._next_id
+        self._next_id += 1
+        self._events.setdefault(channel, deque(maxlen=_EVENT_RETENTION)).append((event_id, message))
+        signal = self._signals.pop(channel, None)
+        if signal is not None:
+            signal.set()
+        return event_id
+
+    async def read_events(self, channel: str, after_id: int, limit: int = 100) -> list[tuple[int, dict]]:
+        events = [e for e in self._events.get(channel, ()) if e[0] > after_id]
+        return events[:limit]
+
+    async def last_event_id(self, channel: str) -> int:
+        events = self._events.get(channel)
+        return events[-1][0] if events else 0
+
+    async def wait_for_events(self, channel: str, after_id: int) -> None:
+        if await self.last_event_id(channel) > after_id:
+            return
+        signal = self._signals.setdefault(channel, asyncio.Event())
+        await signal.wait()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SQLite backend (shared by all workers on one host)
+# ══════════════════════════════════════════════════════════════════════════════
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_channel ON events (channel, id);
+"""
+
+
+def _default_sqlite_path() -> str:
+    """Prefer tmpfs so the file never touches a real disk."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "tradequest-shared-state.db")
+
+
+class SqliteState(SharedState):
+    """Multi-process backend on a single SQLite file in WAL mode."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._publishes = 0
+
+    def _run(self, fn, *args):
+        """Run ``fn(conn, *args)`` in a worker thread, serialised per process."""
+        def call():
+            with self._lock:
+                return fn(self._conn, *args)
+        return asyncio.to_thread(call)
+
+    # ── Key/value ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, namespace: str, key: str) -> Optional[Any]:
+        row = conn.execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ? "
+            "AND (expires_at IS NULL OR expires_at >= ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        return await self._run(self._get, namespace, key)
+
+    @staticmethod
+    def _set(conn: sqlite3.Connection, namespace: str, key: str, value: str, expires_at: Optional[float]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, value, expires_at),
+        )
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        await self._run(self._set, namespace, key, json.dumps(value), expires_at)
+
+    @staticmethod
+    def _add_if_absent(conn: sqlite3.Connection, namespace: str, key: str, expires_at: Optional[float]) -> bool:
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM kv WHERE namespace = ? AND key = ? AND expires_at < ?",
+                (namespace, key, now),
+            )
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, 'true', ?)",
+                (namespace, key, expires_at),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    async def add_if_absent(self, namespace: str, key: str, ttl: Optional[float] = None) -> bool:
+        expires_at = time.time() + ttl if ttl else None
+        return await self._run(self._add_if_absent, namespace, key, expires_at)
+
+    @staticmethod
+    def _acquire_lease(conn: sqlite3.Connection, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        cur = conn.execute(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+            (name, owner, now + ttl, now),
+        )
+        return cur.rowcount == 1
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        return await self._run(self._acquire_lease, name, owner, ttl)
+
+    @staticmethod
+    def _take_token(conn: sqlite3.Connection, name: str, per_minute: float, capacity: float) -> float:
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+            tokens, updated = row or (capacity, now)
+            tokens, wait = _spend(tokens, now - updated, per_minute, capacity)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    async def take_token(self, name: str, per_minute: float, capacity: float) -> float:
+        return await self._run(self._take_token, name, per_minute, capacity)
+
+    # ── Pub/sub ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _publish(conn: sqlite3.Connection, channel: str, payload: str, trim: bool) -> int:
+        cur = conn.execute(
+            "INSERT INTO events (channel, payload, created_at) VALUES (?, ?, ?)",
+            (channel, payload, time.time()),
+        )
+        event_id = cur.lastrowid
+        if trim:
+            # Ids are global across channels: keep this channel's newest N
+            conn.execute(
+                "DELETE FROM events WHERE channel = ? AND id < ("
+                "SELECT id FROM events WHERE channel = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (channel, channel, _EVENT_RETENTION - 1),
+            )
+            conn.execute("DELETE FROM kv WHERE expires_at < ?", (time.time(),))
+        return event_id
+
+    async def publish(self, channel: str, message: dict) -> int:
+        self._publishes += 1
+        trim = self._publishes % 100 == 0
+        return await self._run(self._publish, channel, json.dumps(message), trim)
+
+    @staticmethod
+    def _read_events(conn: sqlite3.Connection, channel: str, after_id: int, limit: int) -> list[tuple[int, dict]]:
+        rows = conn.execute(
+            "SELECT id, payload FROM events WHERE channel = ? AND id > ? ORDER BY id LIMIT ?",
+            (channel, after_id, limit),
+        ).fetchall()
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    async def read_events(self, channel: str, after_id: int, limit: int = 100) -> list[tuple[int, dict]]:
+        return await self._run(self._read_events, channel, after_id, limit)
+
+    @staticmethod
+    def _last_event_id(conn: sqlite3.Connection, channel: str) -> int:
+        row = conn.execute("SELECT MAX(id) FROM events WHERE channel = ?", (channel,)).fetchone()
+        return row[0] or 0
+
+    async def last_event_id(self, channel: str) -> int:
+        return await self._run(self._last_event_id, channel)
+
+    async def wait_for_events(self, channel: str, after_id: int) -> None:
+        await asyncio.sleep(_SQLITE_POLL_INTERVAL)
+
+
+@lru_cache()
+def get_shared_state() -> SharedState:
+    """Process-wide shared state backend selected by ``SHARED_STATE_BACKEND``."""
+    settings = get_settings()
+    if settings.shared_state_backend == "sqlite":
+        return SqliteState(settings.shared_state_path or _default_sqlite_path())
+    if settings.shared_state_backend != "memory":
+        print(f"[Shared State] Unknown backend '{settings.shared_state_backend}' — using in-process state")
+    return InProcessState()
@@ -0,0 +1,51 @@
+"""Monte Carlo "what-if" paths for a scenario's reveal window.
+
+Fits drift and volatility of daily log returns on the pre-event closes and
+draws ``n_paths`` geometric-Brownian-motion continuations of ``horizon``
+days in one NumPy pass. The result summarises the fan of paths as
+percentile bands, the probability of finishing above the last pre-event
+close, and where the actual reveal landed within that distribution.
+"""
+
+import numpy as np
+
+PERCENTILES: tuple[int, ...] = (5, 25, 50, 75, 95)
+
+
+def simulate(
+    pre_close: list[float],
+    actual_post_close: list[float],
+    n_paths: int = 10_000,
+    seed: int = 0,
+) -> dict:
+    """Simulate ``n_paths`` continuations over the actual reveal's horizon."""
+    closes = np.asarray(pre_close, dtype=np.float64)
+    log_returns = np.diff(np.log(closes))
+    drift = float(log_returns.mean())
+    volatility = float(log_returns.std(ddof=1))
+    start = float(closes[-1])
+    horizon = len(actual_post_close)
+
+    rng = np.random.default_rng(seed)
+    steps = drift + volatility * rng.standard_normal((n_paths, horizon))
+    paths = start * np.exp(np.cumsum(steps, axis=1))
+
+    bands = np.percentile(paths, PERCENTILES, axis=0)
+    final = paths[:, -1]
+    actual_close = float(actual_post_close[-1])
+
+    return {
+        "n_paths": n_paths,
+        "seed": seed,
+        "horizon_days": horizon,
+        "start_price": round(start, 6),
+        "drift": round(drift, 6),
+        "volatility": round(volatility, 6),
+        "bands": [
+            {"day": day + 1, **{f"p{p}": round(float(bands[i, day]), 6) for i, p in enumerate(PERCENTILES)}}
+            for day in range(horizon)
+        ],
+        "prob_up": round(float(np.mean(final > start)), 4),
+        "actual_close": actual_close,
+        "actual_percentile": round(float(np.mean(final <= actual_close)) * 100, 2),
+    }
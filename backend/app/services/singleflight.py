@@ -0,0 +1,64 @@
+"""Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight computation
+instead of each running it. The computation runs in its own task, so a
+caller that disconnects (and gets cancelled) never cancels the work the
+others are waiting on. Only when every waiter has gone away is the
+computation itself cancelled.
+
+The task starts in an empty ``contextvars.Context``: it works for every
+waiter, so it must not run as (or charge its LLM usage to) whichever
+request happened to arrive first.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Flight:
+    """One in-flight computation and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one computation."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """True if a computation for ``key`` is currently running."""
+        return key in self._flights
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return ``await fn()``, sharing the call with concurrent callers of ``key``."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(contextvars.Context().run(asyncio.create_task, fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Last interested caller left — nobody needs the result.
+                # Forget it first so a caller arriving now starts afresh
+                # instead of joining a flight that is being cancelled.
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
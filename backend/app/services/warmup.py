@@ -0,0 +1,92 @@
+"""Startup warm-up orchestration and readiness tracking.
+
+The FastAPI lifespan hands this module a set of named warm-up jobs (news
+prefetch, Game Master pre-generation, ...). They run concurrently in the
+background and the worker reports ready once they all finish or the time
+budget runs out, whichever comes first. Jobs still running after the
+budget keep going so their results can fill the caches.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+# ── Readiness state for this worker ──────────────────────────────────────────
+_readiness: dict = {
+    "ready": False,
+    "started_at": None,
+    "finished_at": None,
+    "jobs": {},
+}
+
+_pending: set[asyncio.Task] = set()
+
+
+def readiness() -> dict:
+    """Return a snapshot of this worker's warm-up / readiness state."""
+    return {**_readiness, "jobs": dict(_readiness["jobs"])}
+
+
+def is_ready() -> bool:
+    """True once warm-up has finished or exhausted its budget."""
+    return _readiness["ready"]
+
+
+def mark_ready() -> None:
+    """Skip warm-up and report ready immediately."""
+    _readiness["ready"] = True
+    _readiness["finished_at"] = time.time()
+
+
+async def _run_job(name: str, job: Callable[[], Awaitable]) -> None:
+    """Run one warm-up job and record how it went."""
+    started = time.perf_counter()
+    _readiness["jobs"][name] = {"status": "running", "seconds": None}
+    try:
+        await job()
+        status = "done"
+    except asyncio.CancelledError:
+        _readiness["jobs"][name]["status"] = "cancelled"
+        raise
+    except Exception as e:
+        print(f"[Warm-up] {name} failed: {e}")
+        status = "failed"
+    _readiness["jobs"][name] = {
+        "status": status,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def run_warmup(jobs: dict[str, Callable[[], Awaitable]], budget_seconds: float) -> None:
+    """Run all warm-up jobs concurrently, then mark the worker ready.
+
+    Readiness flips after every job finishes or after ``budget_seconds``,
+    whichever comes first.
+    """
+    _readiness["started_at"] = time.time()
+    tasks = {asyncio.create_task(_run_job(name, job)): name for name, job in jobs.items()}
+    _pending.update(tasks)
+    for task in tasks:
+        task.add_done_callback(_pending.discard)
+
+    if tasks:
+        _, still_running = await asyncio.wait(tasks, timeout=budget_seconds)
+        for task in still_running:
+            name = tasks[task]
+            _readiness["jobs"][name]["status"] = "over_budget"
+            print(f"[Warm-up] {name} exceeded the {budget_seconds:.0f}s budget — continuing in background")
+
+    mark_ready()
+
+
+def start_warmup(jobs: dict[str, Callable[[], Awaitable]], budget_seconds: float) -> None:
+    """Run ``run_warmup`` in the background; ``cancel_warmup`` can stop it."""
+    task = asyncio.create_task(run_warmup(jobs, budget_seconds))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+def cancel_warmup() -> None:
+    """Cancel the warm-up and any jobs still running (called on shutdown)."""
+    for task in list(_pending):
+        task.cancel()
@@ -0,0 +1,160 @@
+"""Watchlist matching for personalized alert feeds.
+
+Users watch tickers/assets and sectors. An inverted index maps every watched
+symbol and sector to the set of users watching it, so matching an alert
+takes the union of a handful of posting sets — proportional to the number
+of interested users, not to the number of watchlists.
+
+Like the search index, the matcher mirrors the alert archive: every alert
+produced by ``build_live_alert`` is archived, and ``sync()`` matches the
+records appended since the last call and files their archive positions into
+each interested user's bounded feed. A new matcher starts at the archive
+tail and seeds feeds from the most recent records instead of replaying the
+whole archive.
+
+Watchlists are loaded once; after that every sync tails the watchlist
+change log and re-indexes only the users listed there, whichever worker
+made the change.
+"""
+
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+from app.data.watchlist_data import read_changes, read_watchlist, read_watchlists
+from app.services.alert_archive import AlertArchive, get_alert_archive
+from app.services.alert_set import asset_keys
+
+# Recent archive records scanned to seed a new or changed watchlist's feed
+_BACKFILL_RECORDS = 2000
+
+
+def _keys(watchlist: dict) -> tuple[frozenset[str], frozenset[str]]:
+    """Normalized (symbols, sectors) lookup keys of a stored watchlist."""
+    return (
+        frozenset(s.lower().strip() for s in watchlist.get("symbols", [])),
+        frozenset(s.lower().strip() for s in watchlist.get("sectors", [])),
+    )
+
+
+def _alert_keys(alert: dict) -> tuple[set[str], set[str]]:
+    return (
+        asset_keys(alert.get("asset_name", "")),
+        {s.lower() for s in alert.get("affected_sectors", [])},
+    )
+
+
+class WatchlistMatcher:
+    """Inverted symbol/sector → users index plus per-user alert feeds."""
+
+    def __init__(self, archive: AlertArchive, feed_size: int = 200) -> None:
+        self.archive = archive
+        self.feed_size = feed_size
+        self._lock = threading.Lock()
+        self._watchlists: dict[str, tuple[frozenset[str], frozenset[str]]] = {}
+        self._by_symbol: dict[str, set[str]] = {}
+        self._by_sector: dict[str, set[str]] = {}
+        self._feeds: dict[str, deque[int]] = {}
+        self._synced = len(archive)  # archive position matched up to
+        self._log_offset: Optional[int] = None  # change log position applied up to
+
+    def __len__(self) -> int:
+        return len(self._watchlists)
+
+    # ── Index maintenance ────────────────────────────────────────────────────
+
+    def _unindex(self, user_id: str) -> None:
+        symbols, sectors = self._watchlists.pop(user_id, (frozenset(), frozenset()))
+        for postings, keys in ((self._by_symbol, symbols), (self._by_sector, sectors)):
+            for key in keys:
+                users = postings.get(key)
+                if users is not None:
+                    users.discard(user_id)
+                    if not users:
+                        del postings[key]
+        self._feeds.pop(user_id, None)
+
+    def _index(self, user_id: str, keys: tuple[frozenset[str], frozenset[str]]) -> bool:
+        """Replace a user's postings. True if the user now has a feed to fill."""
+        self._unindex(user_id)
+        symbols, sectors = keys
+        if not symbols and not sectors:
+            return False
+        self._watchlists[user_id] = keys
+        for key in symbols:
+            self._by_symbol.setdefault(key, set()).add(user_id)
+        for key in sectors:
+            self._by_sector.setdefault(key, set()).add(user_id)
+        self._feeds[user_id] = deque(maxlen=self.feed_size)
+        return True
+
+    def _backfill(self, user_ids: set[str]) -> None:
+        """Seed new feeds from the most recent already-matched records, in one pass."""
+        if not user_ids:
+            return
+        for position, alert in self.archive.iter_from(max(0, self._synced - _BACKFILL_RECORDS)):
+            if position >= self._synced:
+                break
+            for user_id in self.match(alert) & user_ids:
+                self._feeds[user_id].append(position)
+
+    def _reload(self) -> None:
+        """Apply watchlist changes persisted by any worker since the last call."""
+        if self._log_offset is None:
+            stored, self._log_offset = read_watchlists()
+            changed = {user_id for user_id, w in stored.items() if self._index(user_id, _keys(w))}
+        else:
+            user_ids, self._log_offset = read_changes(self._log_offset)
+            changed = set()
+            for user_id in user_ids:
+                watchlist = read_watchlist(user_id)
+                keys = _keys(watchlist) if watchlist is not None else (frozenset(), frozenset())
+                if self._watchlists.get(user_id) == keys:
+                    continue
+                if self._index(user_id, keys):
+                    changed.add(user_id)
+        self._backfill(changed)
+
+    # ── Matching ─────────────────────────────────────────────────────────────
+
+    def match(self, alert: dict) -> set[str]:
+        """Users whose watchlist covers the alert's asset or any of its sectors."""
+        symbols, sectors = _alert_keys(alert)
+        users: set[str] = set()
+        for key in symbols:
+            users |= self._by_symbol.get(key, set())
+        for key in sectors:
+            users |= self._by_sector.get(key, set())
+        return users
+
+    def sync(self) -> int:
+        """Match archive records appended since the last sync. Returns how many."""
+        with self._lock:
+            self._reload()
+            start = self._synced
+            for position, alert in self.archive.iter_from(start):
+                for user_id in self.match(alert):
+                    self._feeds[user_id].append(position)
+                self._synced = position + 1
+            return self._synced - start
+
+    def feed(self, user_id: str, limit: int = 50) -> list[dict]:
+        """A user's most recent matching alerts, newest first."""
+        self.sync()
+        with self._lock:
+            positions = list(self._feeds.get(user_id, ()))[::-1]
+        # Re-archived alerts (same id, more sources): keep the newest record
+        latest: dict[str, dict] = {}
+        for start in range(0, len(positions), limit):
+            for alert in self.archive.get_many(positions[start:start + limit]):
+                latest.setdefault(alert["id"], alert)
+            if len(latest) >= limit:
+                break
+        return list(latest.values())[:limit]
+
+
+@lru_cache()
+def get_watchlist_matcher() -> WatchlistMatcher:
+    """Process-wide watchlist matcher over the alert archive."""
+    return WatchlistMatcher(get_alert_archive())
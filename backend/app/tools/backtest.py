@@ -0,0 +1,81 @@
+"""Backtest prediction strategies across the scenario catalog.
+
+Evaluates each strategy over every scenario in one vectorized pass and
+prints accuracy, Brier score, P&L and the reliability curve. With
+``--synthetic N`` it also appends N random-walk scenarios, which makes it
+usable as a CI speed check via ``--max-seconds``.
+
+Usage (from ``backend/``):
+    python -m app.tools.backtest
+    python -m app.tools.backtest --strategy momentum --synthetic 5000 --max-seconds 2
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from app.routes.ml import scenario_cases
+from app.services.backtest import STRATEGIES, build_batch, run_backtest
+
+
+def synthetic_cases(n: int, seed: int = 0, pre_len: int = 30, post_len: int = 5) -> list[dict]:
+    """Random-walk scenarios labelled by their reveal move."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, 0.015, size=(n, pre_len + post_len))
+    closes = 100.0 * np.exp(np.cumsum(steps, axis=1))
+    ml_up = rng.random(n) < 0.5
+    return [
+        {
+            "slug": f"synthetic-{i}",
+            "pre_close": closes[i, :pre_len],
+            "post_close": closes[i, pre_len:],
+            "actual_outcome": "UP" if closes[i, -1] > closes[i, pre_len - 1] else "DOWN",
+            "ml_prediction": "UP" if ml_up[i] else "DOWN",
+            "ml_confidence": float(rng.uniform(0.5, 0.95)),
+        }
+        for i in range(n)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strategy", choices=list(STRATEGIES), action="append",
+                        help="strategy to evaluate (repeatable; default: all)")
+    parser.add_argument("--bins", type=int, default=10, help="calibration curve bins")
+    parser.add_argument("--synthetic", type=int, default=0, help="extra random-walk scenarios")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail if slower than this")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = parser.parse_args(argv)
+
+    cases = scenario_cases() + synthetic_cases(args.synthetic, args.seed)
+    started = time.perf_counter()
+    batch = build_batch(cases)
+    results = [run_backtest(name, batch, args.bins) for name in args.strategy or STRATEGIES]
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'strategy':<16} {'version':<24} {'accuracy':>9} {'brier':>7} {'return':>9} {'win':>6}")
+        for r in results:
+            print(
+                f"{r['strategy']:<16} {r['model_version']:<24} {r['accuracy']:>9.3f} "
+                f"{r['brier_score']:>7.3f} {r['total_return']:>+9.3f} {r['win_rate']:>6.2f}"
+            )
+            for b in r["calibration"]:
+                print(f"{'':<16} P(UP) {b['bin_low']:.1f}-{b['bin_high']:.1f}: "
+                      f"predicted {b['mean_predicted']:.2f}, observed {b['observed_up_rate']:.2f} (n={b['count']})")
+    print(f"\n{len(batch)} scenarios in {elapsed * 1000:.1f} ms")
+
+    if args.max_seconds is not None and elapsed > args.max_seconds:
+        print(f"FAIL: backtest took longer than {args.max_seconds:.1f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
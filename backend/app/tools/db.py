@@ -0,0 +1,59 @@
+"""Database maintenance for the Supabase Postgres tables.
+
+``check`` opens the pool and prints row counts for every table.
+``seed-scenarios`` bulk-upserts the in-memory scenario catalog
+(``app.data.scenario_data.SCENARIOS``) into ``public.scenarios``.
+
+Both need ``DATABASE_URL`` and asyncpg (``pip install asyncpg``).
+
+Usage (from ``backend/``):
+    python -m app.tools.db check
+    python -m app.tools.db seed-scenarios
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.data.scenario_data import SCENARIOS
+from app.services.repository import DatabaseUnavailable, get_database, get_scenario_repository
+
+_TABLES = ("profiles", "scenarios", "predictions", "learning_progress")
+
+
+async def check() -> None:
+    db = get_database()
+    for table in _TABLES:
+        row = await db.fetchrow(f"SELECT count(*) AS n FROM public.{table}")
+        print(f"{table:<18} {row['n']:>8} rows")
+
+
+async def seed_scenarios() -> None:
+    await get_scenario_repository().upsert_many(list(SCENARIOS.values()))
+    print(f"[Database] Upserted {len(SCENARIOS)} scenarios")
+
+
+async def _run(command: str) -> None:
+    try:
+        await (check() if command == "check" else seed_scenarios())
+    finally:
+        await get_database().close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", help="print row counts per table")
+    commands.add_parser("seed-scenarios", help="upsert the bundled scenario catalog")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_run(args.command))
+    except DatabaseUnavailable as e:
+        print(f"FAIL: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
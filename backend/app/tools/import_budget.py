@@ -0,0 +1,77 @@
+"""Import-time budget check for the backend.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+reports the most expensive modules and fails when the total import cost
+exceeds the budget or when a module that must stay lazy gets imported.
+
+Usage (from ``backend/``):
+    python -m app.tools.import_budget
+    python -m app.tools.import_budget --module app.main --budget-ms 1500 --top 15
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Modules that must never be imported just by loading the app
+_LAZY_MODULES = ("google.generativeai", "asyncpg")
+
+
+@dataclass
+class ImportCost:
+    """Per-module import cost in microseconds."""
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure_imports(module: str) -> list[ImportCost]:
+    """Import ``module`` in a subprocess and parse the ``-X importtime`` log."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    costs: list[ImportCost] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        costs.append(ImportCost(name.strip(), int(self_us), int(cumulative_us)))
+    return costs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="total import budget")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to report")
+    args = parser.parse_args(argv)
+
+    costs = measure_imports(args.module)
+    target = next((c for c in costs if c.module == args.module), None)
+    total_ms = (target.cumulative_us if target else sum(c.self_us for c in costs)) / 1000
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cost in sorted(costs, key=lambda c: c.cumulative_us, reverse=True)[: args.top]:
+        print(f"{cost.cumulative_us / 1000:>14.1f} {cost.self_us / 1000:>9.1f}  {cost.module}")
+    print(f"\nTotal import time for {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    imported = {c.module for c in costs}
+    for lazy in _LAZY_MODULES:
+        if lazy in imported:
+            print(f"FAIL: {lazy} is imported eagerly — it must only load on first use")
+            failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import budget exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Memory benchmark: dict + Pydantic alerts/bars vs the compact records.
+
+Decodes N synthetic alerts and M bars from JSON lines (as they arrive from
+the archive or shared state) into each representation and reports the
+memory still held afterwards:
+
+- alerts as dicts, plus a ``NewsAlert`` copy of each (the old resident form)
+- alerts as ``AlertRecord`` (slotted, interned sector/source strings)
+- bars as dicts, plus a ``CandlestickBar`` copy of each
+- bars as one ``BarSeries`` (numpy columns)
+
+Usage (from ``backend/``):
+    python -m app.tools.memory_bench
+    python -m app.tools.memory_bench --alerts 100000 --bars 1000000
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from app.models.news_alerts import NewsAlert
+from app.models.schemas import CandlestickBar
+from app.services.records import AlertRecord, BarSeries
+
+_SECTORS = ("Technology", "Energy", "Financials", "Healthcare", "Industrials", "Utilities")
+_SOURCES = ("Reuters", "Bloomberg", "CNBC", "MarketWatch", "Yahoo")
+_SEVERITIES = ("critical", "high", "medium")
+
+
+def _alert_dicts(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"live-{i}",
+            "severity": rng.choice(_SEVERITIES),
+            "headline": f"Headline {i}: markets react to event {rng.random():.6f}",
+            "impact_summary": f"Impact summary for alert {i}",
+            "affected_sectors": rng.sample(_SECTORS, 2),
+            "recommended_action": "Monitor positions",
+            "asset_name": f"TCK{i % 500}",
+            "source": rng.choice(_SOURCES),
+            "url": f"https://news.example.com/{i}",
+            "image_url": None,
+            "timestamp": f"2025-10-{1 + i % 28:02d}T12:{i % 60:02d}:00",
+        }
+        for i in range(n)
+    ]
+
+
+def _bar_dicts(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    price, bars = 100.0, []
+    for i in range(n):
+        close = price * (1 + rng.gauss(0, 0.01))
+        bars.append({
+            "time": 1_600_000_000 + i * 60,
+            "open": price,
+            "high": max(price, close) * 1.001,
+            "low": min(price, close) * 0.999,
+            "close": close,
+        })
+        price = close
+    return bars
+
+
+def measure(build: Callable[[], object]) -> tuple[int, float]:
+    """Bytes still allocated by ``build()``'s result, and seconds taken."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--alerts", type=int, default=100_000)
+    parser.add_argument("--bars", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    alerts = [json.dumps(a) for a in _alert_dicts(args.alerts)]
+    bars = [json.dumps(b) for b in _bar_dicts(args.bars)]
+
+    def dicts_and_models(lines: list[str], model) -> list:
+        return [(d, model(**d)) for d in map(json.loads, lines)]
+
+    cases = [
+        (f"{args.alerts:,} alerts", "dict + NewsAlert", lambda: dicts_and_models(alerts, NewsAlert)),
+        (f"{args.alerts:,} alerts", "AlertRecord", lambda: [AlertRecord.from_dict(json.loads(a)) for a in alerts]),
+        (f"{args.bars:,} bars", "dict + CandlestickBar", lambda: dicts_and_models(bars, CandlestickBar)),
+        (f"{args.bars:,} bars", "BarSeries", lambda: BarSeries.from_bars(map(json.loads, bars))),
+    ]
+
+    print(f"{'data':<18} {'representation':<24} {'MiB':>9} {'bytes/item':>11} {'build s':>8}")
+    for label, representation, build in cases:
+        size, elapsed = measure(build)
+        count = args.alerts if "alerts" in label else args.bars
+        print(f"{label:<18} {representation:<24} {size / 2**20:>9.1f} {size / max(count, 1):>11.0f} {elapsed:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
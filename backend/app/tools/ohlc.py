@@ -0,0 +1,127 @@
+"""Offline OHLC ingestion and scenario window extraction.
+
+``ingest`` loads CSV or Parquet files into the memory-mapped columnar store
+(see ``app.services.ohlc_store``), replacing it atomically. Files need
+date/time, open, high, low and close columns; volume is optional. The
+symbol comes from a symbol/ticker column or, failing that, the file name.
+Symbols already in the store are kept unless ``--replace`` is given.
+
+``window`` prints the pre/post-event bars for a scenario as JSON.
+
+Usage (from ``backend/``):
+    python -m app.tools.ohlc ingest data/NVDA.csv data/prices.parquet
+    python -m app.tools.ohlc window --symbol NVDA --event-date 2024-06-18
+"""
+
+import argparse
+import csv
+import json
+import sys
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from app.services.ohlc_store import COLUMNS, get_ohlc_store, write_store
+from app.services.scenario_builder import build_event_window
+
+_TIME_COLUMNS = ("time", "timestamp", "date", "datetime")
+_SYMBOL_COLUMNS = ("symbol", "ticker")
+
+
+def _parse_time(value) -> int:
+    """UNIX seconds from epoch seconds/milliseconds, ISO strings or dates."""
+    if isinstance(value, datetime):
+        dt = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return int(dt.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+    if isinstance(value, (int, float)) or str(value).replace(".", "", 1).isdigit():
+        seconds = float(value)
+        return int(seconds / 1000 if seconds > 1e11 else seconds)
+    return _parse_time(datetime.fromisoformat(str(value).strip().replace("Z", "+00:00")))
+
+
+def _read_rows(path: Path) -> list[dict]:
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Reading Parquet files needs pyarrow: pip install pyarrow")
+        return pq.read_table(path).to_pylist()
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def load_file(path: Path) -> dict[str, dict[str, list]]:
+    """Parse one file into ``{symbol: {column: values}}``."""
+    series: dict[str, dict[str, list]] = {}
+    for row in _read_rows(path):
+        row = {str(k).lower().strip(): v for k, v in row.items()}
+        time_key = next((k for k in _TIME_COLUMNS if row.get(k) not in (None, "")), None)
+        if time_key is None:
+            raise ValueError(f"{path}: row without a {'/'.join(_TIME_COLUMNS)} column")
+        symbol_key = next((k for k in _SYMBOL_COLUMNS if row.get(k)), None)
+        symbol = str(row[symbol_key]).upper() if symbol_key else path.stem.upper()
+
+        cols = series.setdefault(symbol, {c: [] for c in COLUMNS})
+        cols["time"].append(_parse_time(row[time_key]))
+        for column in COLUMNS[1:]:
+            value = row.get(column)
+            cols[column].append(float(value) if value not in (None, "") else 0.0)
+    return series
+
+
+def ingest(paths: list[Path], replace: bool = False) -> None:
+    store = get_ohlc_store()
+    merged: dict[str, dict[str, list]] = {}
+
+    if not replace and store.path.exists():
+        for symbol in store.symbols():
+            merged[symbol] = {c: list(v) for c, v in store.columns(symbol).items()}
+
+    fresh: set[str] = set()
+    for path in paths:
+        for symbol, cols in load_file(path).items():
+            if symbol not in fresh:
+                # New data for a symbol replaces what the store had for it
+                merged[symbol] = {c: [] for c in COLUMNS}
+                fresh.add(symbol)
+            for column in COLUMNS:
+                merged[symbol][column].extend(cols[column])
+        print(f"[OHLC Ingest] Loaded {path}")
+
+    rows = write_store(store.path, {s: {c: np.asarray(v) for c, v in cols.items()} for s, cols in merged.items()})
+    print(f"[OHLC Ingest] Wrote {rows} bars for {len(merged)} symbols to {store.path}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_cmd = commands.add_parser("ingest", help="load CSV/Parquet files into the store")
+    ingest_cmd.add_argument("files", nargs="+", type=Path)
+    ingest_cmd.add_argument("--replace", action="store_true", help="drop symbols not in these files")
+
+    window_cmd = commands.add_parser("window", help="print pre/post-event bars as JSON")
+    window_cmd.add_argument("--symbol", required=True)
+    window_cmd.add_argument("--event-date", required=True, help="YYYY-MM-DD")
+    window_cmd.add_argument("--pre-bars", type=int, default=30)
+    window_cmd.add_argument("--post-bars", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "ingest":
+        ingest(args.files, replace=args.replace)
+        return 0
+
+    try:
+        pre, post = build_event_window(args.symbol.upper(), args.event_date, args.pre_bars, args.post_bars)
+    except (KeyError, ValueError) as e:
+        print(f"FAIL: {e}")
+        return 1
+    print(json.dumps({"symbol": args.symbol.upper(), "event_date": args.event_date, "pre": pre, "post": post}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Tests for ``app.services.admission``."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.admission import QueueFull, RouteGate, RouteLimit, _client_id, parse_networks
+from app.services.request_context import RequestContext, _current, latency_budget, remaining_seconds
+
+
+def _gate(latency_budget: float = 0.0) -> RouteGate:
+    return RouteGate(RouteLimit(
+        name="test", method="POST", path="/x",
+        max_concurrency=1, max_queue=4, queue_timeout=10.0, latency_budget=latency_budget,
+    ))
+
+
+def test_queue_wait_is_capped_at_the_remaining_latency_budget():
+    async def run():
+        gate = _gate(latency_budget=0.5)
+        await gate.acquire()  # hold the only slot
+        request = RequestContext({"type": "http", "path": "/x"})
+        request.arrived -= 0.4  # already spent most of the budget upstream
+        _current.set(request)
+        started = time.monotonic()
+        with pytest.raises(QueueFull):
+            await gate.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) < 0.5
+
+
+def test_deadline_counts_from_arrival():
+    async def run():
+        request = RequestContext({"type": "http", "path": "/x"})
+        request.arrived -= 3.0
+        _current.set(request)
+        await latency_budget(8.0)()
+        return remaining_seconds()
+
+    assert 4.5 < asyncio.run(run()) <= 5.0
+
+
+def _scope(peer: str, forwarded: str = "") -> dict:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"type": "http", "client": (peer, 50000), "headers": headers}
+
+
+def test_forwarded_client_is_trusted_only_from_configured_proxies():
+    proxies = parse_networks("10.0.0.0/8, 127.0.0.1")
+    # Through two trusted hops: the nearest untrusted address is the client
+    assert _client_id(_scope("10.0.0.5", "198.51.100.7, 10.1.2.3"), proxies) == "198.51.100.7"
+    # A client prepending a fake address can't pick its own bucket
+    assert _client_id(_scope("127.0.0.1", "1.2.3.4, 203.0.113.9"), proxies) == "203.0.113.9"
+    # Direct clients can't spoof the header at all
+    assert _client_id(_scope("203.0.113.9", "1.2.3.4"), proxies) == "203.0.113.9"
+    assert _client_id(_scope("10.0.0.5", "198.51.100.7"), []) == "10.0.0.5"
@@ -0,0 +1,39 @@
+"""Tests for ``app.services.alert_archive``."""
+
+from app.services.alert_archive import AlertArchive, _RECORD
+
+
+def _alert(i: int) -> dict:
+    return {"id": f"a{i}", "severity": "high", "headline": f"Headline {i}"}
+
+
+def test_append_and_read_back(tmp_path):
+    archive = AlertArchive(tmp_path)
+    archive.append([_alert(0), _alert(1)])
+    assert len(archive) == 2
+    assert [a["id"] for a in archive.get_many([1, 0])] == ["a1", "a0"]
+
+
+def test_torn_index_record_is_truncated_on_open(tmp_path):
+    archive = AlertArchive(tmp_path)
+    archive.append([_alert(0), _alert(1)])
+    # Simulate a crash halfway through the next append
+    with open(archive.data_path, "ab") as data:
+        data.write(b'{"id":"torn"')
+    with open(archive.index_path, "ab") as idx:
+        idx.write(b"\x01" * (_RECORD.size // 2))
+
+    reopened = AlertArchive(tmp_path)
+    assert reopened.index_path.stat().st_size == 2 * _RECORD.size
+    reopened.append([_alert(2)])
+    assert [a["id"] for _, a in reopened.iter_from(0)] == ["a0", "a1", "a2"]
+
+
+def test_append_repairs_tail_left_by_another_writer(tmp_path):
+    archive = AlertArchive(tmp_path)
+    archive.append([_alert(0)])
+    with open(archive.index_path, "ab") as idx:
+        idx.write(b"\x00" * 5)
+
+    archive.append([_alert(1)])
+    assert [a["id"] for a in archive.query()] == ["a0", "a1"]
@@ -0,0 +1,32 @@
+"""Tests for ``app.services.alert_set``."""
+
+from app.services.alert_set import AlertSet
+from app.services.news_intelligence import build_live_alert
+
+_ANALYSIS = {
+    "severity": "high",
+    "impact_summary": "",
+    "affected_sectors": ["Technology"],
+    "recommended_action": "",
+    "asset_name": "ACME",
+}
+
+
+def _articles() -> list[dict]:
+    # Same timestamp, so pages are split on the id tiebreaker
+    return [
+        {"id": n, "headline": f"Story {n}", "url": f"https://news.example/{n}", "datetime": 1_700_000_000}
+        for n in range(1, 7)
+    ]
+
+
+def test_cursor_stays_valid_across_refreshes():
+    first = AlertSet([build_live_alert(a, _ANALYSIS) for a in _articles()])
+    page, _, cursor = first.query(limit=3)
+
+    # The 30 s refresh rebuilds every alert from the same articles
+    refreshed = AlertSet([build_live_alert(a, _ANALYSIS) for a in _articles()])
+    rest, _, _ = refreshed.query(cursor=cursor, limit=3)
+
+    assert len(rest) == 3
+    assert {a.headline for a in page}.isdisjoint(a.headline for a in rest)
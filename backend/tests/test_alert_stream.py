@@ -0,0 +1,34 @@
+"""Tests for ``app.services.alert_stream``."""
+
+import asyncio
+
+from app.services import alert_stream
+from app.services.alert_stream import AlertHub, StreamReset
+from app.services.shared_state import InProcessState
+
+
+def test_resume_older_than_the_buffer_yields_a_reset(monkeypatch):
+    state = InProcessState()
+    monkeypatch.setattr(alert_stream, "get_shared_state", lambda: state)
+
+    async def first(hub: AlertHub, last_event_id: int, count: int):
+        listener = hub.listen(last_event_id)
+        try:
+            return [await anext(listener) for _ in range(count)]
+        finally:
+            await listener.aclose()
+
+    async def run():
+        hub = AlertHub("alerts", buffer_size=3)
+        hub.start()
+        for n in range(6):
+            await state.publish("alerts", {"n": n})
+        await asyncio.sleep(0.01)
+        try:
+            return await first(hub, 1, 1), await first(hub, 4, 2)
+        finally:
+            hub.stop()
+
+    (reset,), recent = asyncio.run(run())
+    assert isinstance(reset, StreamReset) and (reset.last_event_id, reset.resume_id) == (1, 6)
+    assert [event[0] for event in recent] == [5, 6]
@@ -0,0 +1,33 @@
+"""Tests for ``app.services.alert_topics``."""
+
+from app.services.alert_topics import TopicRouter, subscription_topics
+
+
+def _alert(severity: str, sectors: list[str], asset: str = "") -> tuple[int, dict]:
+    return 0, {"severity": severity, "affected_sectors": sectors, "asset_name": asset}
+
+
+def test_fields_within_a_subscription_are_combined_with_and():
+    router = TopicRouter()
+    subscriber = router.add()
+    router.update(subscriber, subscription_topics(min_severity="high", sectors=["Technology"]))
+
+    assert router.route(_alert("medium", ["Technology"])) == 0
+    assert router.route(_alert("critical", ["Energy"])) == 0
+    assert router.route(_alert("high", ["Technology", "Energy"])) == 1
+    assert subscriber.queue.qsize() == 1
+
+
+def test_separate_subscriptions_match_independently():
+    router = TopicRouter()
+    tech, energy, everything = router.add(), router.add(), router.add()
+    router.update(tech, subscription_topics(sectors=["Technology"], assets=["NVDA"]))
+    router.update(energy, subscription_topics(min_severity="critical", sectors=["Energy"]))
+    router.update(everything, subscription_topics())
+
+    assert router.route(_alert("medium", ["Technology"], "NVDA")) == 2
+    assert router.route(_alert("critical", ["Energy"], "XOM")) == 2
+    assert router.route(_alert("high", ["Energy"], "XOM")) == 1
+
+    router.remove(everything)
+    assert router.route(_alert("medium", ["Technology"], "NVDA")) == 1
@@ -0,0 +1,111 @@
+"""Tests for ``app.services.auth`` and the routes that use it."""
+
+import asyncio
+import time
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.routes import profiles, scenarios
+from app.services.jobs import JobQueue
+from app.services.prediction_stats import PredictionStats, StatsStore
+
+_SECRET = "test-jwt-secret-of-at-least-32-bytes"
+_USER = "6f1c1c1e-0000-4000-8000-000000000002"
+
+
+def _token(**claims) -> str:
+    payload = {"sub": _USER, "aud": "authenticated", "exp": int(time.time()) + 60, **claims}
+    return jwt.encode(payload, _SECRET, algorithm="HS256")
+
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "supabase_jwt_secret", _SECRET)
+    app = FastAPI()
+    app.include_router(scenarios.router)
+    app.include_router(profiles.router)
+    return TestClient(app)
+
+
+def test_profile_needs_a_valid_token(client):
+    assert client.get("/api/profiles/me").status_code == 401
+    expired = _token(exp=int(time.time()) - 10)
+    assert client.get("/api/profiles/me", headers=_bearer(expired)).status_code == 401
+    wrong_audience = _token(aud="anon")
+    assert client.get("/api/profiles/me", headers=_bearer(wrong_audience)).status_code == 401
+    forged = jwt.encode({"sub": _USER, "aud": "authenticated", "exp": int(time.time()) + 60},
+                        "another-secret-of-at-least-32-bytes", algorithm="HS256")
+    assert client.get("/api/profiles/me", headers=_bearer(forged)).status_code == 401
+
+
+def test_prediction_is_stored_for_the_token_user(client, monkeypatch, tmp_path):
+    async def explain(**kwargs):
+        return None
+
+    monkeypatch.setattr(scenarios, "generate_game_master_explanation", explain)
+    stats = PredictionStats(StatsStore(tmp_path / "stats.db"))
+    monkeypatch.setattr(scenarios, "get_prediction_stats", lambda: stats)
+    slug = "zero-day-vulnerability"
+    # A user id in the body is ignored: anonymous play stores nothing
+    anonymous = client.post(f"/api/scenarios/{slug}/predict",
+                            json={"scenario_slug": slug, "user_prediction": "UP", "user_id": _USER})
+    assert anonymous.status_code == 200
+
+    signed_in = client.post(f"/api/scenarios/{slug}/predict", headers=_bearer(_token()),
+                            json={"scenario_slug": slug, "user_prediction": "UP"})
+    assert signed_in.status_code == 200
+
+    history = client.get("/api/profiles/me/predictions", headers=_bearer(_token())).json()
+    assert [p["scenario_slug"] for p in history["predictions"]] == [slug]
+    profile = client.get("/api/profiles/me", headers=_bearer(_token())).json()
+    assert profile["xp"] == signed_in.json()["xp_earned"]
+
+
+def test_reveal_survives_a_failed_store(client, monkeypatch, tmp_path):
+    class Broken:
+        async def insert_many(self, predictions):
+            raise RuntimeError("insert or update on table violates foreign key constraint")
+
+    async def explain(**kwargs):
+        return None
+
+    monkeypatch.setattr(scenarios, "generate_game_master_explanation", explain)
+    monkeypatch.setattr(scenarios, "get_prediction_repository", Broken)
+    stats = PredictionStats(StatsStore(tmp_path / "stats.db"))
+    monkeypatch.setattr(scenarios, "get_prediction_stats", lambda: stats)
+    slug = "zero-day-vulnerability"
+    response = client.post(f"/api/scenarios/{slug}/predict", headers=_bearer(_token()),
+                           json={"scenario_slug": slug, "user_prediction": "DOWN"})
+    assert response.status_code == 200 and response.json()["actual_outcome"]
+
+
+def test_async_reveal_writes_the_explanation_back(client, monkeypatch, tmp_path):
+    explanation = {"winner": "user", "summary": "Good call"}
+
+    async def explain(**kwargs):
+        await asyncio.sleep(0.05)
+        return explanation
+
+    queue = JobQueue(workers=1)
+    monkeypatch.setattr(scenarios, "generate_game_master_explanation", explain)
+    monkeypatch.setattr(scenarios, "get_job_queue", lambda: queue)
+    stats = PredictionStats(StatsStore(tmp_path / "stats.db"))
+    monkeypatch.setattr(scenarios, "get_prediction_stats", lambda: stats)
+    user = "6f1c1c1e-0000-4000-8000-000000000003"
+    slug = "zero-day-vulnerability"
+
+    with client:
+        response = client.post(f"/api/scenarios/{slug}/predict?mode=async", headers=_bearer(_token(sub=user)),
+                               json={"scenario_slug": slug, "user_prediction": "UP"})
+        assert response.json()["ai_explanation"] is None
+        time.sleep(0.2)  # the job finishes on the client's event loop thread
+        history = client.get("/api/profiles/me/predictions", headers=_bearer(_token(sub=user))).json()
+    assert history["predictions"][0]["ai_explanation"] == explanation
@@ -0,0 +1,43 @@
+"""Tests for ``app.services.jobs``."""
+
+import asyncio
+
+from app.services.jobs import DONE, FAILED, JobQueue
+
+
+def test_follow_up_runs_after_the_job_finishes():
+    seen = []
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return {"answer": 42}
+
+    async def follow_up(job):
+        seen.append((job.status, job.result))
+
+    async def run():
+        queue = JobQueue(workers=1)
+        job = queue.submit("test", "k", work)
+        queue.on_done(job, follow_up)
+        await queue.wait(job, 1.0)
+        await asyncio.sleep(0)
+        queue.stop()
+
+    asyncio.run(run())
+    assert seen == [(DONE, {"answer": 42})]
+
+
+def test_job_cancelled_mid_run_is_marked_failed():
+    async def work():
+        await asyncio.sleep(10)
+
+    async def run():
+        queue = JobQueue(workers=1)
+        job = queue.submit("test", "k", work)
+        await asyncio.sleep(0.01)
+        queue.stop()  # shutdown cancels the worker
+        await asyncio.sleep(0.01)
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == FAILED and job.finished_at is not None and job.error
@@ -0,0 +1,62 @@
+"""Tests for ``app.services.llm_usage``."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_usage
+from app.services.hedging import LatencyTracker, hedged
+from app.services.llm_usage import admit
+from app.services.request_context import RequestContext, _current
+
+
+def _response(prompt: int, output: int):
+    return SimpleNamespace(usage_metadata=SimpleNamespace(prompt_token_count=prompt, candidates_token_count=output))
+
+
+@pytest.fixture
+def request_context(monkeypatch):
+    monkeypatch.setattr(llm_usage, "_ledger", llm_usage.UsageLedger())
+    request = RequestContext({"type": "http", "path": "/test"}, token_budget=10_000)
+    token = _current.set(request)
+    yield request
+    _current.reset(token)
+
+
+def test_reservation_is_released_when_the_call_fails(request_context):
+    with pytest.raises(RuntimeError):
+        with admit("site", "gemini-2.0-flash", 1000, 500) as reservation:
+            assert request_context.tokens_used == 1500
+            raise RuntimeError("Gemini error")
+    assert reservation.reserved == 0
+    assert request_context.tokens_used == 0
+
+
+def test_recorded_usage_replaces_the_reservation(request_context):
+    with admit("site", "gemini-2.0-flash", 1000, 500) as reservation:
+        reservation.record(_response(900, 200))
+    assert request_context.tokens_used == 1100
+
+
+def test_hedge_loser_prompt_is_charged(request_context):
+    tracker = LatencyTracker(min_samples=1)
+    tracker.record(0.01)
+    delays = iter([1.0, 0.02])
+
+    async def run():
+        with admit("site", "gemini-2.0-flash", 1000, 500) as reservation:
+            async def attempt():
+                with reservation.attempt():
+                    await asyncio.sleep(next(delays))
+                    return _response(1000, 300)
+
+            reservation.record(await hedged(attempt, tracker))
+        await asyncio.sleep(0)  # let the cancelled loser unwind
+
+    asyncio.run(run())
+    totals = llm_usage.usage_report()["totals"]
+    assert totals["calls"] == 1
+    assert totals["abandoned"] == 1
+    assert totals["prompt_tokens"] == 2000
+    assert request_context.tokens_used == 1000 + 300 + 1000
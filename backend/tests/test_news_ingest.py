@@ -0,0 +1,25 @@
+"""Tests for ``app.services.news_ingest``."""
+
+from app.services import news_ingest
+from app.services.news_ingest import NewsIngestor
+
+
+async def _noop(*args):
+    return []
+
+
+def test_budget_stretching_does_not_compound(monkeypatch):
+    monkeypatch.setattr(news_ingest, "is_us_market_hours", lambda: True)
+    ingestor = NewsIngestor(
+        _noop, _noop, _noop, categories=("general", "crypto"),
+        requests_per_minute=4, min_interval=15, max_interval=600,
+    )
+    for state in ingestor.states.values():
+        state.arrival_rate = 1 / 15  # wants a poll every 15 s
+
+    for _ in range(5):
+        for state in ingestor.states.values():
+            ingestor._plan_interval(state)
+
+    # 2 categories × 4/min wanted against 4/min: each stretched once, to 30 s
+    assert [s.interval for s in ingestor.states.values()] == [30.0, 30.0]
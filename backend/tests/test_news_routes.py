@@ -0,0 +1,76 @@
+"""Tests for the live alert paths in ``app.routes.news``."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import news
+from app.services.shared_state import InProcessState
+
+_ANALYSIS = {
+    "severity": "high",
+    "impact_summary": "Chip stocks slide",
+    "affected_sectors": ["Technology"],
+    "recommended_action": "",
+    "asset_name": "NVDA",
+}
+
+
+def _article(n: int, headline: str) -> dict:
+    return {"id": n, "headline": headline, "summary": "", "source": f"Wire {n}",
+            "url": f"https://news.example/{n}", "datetime": 1_700_000_000 + n}
+
+
+@pytest.fixture
+def archived(monkeypatch):
+    records: list[dict] = []
+
+    async def archive(alerts):
+        records.extend(alerts)
+
+    async def analyze(article):
+        return dict(_ANALYSIS)
+
+    state = InProcessState()
+    monkeypatch.setattr(news, "get_shared_state", lambda: state)
+    monkeypatch.setattr(news, "analyze_article", analyze)
+    monkeypatch.setattr(news, "_archive", archive)
+    monkeypatch.setattr(news, "_published_stories", type(news._published_stories)())
+    return records
+
+
+def test_new_copy_of_an_archived_story_is_folded_into_its_alert(monkeypatch, archived):
+    original = _article(9101, "Export curbs on advanced chips hit Nvidia and AMD shares in early trading")
+    copy = _article(9102, "Export curbs on advanced chips hit Nvidia and AMD shares in early trade")
+    batches = [[original], [original, copy]]
+
+    async def fetch(category="general", limit=12):
+        return batches.pop(0)
+
+    monkeypatch.setattr(news, "fetch_finnhub_news", fetch)
+
+    async def run():
+        return await news._generate_live_alerts(), await news._generate_live_alerts()
+
+    (first,), (second,) = asyncio.run(run())
+    assert second["id"] == first["id"]
+    assert [a["id"] for a in archived] == [first["id"], first["id"]]
+    assert [s["url"] for s in archived[1]["additional_sources"]] == [copy["url"]]
+
+
+def test_websocket_sender_failure_is_logged(monkeypatch, capsys):
+    async def broken_sender(websocket, subscriber, send_lock):
+        raise RuntimeError("send failed")
+
+    monkeypatch.setattr(news, "start_live_alerts", lambda: None)
+    monkeypatch.setattr(news, "_send_alert_batches", broken_sender)
+    app = FastAPI()
+    app.include_router(news.router)
+
+    with TestClient(app).websocket_connect("/api/news/alerts/ws") as ws:
+        ws.send_json({"action": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+    assert "[News] WebSocket alert sender failed: RuntimeError('send failed')" in capsys.readouterr().out
@@ -0,0 +1,45 @@
+"""Tests for ``app.services.prediction_stats``."""
+
+import asyncio
+
+from app.services.prediction_stats import PredictionStats, StatsStore
+
+
+def test_workers_share_durable_totals(tmp_path):
+    path = tmp_path / "stats.db"
+
+    async def run():
+        a = PredictionStats(StatsStore(path))
+        b = PredictionStats(StatsStore(path))
+        a.record("oil", "UP", correct=True)
+        a.record("oil", "DOWN", correct=False)
+        b.record("oil", "UP", correct=True)
+        await a.flush()
+        await b.flush()
+        b.record("oil", "DOWN", correct=False)  # not flushed yet
+        return a.stats("oil"), b.stats("oil")
+
+    a_view, b_view = asyncio.run(run())
+    assert a_view["total_predictions"] == 2  # a hasn't seen b's flush yet
+    assert (b_view["up"], b_view["down"], b_view["correct"]) == (2, 2, 2)
+    assert b_view["pct_up"] == 50.0
+
+
+def test_totals_survive_a_restart(tmp_path):
+    path = tmp_path / "stats.db"
+
+    async def first_run():
+        stats = PredictionStats(StatsStore(path))
+        stats.record("chips", "DOWN", correct=True)
+        await stats.stop()
+        stats.store.close()
+
+    async def second_run():
+        stats = PredictionStats(StatsStore(path))
+        await stats.flush()  # the flusher's first pass loads the totals
+        return stats.stats("chips"), stats.stats("unknown")
+
+    asyncio.run(first_run())
+    chips, unknown = asyncio.run(second_run())
+    assert (chips["down"], chips["correct"], chips["pct_correct"]) == (1, 1, 100.0)
+    assert unknown["total_predictions"] == 0
@@ -0,0 +1,180 @@
+"""Tests for ``app.services.repository`` against a fake asyncpg pool."""
+
+import asyncio
+import json
+import sys
+import types
+
+import pytest
+
+from app.services.repository import (
+    Database,
+    DatabaseUnavailable,
+    PredictionRepository,
+    ProfileRepository,
+    ReadThroughCache,
+    ScenarioRepository,
+)
+
+_USER = "6f1c1c1e-0000-4000-8000-000000000001"
+
+
+class FakePool:
+    """Records every statement; answers fetches from ``rows``."""
+
+    def __init__(self, rows=None) -> None:
+        self.rows = rows or []
+        self.calls: list[tuple[str, str, tuple]] = []
+        self.closed = False
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", sql, args))
+        return self.rows
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append(("fetchrow", sql, args))
+        return self.rows[0] if self.rows else None
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", sql, args))
+        return "INSERT 0 1"
+
+    async def close(self):
+        self.closed = True
+
+
+def _database(pool: FakePool) -> Database:
+    db = Database("postgresql://test")
+    db._pool = pool
+    return db
+
+
+# ── Pool lifecycle ───────────────────────────────────────────────────────────
+
+def test_pool_is_opened_once_and_closed(monkeypatch):
+    created: list[dict] = []
+
+    async def create_pool(dsn, **kwargs):
+        await asyncio.sleep(0.01)
+        created.append({"dsn": dsn, **kwargs})
+        return FakePool()
+
+    monkeypatch.setitem(sys.modules, "asyncpg", types.SimpleNamespace(create_pool=create_pool))
+
+    async def run():
+        db = Database("postgresql://test", min_size=2, max_size=5, statement_cache_size=0)
+        pools = await asyncio.gather(*(db.pool() for _ in range(10)))
+        pool = pools[0]
+        await db.close()
+        return db, pool, pools
+
+    db, pool, pools = asyncio.run(run())
+    assert len(created) == 1
+    assert created[0]["min_size"] == 2 and created[0]["statement_cache_size"] == 0
+    assert all(p is pool for p in pools)
+    assert pool.closed and db._pool is None
+
+
+def test_unconfigured_database_is_unavailable():
+    with pytest.raises(DatabaseUnavailable):
+        asyncio.run(Database("").pool())
+
+
+# ── Bulk upserts ─────────────────────────────────────────────────────────────
+
+def test_scenario_upsert_sends_one_array_per_column():
+    pool = FakePool()
+    repo = ScenarioRepository(_database(pool), ReadThroughCache(), {})
+    asyncio.run(repo.upsert_many([
+        {"slug": "a", "title": "A", "xp_reward": 100},
+        {"slug": "b", "title": "B", "xp_reward": 200},
+    ]))
+
+    (kind, sql, args), = pool.calls
+    assert kind == "execute" and "unnest($1::text[]" in sql and "ON CONFLICT (slug)" in sql
+    assert args[0] == ["a", "b"] and args[1] == ["A", "B"] and args[8] == [100, 200]
+    assert args[2] == [None, None]  # missing columns are sent as NULLs
+
+
+def test_prediction_insert_sends_explanations_as_json_text():
+    pool = FakePool()
+    db = _database(pool)
+    repo = PredictionRepository(db, ProfileRepository(db))
+    asyncio.run(repo.insert_many([
+        {"user_id": _USER, "scenario_slug": "a", "user_prediction": "UP", "ai_explanation": {"winner": "user"}},
+        {"user_id": _USER, "scenario_slug": "b", "user_prediction": "DOWN", "ai_explanation": None},
+    ]))
+
+    (_, sql, args), = pool.calls
+    assert "JOIN public.scenarios s ON s.slug = p.slug" in sql and "ai_explanation::jsonb" in sql
+    assert args[0] == [_USER, _USER] and args[1] == ["a", "b"]
+    assert [json.loads(args[-1][0]), args[-1][1]] == [{"winner": "user"}, None]
+
+
+def test_add_xp_is_one_statement_for_many_users():
+    pool = FakePool()
+    asyncio.run(ProfileRepository(_database(pool)).add_xp({_USER: 150, "u2": 25}))
+    (_, sql, args), = pool.calls
+    assert "unnest($1::uuid[], $2::int[])" in sql
+    assert args == ([_USER, "u2"], [150, 25])
+
+
+# ── Read-through cache ───────────────────────────────────────────────────────
+
+def test_scenario_reads_are_cached_until_a_write():
+    pool = FakePool(rows=[{"id": 1, "slug": "a", "title": "From DB"}])
+    repo = ScenarioRepository(_database(pool), ReadThroughCache(), {"a": {"slug": "a", "ml_prediction": "UP"}})
+
+    async def run():
+        first = await asyncio.gather(*(repo.get("a") for _ in range(5)))
+        await repo.get("a")
+        await repo.upsert_many([{"slug": "a", "title": "Renamed"}])
+        await repo.get("a")
+        return first
+
+    first = asyncio.run(run())
+    # Catalog supplies the ML fields the table lacks
+    assert first[0] == {"id": 1, "slug": "a", "title": "From DB", "ml_prediction": "UP"}
+    assert [kind for kind, _, _ in pool.calls] == ["fetchrow", "execute", "fetchrow"]
+    assert repo.cache.stats()["hits"] == 1
+
+
+def test_invalidate_during_a_load_does_not_store_the_stale_value():
+    cache = ReadThroughCache()
+
+    async def run():
+        async def load():
+            cache.invalidate()  # a write lands while the query is in flight
+            return "stale"
+
+        await cache.get("k", load)
+        return await cache.get("k", lambda: asyncio.sleep(0, "fresh"))
+
+    assert asyncio.run(run()) == "fresh"
+
+
+# ── In-memory fallback ───────────────────────────────────────────────────────
+
+def test_without_a_database_repositories_use_memory():
+    db = Database("")
+    scenarios = ScenarioRepository(db, ReadThroughCache(), {"a": {"slug": "a", "title": "A"}})
+    profiles = ProfileRepository(db)
+    predictions = PredictionRepository(db, profiles)
+
+    async def run():
+        first = {"user_id": _USER, "scenario_slug": "a", "user_prediction": "UP", "xp_earned": 150}
+        assert await predictions.insert_many([first]) == {(_USER, "a")}
+        # A resubmission after the reveal neither changes the answer nor earns XP
+        assert await predictions.insert_many([{**first, "user_prediction": "DOWN"}]) == set()
+        await profiles.add_xp({_USER: 25})
+        return (
+            await scenarios.all(),
+            await predictions.get(_USER, "a"),
+            await predictions.for_user(_USER),
+            await profiles.get(_USER),
+        )
+
+    catalog, prediction, history, profile = asyncio.run(run())
+    assert catalog == [{"slug": "a", "title": "A"}]
+    assert prediction["user_prediction"] == "UP" and history == [prediction]
+    assert profile["xp"] == 175
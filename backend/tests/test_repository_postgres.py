@@ -0,0 +1,172 @@
+"""Repository tests against a real Postgres with ``supabase/schema.sql`` applied.
+
+Set ``TEST_DATABASE_URL`` to a server where the role may create databases;
+each test runs in a throwaway database that is dropped afterwards. Skipped
+when the variable is unset.
+"""
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+import pytest
+
+from app.services.repository import (
+    Database,
+    LearningProgressRepository,
+    PredictionRepository,
+    ProfileRepository,
+    ReadThroughCache,
+    ScenarioRepository,
+)
+
+_URL = os.environ.get("TEST_DATABASE_URL", "")
+asyncpg = pytest.importorskip("asyncpg") if _URL else None
+pytestmark = pytest.mark.skipif(not _URL, reason="TEST_DATABASE_URL is not set")
+
+_SCHEMA = Path(__file__).resolve().parents[2] / "supabase" / "schema.sql"
+
+# The parts of Supabase's auth schema that schema.sql references
+_AUTH_STUB = """
+CREATE SCHEMA auth;
+CREATE TABLE auth.users (id UUID PRIMARY KEY, raw_user_meta_data JSONB DEFAULT '{}');
+CREATE FUNCTION auth.uid() RETURNS UUID LANGUAGE sql STABLE AS $$ SELECT NULL::uuid $$;
+"""
+
+
+def _with_database(url: str, name: str) -> str:
+    return urlunsplit(urlsplit(url)._replace(path=f"/{name}"))
+
+
+@pytest.fixture
+def dsn():
+    name = f"tradequest_test_{uuid.uuid4().hex[:12]}"
+
+    async def admin(sql: str) -> None:
+        conn = await asyncpg.connect(_URL)
+        try:
+            await conn.execute(sql)
+        finally:
+            await conn.close()
+
+    async def setup(url: str) -> None:
+        await admin(f'CREATE DATABASE "{name}"')
+        conn = await asyncpg.connect(url)
+        try:
+            await conn.execute(_AUTH_STUB)
+            await conn.execute(_SCHEMA.read_text())
+        finally:
+            await conn.close()
+
+    url = _with_database(_URL, name)
+    asyncio.run(setup(url))
+    yield url
+    asyncio.run(admin(f'DROP DATABASE "{name}" WITH (FORCE)'))
+
+
+async def _new_user(db: Database) -> str:
+    """Sign a user up; the schema's trigger creates their profile."""
+    user_id = str(uuid.uuid4())
+    await db.execute("INSERT INTO auth.users (id) VALUES ($1)", user_id)
+    return user_id
+
+
+def _run(dsn: str, test):
+    async def run():
+        db = Database(dsn, min_size=1, max_size=2)
+        try:
+            return await test(db)
+        finally:
+            await db.close()
+    return asyncio.run(run())
+
+
+def test_scenario_upsert_and_cached_reads(dsn):
+    async def test(db):
+        repo = ScenarioRepository(db, ReadThroughCache(), {"zero-day-vulnerability": {"ml_prediction": "DOWN"}})
+        seeded = await repo.get("zero-day-vulnerability")
+        await repo.upsert_many([
+            {**seeded, "title": "Renamed"},
+            {
+                "slug": "new-one", "title": "New", "description": "d", "asset_name": "NEW",
+                "news_headline": "h", "news_body": "b", "difficulty": "advanced",
+                "actual_outcome": "UP", "xp_reward": 300, "chart_days": 20, "reveal_days": 3,
+            },
+        ])
+        return seeded, await repo.get("zero-day-vulnerability"), await repo.get("new-one"), await repo.all()
+
+    seeded, renamed, new, everything = _run(dsn, test)
+    assert seeded["ml_prediction"] == "DOWN"  # from the catalog, not the table
+    assert renamed["title"] == "Renamed"      # the write invalidated the cached row
+    assert (new["xp_reward"], new["difficulty"]) == (300, "advanced")
+    assert "new-one" in {row["slug"] for row in everything}
+
+
+def test_first_prediction_is_final_and_earns_xp_once(dsn):
+    async def test(db):
+        user_id = await _new_user(db)
+        profiles = ProfileRepository(db)
+        repo = PredictionRepository(db, profiles)
+        first = {
+            "user_id": user_id, "scenario_slug": "zero-day-vulnerability", "user_prediction": "UP",
+            "ml_prediction": "DOWN", "actual_outcome": "DOWN", "is_user_correct": False,
+            "is_ml_correct": True, "xp_earned": 25, "ai_explanation": {"winner": "ml"},
+        }
+        # Unknown slugs are dropped by the join rather than failing the batch
+        inserted = await repo.insert_many([first, {"user_id": user_id, "scenario_slug": "missing", "user_prediction": "UP"}])
+        # Concurrent resubmissions that try to "fix" the answer after the reveal
+        retries = await asyncio.gather(*(
+            repo.insert_many([{**first, "user_prediction": "DOWN", "is_user_correct": True, "xp_earned": 150}])
+            for _ in range(5)
+        ))
+        return inserted, retries, await repo.for_user(user_id), await profiles.get(user_id)
+
+    inserted, retries, history, profile = _run(dsn, test)
+    assert len(inserted) == 1 and all(r == set() for r in retries)
+    (stored,) = history
+    assert (stored["user_prediction"], stored["is_user_correct"]) == ("UP", False)
+    assert stored["ai_explanation"] == {"winner": "ml"}
+    assert profile["xp"] == 25
+
+
+def test_explanation_fills_in_only_a_missing_one(dsn):
+    async def test(db):
+        user_id = await _new_user(db)
+        repo = PredictionRepository(db, ProfileRepository(db))
+        await repo.insert_many([{
+            "user_id": user_id, "scenario_slug": "zero-day-vulnerability", "user_prediction": "UP",
+            "xp_earned": 25, "ai_explanation": None,
+        }])
+        await repo.set_explanation(user_id, "zero-day-vulnerability", {"winner": "ml"})
+        await repo.set_explanation(user_id, "zero-day-vulnerability", {"winner": "user"})
+        return await repo.get(user_id, "zero-day-vulnerability")
+
+    assert _run(dsn, test)["ai_explanation"] == {"winner": "ml"}
+
+
+def test_add_xp_updates_many_profiles_in_one_statement(dsn):
+    async def test(db):
+        alice, bob = await _new_user(db), await _new_user(db)
+        profiles = ProfileRepository(db)
+        await profiles.add_xp({alice: 150, bob: 25})
+        await profiles.add_xp({alice: 10})
+        return await profiles.get(alice), await profiles.get(bob)
+
+    alice, bob = _run(dsn, test)
+    assert (alice["xp"], bob["xp"]) == (160, 25)
+    assert alice["username"].startswith("trader_")
+
+
+def test_learning_progress_upsert_keeps_existing_notes(dsn):
+    async def test(db):
+        user_id = await _new_user(db)
+        repo = LearningProgressRepository(db)
+        slug = "zero-day-vulnerability"
+        await repo.upsert_many([{"user_id": user_id, "scenario_slug": slug, "takeaway_read": False, "notes": "first"}])
+        await repo.upsert_many([{"user_id": user_id, "scenario_slug": slug, "takeaway_read": True}])
+        return await repo.for_user(user_id)
+
+    (row,) = _run(dsn, test)
+    assert row["takeaway_read"] is True and row["notes"] == "first"
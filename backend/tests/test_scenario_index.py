@@ -0,0 +1,31 @@
+"""Tests for ``app.services.scenario_index``."""
+
+from app.services.scenario_index import ScenarioIndex
+
+
+def test_match_ranks_the_closest_scenario_first():
+    index = ScenarioIndex()
+    index.add("oil-shock", "OPEC cuts oil production, crude prices spike")
+    index.add("chip-rally", "Semiconductor stocks rally on AI chip demand")
+    assert index.match("crude oil prices jump after OPEC cut")[0][0] == "oil-shock"
+
+
+def test_many_adds_and_reindex_keep_rows_aligned():
+    index = ScenarioIndex()
+    for i in range(100):
+        index.add(f"s{i}", f"scenario number{i} token{i}")
+    index.add("s7", "completely different words about gold bullion")
+
+    assert len(index) == 100
+    assert index.match("token42 number42", k=1)[0][0] == "s42"
+    assert index.match("gold bullion", k=1)[0][0] == "s7"
+    assert index.match("token7 number7") == []
+
+
+def test_unchanged_text_is_skipped_and_edited_text_reindexed():
+    index = ScenarioIndex()
+    assert index.add("s", "OPEC cuts oil production")
+    assert not index.add("s", "OPEC cuts oil production")
+    assert index.add("s", "Semiconductor stocks rally")
+    assert index.match("semiconductor rally", k=1)[0][0] == "s"
+    assert index.match("OPEC oil") == []
@@ -0,0 +1,46 @@
+"""Tests for ``app.routes.scenarios``."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.data.scenario_data import SCENARIOS
+from app.routes import scenarios
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(scenarios.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def database_only_scenario():
+    # A row that exists only in the scenarios table: no bundled bars or ML fields
+    SCENARIOS["db-only"] = {
+        "slug": "db-only", "title": "DB only", "description": "", "asset_name": "X",
+        "news_headline": "", "news_body": "", "difficulty": "beginner",
+        "actual_outcome": "UP", "xp_reward": 100, "chart_days": 30, "reveal_days": 5,
+    }
+    yield "db-only"
+    SCENARIOS.pop("db-only")
+
+
+def test_database_only_scenario_has_no_chart_or_simulation(client, database_only_scenario):
+    assert client.get(f"/api/scenarios/{database_only_scenario}").status_code == 200
+    assert client.get(f"/api/scenarios/{database_only_scenario}/chart").status_code == 404
+    assert client.get(f"/api/scenarios/{database_only_scenario}/simulate").status_code == 404
+
+
+def test_bundled_scenario_chart(client):
+    response = client.get("/api/scenarios/zero-day-vulnerability/chart")
+    assert response.status_code == 200
+    assert response.json()["total_bars"] == 30
+
+
+def test_related_scenarios_follow_edited_text(monkeypatch):
+    slug = "zero-day-vulnerability"
+    scenarios.related_scenarios("warm up the index")
+    monkeypatch.setitem(SCENARIOS, slug, {**SCENARIOS[slug], "news_headline": "Zanzibar clove harvest collapses"})
+    assert scenarios.related_scenarios("zanzibar clove harvest")[0]["slug"] == slug
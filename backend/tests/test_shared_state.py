@@ -0,0 +1,47 @@
+"""Tests for ``app.services.shared_state``."""
+
+import asyncio
+
+import pytest
+
+from app.services import shared_state
+from app.services.shared_state import InProcessState, SqliteState
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_state(request, tmp_path):
+    if request.param == "memory":
+        state = InProcessState()
+        return lambda: state
+    # Every call is a separate connection, like a separate worker
+    return lambda: SqliteState(str(tmp_path / "shared.db"))
+
+
+def test_token_bucket_is_shared(make_state):
+    a, b = make_state(), make_state()
+
+    async def run():
+        waits = []
+        for state in (a, b, a, b):
+            waits.append(await state.take_token("finnhub", per_minute=60, capacity=3))
+        return waits
+
+    waits = asyncio.run(run())
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0 < waits[3] <= 1.0  # the fourth request waits for the refill
+
+
+def test_sqlite_trims_each_channel_to_its_own_newest_events(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_state, "_EVENT_RETENTION", 3)
+    state = SqliteState(str(tmp_path / "shared.db"))
+
+    async def run():
+        await state.publish("quiet", {"n": 0})
+        for n in range(198):  # a busy channel advances the global ids
+            await state.publish("busy", {"n": n})
+        await state.publish("quiet", {"n": 1})  # 200th publish: trims "quiet"
+        return await state.read_events("quiet", 0), await state.read_events("busy", 0, limit=200)
+
+    quiet, busy = asyncio.run(run())
+    assert [m["n"] for _, m in quiet] == [0, 1]
+    assert [m["n"] for _, m in busy] == list(range(96, 198))  # trimmed to 3 at the 100th publish
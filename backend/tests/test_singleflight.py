@@ -0,0 +1,54 @@
+"""Tests for ``app.services.singleflight``."""
+
+import asyncio
+
+from app.services.request_context import RequestContext, _current, current_request
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        flights = SingleFlight()
+        return await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert calls == 1
+
+
+def test_caller_after_last_waiter_cancelled_starts_a_new_flight():
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        flights = SingleFlight()
+        first = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        # Joins before the cancelled task's done-callback has run
+        second = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        return await second, first
+
+    result, first = asyncio.run(run())
+    assert result == "done"
+    assert first.cancelled()
+
+
+def test_shared_call_does_not_run_in_the_first_callers_context():
+    async def work():
+        return current_request()
+
+    async def run():
+        _current.set(RequestContext({"type": "http", "path": "/first"}))
+        return await SingleFlight().do("k", work)
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,42 @@
+"""Tests for ``app.services.warmup`` and the warm-up jobs it runs."""
+
+import asyncio
+
+from app.routes import scenarios
+from app.services import warmup
+from app.services.shared_state import InProcessState
+
+
+def test_cancel_warmup_reaches_the_background_run():
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def run():
+        warmup.start_warmup({"slow": slow}, budget_seconds=10)
+        await asyncio.sleep(0.01)
+        tasks = set(warmup._pending)
+        warmup.cancel_warmup()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return tasks
+
+    tasks = asyncio.run(run())
+    assert len(tasks) == 2  # the orchestrator and its job
+    assert all(task.cancelled() for task in tasks) and not warmup._pending
+
+
+def test_only_one_worker_prewarms_explanations(monkeypatch):
+    calls = []
+
+    async def explain(**kwargs):
+        calls.append(kwargs["scenario_title"])
+
+    state = InProcessState()
+    monkeypatch.setattr(scenarios, "get_shared_state", lambda: state)
+    monkeypatch.setattr(scenarios, "generate_game_master_explanation", explain)
+
+    async def run():
+        await scenarios.prewarm_explanations()
+        await scenarios.prewarm_explanations()  # a second worker booting
+
+    asyncio.run(run())
+    assert len(calls) == 2 * len(scenarios.SCENARIOS)
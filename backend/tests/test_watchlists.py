@@ -0,0 +1,59 @@
+"""Tests for ``app.data.watchlist_data`` and ``app.services.watchlists``."""
+
+import json
+
+import pytest
+
+from app.data import watchlist_data
+from app.data.watchlist_data import delete_watchlist, read_watchlist, save_watchlist
+from app.services.alert_archive import AlertArchive
+from app.services.watchlists import WatchlistMatcher
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(watchlist_data, "WATCHLIST_DIR", tmp_path / "watchlists")
+    monkeypatch.setattr(watchlist_data, "_LEGACY_FILE", tmp_path / "watchlists.json")
+    return tmp_path
+
+
+def _alert(i: int, asset: str, sectors: list[str]) -> dict:
+    return {"id": f"a{i}", "severity": "high", "asset_name": asset, "affected_sectors": sectors}
+
+
+def test_users_are_stored_in_separate_files(store):
+    save_watchlist("alice", ["NVDA", "nvda "], [])
+    save_watchlist("bob/1", [], ["Energy"])
+    assert read_watchlist("alice") == {"symbols": ["NVDA"], "sectors": []}
+    assert read_watchlist("bob/1") == {"symbols": [], "sectors": ["Energy"]}
+    assert delete_watchlist("alice")
+    assert not delete_watchlist("alice")
+    assert read_watchlist("alice") is None
+
+
+def test_legacy_file_is_migrated(store):
+    (store / "watchlists.json").write_text(json.dumps({"carol": {"symbols": ["XOM"], "sectors": []}}))
+    watchlists, offset = watchlist_data.read_watchlists()
+    assert watchlists == {"carol": {"symbols": ["XOM"], "sectors": []}}
+    assert offset > 0
+
+
+def test_matcher_starts_at_archive_tail_and_applies_changes(store):
+    archive = AlertArchive(store / "archive")
+    archive.append([_alert(0, "NVDA", ["Technology"]), _alert(1, "XOM", ["Energy"])])
+    save_watchlist("alice", ["NVDA"], [])
+
+    matcher = WatchlistMatcher(archive)
+    assert matcher.sync() == 0  # existing records are only used for backfill
+    assert [a["id"] for a in matcher.feed("alice")] == ["a0"]
+
+    # Changes made through the store (by any worker) reach the index on sync
+    save_watchlist("bob", [], ["Energy"])
+    archive.append([_alert(2, "Shell", ["Energy"])])
+    assert matcher.sync() == 1
+    assert [a["id"] for a in matcher.feed("bob")] == ["a2", "a1"]
+
+    delete_watchlist("alice")
+    matcher.sync()
+    assert matcher.feed("alice") == []
+    assert len(matcher) == 1